@@ -8,7 +8,6 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 import sys
-from PIL import Image
 from datetime import datetime
 import logging
 import io
@@ -18,52 +17,50 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from database.db import get_connection, update_status, log_action
-from core.helpers import ZONE_AUTHORITIES, fetch_complaints_by_zone
-from core.ui_theme import inject_global_styles, hero, badge, display_image_fixed
+from database.db import get_connection, apply_status_update, bulk_update_status
+from database.stats import get_zone_statistics
+from database.work_queue import get_work_queue
+from database.complaint_search import search_complaints, get_complaint, get_filter_values, page_after, SELECTOR_PAGE_SIZE
+from database.archive import search_archive, ARCHIVE_AFTER_DAYS
+from database.instrumentation import snapshot as db_metrics_snapshot
+from database.query_cache import cache_stats
+from database.severity import SEVERITY_LABELS
+from core.helpers import ZONE_AUTHORITIES, CATEGORIES
+from core.ui_theme import hero, badge, display_image_fixed
+from core.image_service import process_upload, save_upload
+from core.blob_store import photo_path
+from core.profiler import profiled, span
+from core.live_updates import start_rerun, section_changed
+from database.changes import CHANGE_POLL_SECONDS, INSERT, STATUS, ARCHIVE
 
 logger = logging.getLogger(__name__)
 
-def optimize_image(image, max_width=1280, max_height=720, quality=85):
-    """
-    Optimize image by resizing and compressing while maintaining aspect ratio
-    
-    Args:
-        image: PIL Image object
-        max_width: Maximum width in pixels
-        max_height: Maximum height in pixels
-        quality: JPEG quality (1-100, default 85)
-    
-    Returns:
-        Optimized PIL Image object
-    """
-    # Calculate aspect ratio
-    aspect_ratio = image.width / image.height
-    
-    # Determine new dimensions while maintaining aspect ratio
-    if image.width > max_width or image.height > max_height:
-        if aspect_ratio > max_width / max_height:
-            # Width is the limiting factor
-            new_width = max_width
-            new_height = int(max_width / aspect_ratio)
-        else:
-            # Height is the limiting factor
-            new_height = max_height
-            new_width = int(max_height * aspect_ratio)
-        
-        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-    
-    return image
+STATUS_OPTIONS = ["New", "Acknowledged", "Assigned", "In Progress", "Resolved", "Closed"]
 
+# Officer IDs used in action_log, one per zone login
+ZONE_OFFICER_IDS = {
+    "North": 1,
+    "South": 2,
+    "East": 3,
+    "West": 4,
+    "Admin": 5
+}
+
+IMAGE_TIMEOUT = 30  # seconds to wait for a photo to be processed or stored
+
+# Changes that alter the statistics and the work queue; citizen votes don't
+DASHBOARD_CHANGES = (INSERT, STATUS, ARCHIVE)
+
+@profiled()
 def render_authority_interface():
     """Render the authority panel interface"""
-    inject_global_styles()
     # Authentication check
     if not st.session_state.authenticated:
         render_authority_login()
     else:
         render_authority_dashboard()
 
+@profiled()
 def render_authority_login():
     """Render the authority login form"""
     hero("🔐 Authority Login", "Access the dashboard to manage complaints, view statistics, and update status.")
@@ -88,6 +85,7 @@ def render_authority_login():
                 logger.warning(f"Failed login attempt for zone: {selected_zone}")
     st.markdown("</div>", unsafe_allow_html=True)
 
+@profiled()
 def render_authority_dashboard():
     """Render the authenticated authority dashboard"""
     # Enhanced header
@@ -104,66 +102,119 @@ def render_authority_dashboard():
     
     st.markdown("<div class='cv-divider'></div>", unsafe_allow_html=True)
     
-    # Create tabs for authority
-    tab1, tab2 = st.tabs(["📊 Statistics Dashboard", "✏️ Update Status"])
+    # Pick up changes made elsewhere; the statistics and work queue tabs
+    # refresh themselves when their zone changes again
+    start_rerun()
     
-    df = fetch_complaints_by_zone(st.session_state.assigned_zone)
+    # Create tabs for authority
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Statistics Dashboard", "✏️ Update Status", "🧭 Work Queue", "🗄️ Archive"])
     
     # TAB 1: STATISTICS
     with tab1:
-        render_statistics_dashboard(df)
+        render_statistics_tab()
+        if st.session_state.assigned_zone == "Admin":
+            render_database_health()
     
     # TAB 2: UPDATE STATUS
     with tab2:
-        render_update_status(df)
+        render_update_status()
+    
+    # TAB 3: WORK QUEUE
+    with tab3:
+        render_work_queue()
+    
+    # TAB 4: ARCHIVE
+    with tab4:
+        render_archive_search()
 
-def render_statistics_dashboard(df):
-    """Render the statistics dashboard"""
+@st.fragment(run_every=CHANGE_POLL_SECONDS)
+def render_statistics_tab():
+    """
+    Statistics of the officer's zone. Runs as a fragment that refreshes
+    itself: statistics are reloaded and charts redrawn only after a
+    dashboard change in the zone, otherwise the last ones are shown again.
+    """
+    zone = st.session_state.assigned_zone
+    loaded = st.session_state.get("zone_statistics")
+    if section_changed(f"statistics:{zone}", zone=zone, kinds=DASHBOARD_CHANGES) or not loaded or loaded["zone"] != zone:
+        try:
+            with span("data:zone_statistics"):
+                stats = get_zone_statistics(zone)
+        except Exception as e:
+            st.session_state.zone_statistics = None
+            logger.error(f"Error loading statistics: {str(e)}")
+            st.error("❌ Could not load statistics. Check the database connection.")
+            return
+        loaded = st.session_state.zone_statistics = {"zone": zone, "stats": stats, "charts": {}}
+    render_statistics_dashboard(loaded["stats"], loaded["charts"])
+
+def _reload_dashboard():
+    """After this officer's own update: reload the statistics and queue on the next rerun"""
+    st.session_state.zone_statistics = None
+    st.session_state.work_queue = None
+
+def _render_chart(charts, name, draw):
+    """Show a matplotlib chart, drawing it to PNG only once per statistics load"""
+    if name not in charts:
+        fig, ax = plt.subplots(figsize=(10, 6))
+        draw(ax)
+        plt.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        plt.close(fig)
+        charts[name] = buffer.getvalue()
+    st.image(charts[name], use_container_width=True)
+
+@profiled()
+def render_statistics_dashboard(stats, charts=None):
+    """
+    Render the statistics dashboard from pre-aggregated zone statistics.
+    Chart images are kept in `charts` to be shown again without redrawing.
+    """
+    charts = {} if charts is None else charts
     st.markdown(
         f"<div class='cv-title' style='font-size:1.2rem;'>📊 Statistics — {st.session_state.assigned_zone} Zone</div>",
         unsafe_allow_html=True,
     )
     
-    if not df.empty:
+    if stats["total"]:
         st.subheader("📈 Overall Metrics")
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            st.metric("Total", len(df))
+            st.metric("Total", stats["total"])
         with col2:
-            st.metric("High Priority", len(df[df["priority"] == "High"]))
+            st.metric("High Priority", stats["high_priority"])
         with col3:
-            st.metric("Pending", len(df[df["status"] != "Resolved"]))
+            st.metric("Pending", stats["pending"])
         with col4:
-            st.metric("Resolved", len(df[df["status"] == "Resolved"]))
+            st.metric("Resolved", stats["resolved"])
         with col5:
-            st.metric("In Progress", len(df[df["status"] == "In Progress"]))
+            st.metric("In Progress", stats["in_progress"])
         
         st.markdown("---")
         st.subheader("📋 Statistics by Category")
         
-        df['category'] = df['category'].fillna("Other")
-        category_counts = df['category'].value_counts()
+        category_counts = stats["category_counts"]
         
         col1, col2 = st.columns(2)
         with col1:
             st.write("**Complaints by Category**")
             if not category_counts.empty:
-                fig1, ax1 = plt.subplots(figsize=(10, 6))
-                category_counts.plot(kind='bar', ax=ax1, color='steelblue')
-                ax1.set_xlabel('Category', fontsize=12)
-                ax1.set_ylabel('Number of Complaints', fontsize=12)
-                ax1.set_title('Complaints Distribution by Category', fontsize=14, fontweight='bold')
-                ax1.tick_params(axis='x', rotation=45)
-                plt.tight_layout()
-                st.pyplot(fig1)
+                def draw_categories(ax1):
+                    category_counts.plot(kind='bar', ax=ax1, color='steelblue')
+                    ax1.set_xlabel('Category', fontsize=12)
+                    ax1.set_ylabel('Number of Complaints', fontsize=12)
+                    ax1.set_title('Complaints Distribution by Category', fontsize=14, fontweight='bold')
+                    ax1.tick_params(axis='x', rotation=45)
+                _render_chart(charts, "category", draw_categories)
         
         with col2:
             st.write("**Category Breakdown Table**")
             category_stats = pd.DataFrame({
                 'Category': category_counts.index,
                 'Count': category_counts.values,
-                'Percentage': (category_counts.values / len(df) * 100).round(1)
+                'Percentage': (category_counts.values / stats["total"] * 100).round(1)
             })
             category_stats['Percentage'] = category_stats['Percentage'].astype(str) + '%'
             st.dataframe(category_stats, use_container_width=True, hide_index=True)
@@ -173,73 +224,232 @@ def render_statistics_dashboard(df):
         
         col1, col2 = st.columns(2)
         with col1:
-            status_counts = df['status'].value_counts()
+            status_counts = stats["status_counts"]
             st.write("**Complaints by Status**")
             if not status_counts.empty:
-                fig2, ax2 = plt.subplots(figsize=(10, 6))
-                status_counts.plot(kind='pie', ax=ax2, autopct='%1.1f%%', startangle=90)
-                ax2.set_ylabel('')
-                ax2.set_title('Status Distribution', fontsize=14, fontweight='bold')
-                plt.tight_layout()
-                st.pyplot(fig2)
+                def draw_statuses(ax2):
+                    status_counts.plot(kind='pie', ax=ax2, autopct='%1.1f%%', startangle=90)
+                    ax2.set_ylabel('')
+                    ax2.set_title('Status Distribution', fontsize=14, fontweight='bold')
+                _render_chart(charts, "status", draw_statuses)
         
         with col2:
             st.write("**Priority Distribution**")
-            priority_counts = df['priority'].value_counts()
+            priority_counts = stats["priority_counts"]
             if not priority_counts.empty:
-                fig3, ax3 = plt.subplots(figsize=(10, 6))
-                colors = {'High': '#e74c3c', 'Medium': '#f39c12', 'Low': '#27ae60'}
-                priority_colors = [colors.get(p, '#95a5a6') for p in priority_counts.index]
-                priority_counts.plot(kind='bar', ax=ax3, color=priority_colors)
-                ax3.set_xlabel('Priority', fontsize=12)
-                ax3.set_ylabel('Number of Complaints', fontsize=12)
-                ax3.set_title('Priority Distribution', fontsize=14, fontweight='bold')
-                ax3.tick_params(axis='x', rotation=0)
-                plt.tight_layout()
-                st.pyplot(fig3)
+                def draw_priorities(ax3):
+                    colors = {'High': '#e74c3c', 'Medium': '#f39c12', 'Low': '#27ae60'}
+                    priority_colors = [colors.get(p, '#95a5a6') for p in priority_counts.index]
+                    priority_counts.plot(kind='bar', ax=ax3, color=priority_colors)
+                    ax3.set_xlabel('Priority', fontsize=12)
+                    ax3.set_ylabel('Number of Complaints', fontsize=12)
+                    ax3.set_title('Priority Distribution', fontsize=14, fontweight='bold')
+                    ax3.tick_params(axis='x', rotation=0)
+                _render_chart(charts, "priority", draw_priorities)
+        
+        if not stats["daily_counts"].empty:
+            st.markdown("---")
+            st.subheader("📅 Daily Submissions")
+            st.line_chart(stats["daily_counts"], use_container_width=True)
         
         st.markdown("---")
         st.subheader("🔍 Category vs Status Analysis")
-        if 'category' in df.columns and 'status' in df.columns:
-            pivot_table = pd.crosstab(df['category'], df['status'], margins=True)
-            st.dataframe(pivot_table, use_container_width=True)
+        if not stats["category_status"].empty:
+            st.dataframe(stats["category_status"], use_container_width=True)
         
         st.markdown("---")
         st.subheader("📋 Recent Complaints")
-        recent_df = df[['complaint_id', 'citizen_name', 'location', 'category', 'priority', 'status', 'created_at']].head(20)
-        st.dataframe(recent_df, use_container_width=True, hide_index=True)
+        st.dataframe(stats["recent"], use_container_width=True, hide_index=True)
     else:
         st.info(f"No complaints found for {st.session_state.assigned_zone} zone.")
 
-def render_update_status(df):
+@st.fragment(run_every=CHANGE_POLL_SECONDS)
+@profiled()
+def render_work_queue():
+    """
+    Render open complaints in the order they should be worked on. Runs as
+    a fragment that refreshes itself, reloading the queue only after a
+    dashboard change in the zone.
+    """
+    st.markdown("<div class='cv-title' style='font-size:1.2rem;'>🧭 Work Queue</div>", unsafe_allow_html=True)
+    st.caption("Open complaints ordered by severity (P0 first), then SLA deadline, then age.")
+    
+    zone = st.session_state.assigned_zone
+    loaded = st.session_state.get("work_queue")
+    if section_changed(f"work_queue:{zone}", zone=zone, kinds=DASHBOARD_CHANGES) or not loaded or loaded["zone"] != zone:
+        try:
+            with span("data:work_queue"):
+                queue = get_work_queue(zone)
+        except Exception as e:
+            st.session_state.work_queue = None
+            logger.error(f"Error loading work queue: {str(e)}")
+            st.error("❌ Could not load the work queue. Check the database connection.")
+            return
+        loaded = st.session_state.work_queue = {"zone": zone, "queue": queue}
+    queue = loaded["queue"]
+    
+    if not queue:
+        st.success(f"✅ No open complaints in the {st.session_state.assigned_zone} zone.")
+        return
+    
+    now = datetime.now()
+    rows = []
+    for item in queue:
+        due = item.get("sla_due_at")
+        if due is None:
+            sla = "—"
+        elif due < now:
+            sla = f"🔴 Overdue {int((now - due).total_seconds() // 3600)}h"
+        else:
+            sla = f"Due in {int((due - now).total_seconds() // 3600)}h"
+        rows.append({
+            "ID": item["complaint_id"],
+            "Severity": SEVERITY_LABELS.get(item["severity"], item["priority"]),
+            "SLA": sla,
+            "Category": item["category"],
+            "Location": item["location"],
+            "Status": item["status"],
+            "Submitted": item["created_at"],
+        })
+    
+    next_item = rows[0]
+    st.info(f"⏭️ Next up: **#{next_item['ID']}** — {next_item['Category']} in {next_item['Location']} ({next_item['Severity']}, {next_item['SLA']})")
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+@profiled()
+def render_database_health():
+    """Admin-only view of query latency, connection acquire time and slow queries"""
+    with st.expander("🩺 Database performance"):
+        metrics = db_metrics_snapshot()
+        cache = cache_stats()
+        acquire = metrics["acquire"]
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Connections", acquire["count"])
+        with col2:
+            st.metric("Acquire p95", f"{acquire['p95_ms']} ms")
+        with col3:
+            st.metric("Cache hit ratio", f"{cache['hit_ratio']:.0%}")
+        with col4:
+            st.metric("Slow queries", len(metrics["slow"]))
+        
+        rows = [
+            {"Query": name, "Calls": q["count"], "Errors": q["errors"], "Rows": q["rows"],
+             "Mean (ms)": q["mean_ms"], "p95 (ms)": q["p95_ms"], "p99 (ms)": q["p99_ms"], "Max (ms)": q["max_ms"]}
+            for name, q in metrics["queries"].items()
+        ]
+        if rows:
+            st.dataframe(pd.DataFrame(rows).sort_values("Calls", ascending=False), use_container_width=True, hide_index=True)
+        if metrics["slow"]:
+            st.write("**Slow query log** (parameters redacted)")
+            slow = pd.DataFrame(reversed(metrics["slow"]))[["name", "ms", "sql", "params"]]
+            slow["params"] = slow["params"].astype(str)
+            st.dataframe(slow, use_container_width=True, hide_index=True)
+        
+        st.session_state.profiling = st.toggle(
+            "⏱️ Profile my reruns",
+            value=st.session_state.get("profiling", False),
+            help="Time render functions, queries and AI calls on every rerun of this session; "
+                 "shows an overlay and writes traces to the profiles folder",
+        )
+
+@profiled()
+def render_archive_search():
+    """Search complaints that were moved to the cold archive"""
+    st.markdown("<div class='cv-title' style='font-size:1.2rem;'>🗄️ Archive</div>", unsafe_allow_html=True)
+    st.caption(f"Complaints closed more than {ARCHIVE_AFTER_DAYS} days ago. Searching the archive is slower than the live views.")
+    
+    with st.form("archive_search"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            text = st.text_input("Search text, location or address")
+        with col2:
+            category = st.selectbox("Category", ["All"] + CATEGORIES)
+        submitted = st.form_submit_button("🔍 Search archive")
+    
+    if not submitted:
+        return
+    try:
+        results = search_archive(text or None, st.session_state.assigned_zone, None if category == "All" else category)
+    except Exception as e:
+        logger.error(f"Error searching archive: {str(e)}")
+        st.error("❌ Could not search the archive. Check the database connection.")
+        return
+    
+    if not results:
+        st.info("No archived complaints match your search.")
+        return
+    st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+
+@profiled()
+def render_update_status():
     """Render the status update interface"""
     st.markdown("<div class='cv-title' style='font-size:1.2rem;'>✏️ Update Complaint Status</div>", unsafe_allow_html=True)
     st.caption(f"Select a complaint from the {st.session_state.assigned_zone} zone and log a clear action taken.")
     
-    if not df.empty:
+    zone = st.session_state.assigned_zone
+    try:
+        with span("data:selector_filters"):
+            statuses, priorities = get_filter_values(zone)
+    except Exception as e:
+        st.error(f"❌ Error loading complaints: {str(e)}")
+        statuses, priorities = [], []
+    
+    if statuses:
         col1, col2 = st.columns(2)
         with col1:
-            status_filter = st.selectbox("Filter by Status", ["All"] + list(df['status'].unique()))
+            status_filter = st.selectbox("Filter by Status", ["All"] + statuses)
         with col2:
-            priority_filter = st.selectbox("Filter by Priority", ["All"] + list(df['priority'].unique()))
+            priority_filter = st.selectbox("Filter by Priority", ["All"] + priorities)
         
-        filtered_df = df.copy()
-        if status_filter != "All":
-            filtered_df = filtered_df[filtered_df['status'] == status_filter]
-        if priority_filter != "All":
-            filtered_df = filtered_df[filtered_df['priority'] == priority_filter]
+        search_text = st.text_input("Search", placeholder="#id, location, category, citizen or text")
+        filters = (
+            status_filter if status_filter != "All" else None,
+            priority_filter if priority_filter != "All" else None,
+            search_text.strip() or None,
+        )
         
-        if not filtered_df.empty:
-            complaint_ids = filtered_df["complaint_id"].tolist()
+        # Only one page of options is fetched and formatted, by the database.
+        # selector_cursors holds the keyset cursor of every page before this one.
+        if st.session_state.get("selector_filters") != filters:
+            st.session_state.selector_filters = filters
+            st.session_state.selector_cursors = []
+        cursors = st.session_state.setdefault("selector_cursors", [])
+        try:
+            with span("data:complaint_search"):
+                options, total = search_complaints(zone, *filters, after=cursors[-1] if cursors else None)
+                if not options and cursors:
+                    # Matches dropped away (e.g. after a status change): start over
+                    cursors.clear()
+                    options, total = search_complaints(zone, *filters)
+        except Exception as e:
+            st.error(f"❌ Error searching complaints: {str(e)}")
+            options, total = [], 0
+        pages = max(1, -(-total // SELECTOR_PAGE_SIZE))
+        
+        if options:
+            labels = {option.complaint_id: f"#{option.complaint_id} - {option.category} - {option.status}" for option in options}
+            complaint_ids = list(labels)
+            if pages > 1:
+                page = min(len(cursors) + 1, pages)
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    st.button("⬅️ Previous", key="selector_previous", disabled=not cursors,
+                              on_click=_selector_previous, use_container_width=True)
+                with col2:
+                    st.caption(f"Page {page} of {pages} ({total} matching complaints)")
+                with col3:
+                    st.button("Next ➡️", key="selector_next", disabled=page >= pages,
+                              on_click=_selector_next, args=(page_after(options[-1]),), use_container_width=True)
             selected_id = st.selectbox(
                 "Select Complaint ID to Update",
                 complaint_ids,
-                format_func=lambda x: f"#{x} - {filtered_df[filtered_df['complaint_id']==x].iloc[0]['category']} - {filtered_df[filtered_df['complaint_id']==x].iloc[0]['status']}"
+                format_func=labels.get
             )
             
-            if selected_id:
-                selected_row = df[df["complaint_id"] == selected_id].iloc[0]
-                
+            selected_row = get_complaint(selected_id) if selected_id else None
+            if selected_row:
                 st.markdown("---")
                 status = str(selected_row.get("status", "New"))
                 priority = str(selected_row.get("priority", "Medium"))
@@ -274,19 +484,12 @@ def render_update_status(df):
                 st.subheader("✏️ Update Status")
                 
                 with st.form("update_status_form"):
-                    status_options = ["New", "Acknowledged", "Assigned", "In Progress", "Resolved", "Closed"]
+                    status_options = STATUS_OPTIONS
                     current_status_index = status_options.index(selected_row['status']) if selected_row['status'] in status_options else 0
                     new_status = st.selectbox("Update Status *", status_options, index=current_status_index)
                     
                     # Auto-assign officer_id based on zone
-                    zone_to_officer_id = {
-                        "North": 1,
-                        "South": 2,
-                        "East": 3,
-                        "West": 4,
-                        "Admin": 5
-                    }
-                    officer_id = zone_to_officer_id.get(st.session_state.assigned_zone, 1)
+                    officer_id = ZONE_OFFICER_IDS.get(st.session_state.assigned_zone, 1)
                     
                     col1, col2 = st.columns(2)
                     with col1:
@@ -297,28 +500,25 @@ def render_update_status(df):
                     action_text = st.text_area("Action Description *", height=100, placeholder="Describe the action taken...")
                     uploaded_image = st.file_uploader("Upload Resolution Photo (Optional)", type=["jpg", "jpeg", "png"])
                     
-                    image_path = None
-                    UPLOAD_FOLDER = "uploads"
-                    if not os.path.exists(UPLOAD_FOLDER):
-                        os.makedirs(UPLOAD_FOLDER)
-                    
                     if uploaded_image is not None:
-                        image = Image.open(uploaded_image)
-                        # Optimize image for display and storage
-                        optimized_image = optimize_image(image)
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        image_filename = f"complaint_{selected_id}_{timestamp}.{uploaded_image.name.split('.')[-1]}"
-                        image_path = os.path.join(UPLOAD_FOLDER, image_filename)
+                        # Optimized on the image worker pool; the result is reused on submit
+                        try:
+                            with st.spinner("Processing photo..."):
+                                processed = process_upload(uploaded_image.getvalue()).result(timeout=IMAGE_TIMEOUT)
+                        except Exception as e:
+                            processed = None
+                            st.warning(f"⚠️ Could not process image: {str(e)}")
                         
-                        col1, col2 = st.columns([1, 2])
-                        with col1:
-                            display_image_fixed(optimized_image, caption="Uploaded Image Preview", size="small")
-                        with col2:
-                            st.write("**Image Details:**")
-                            st.write(f"Original: {image.width}x{image.height}px")
-                            st.write(f"Optimized: {optimized_image.width}x{optimized_image.height}px")
-                            st.write(f"File: {uploaded_image.name}")
-                            st.write(f"Original Size: {uploaded_image.size / 1024:.2f} KB")
+                        if processed:
+                            col1, col2 = st.columns([1, 2])
+                            with col1:
+                                display_image_fixed(processed.preview, caption="Uploaded Image Preview", size="small")
+                            with col2:
+                                st.write("**Image Details:**")
+                                st.write(f"Original: {processed.original_size[0]}x{processed.original_size[1]}px")
+                                st.write(f"Optimized: {processed.image.width}x{processed.image.height}px")
+                                st.write(f"File: {uploaded_image.name}")
+                                st.write(f"Original Size: {uploaded_image.size / 1024:.2f} KB")
                     
                     submitted = st.form_submit_button("✅ Submit Update", type="primary", use_container_width=True)
                     
@@ -329,34 +529,19 @@ def render_update_status(df):
                             try:
                                 # Initialize image_path as None
                                 image_path = None
-                                UPLOAD_FOLDER = "uploads"
                                 
                                 # Save image if provided
                                 if uploaded_image is not None:
-                                    if not os.path.exists(UPLOAD_FOLDER):
-                                        os.makedirs(UPLOAD_FOLDER)
-                                    
-                                    image = Image.open(uploaded_image)
-                                    # Optimize image before saving
-                                    optimized_image = optimize_image(image)
-                                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                    image_filename = f"complaint_{selected_id}_{timestamp}.{uploaded_image.name.split('.')[-1]}"
-                                    image_path = os.path.join(UPLOAD_FOLDER, image_filename)
-                                    
-                                    # Convert RGBA to RGB if necessary (for JPEG compatibility)
-                                    if optimized_image.mode in ('RGBA', 'LA', 'P'):
-                                        rgb_image = Image.new('RGB', optimized_image.size, (255, 255, 255))
-                                        rgb_image.paste(optimized_image, mask=optimized_image.split()[-1] if optimized_image.mode == 'RGBA' else None)
-                                        optimized_image = rgb_image
-                                    
-                                    # Save with compression
-                                    optimized_image.save(image_path, quality=85, optimize=True)
+                                    # Reuses the preview's processing; stored under its content
+                                    # hash, so a photo uploaded before is stored only once
+                                    processed = process_upload(uploaded_image.getvalue()).result(timeout=IMAGE_TIMEOUT)
+                                    image_path = save_upload(processed).result(timeout=IMAGE_TIMEOUT)
                                 
-                                update_status(selected_id, new_status, image_path)
                                 action_description = f"{action_text}"
                                 if officer_name:
                                     action_description += f" (Officer: {officer_name})"
-                                log_action(selected_id, officer_id, action_description, image_path)
+                                apply_status_update(selected_id, new_status, officer_id, action_description, image_path)
+                                _reload_dashboard()
                                 st.success("✅ Complaint status updated successfully!")
                                 st.balloons()
                                 st.info(f"📝 Status updated to: **{new_status}** | 📸 Photo: {'Uploaded' if image_path else 'Not provided'}")
@@ -364,16 +549,55 @@ def render_update_status(df):
                             except Exception as e:
                                 st.error(f"❌ Error updating complaint: {str(e)}")
                 
-                if selected_row.get('photo_after') and os.path.exists(selected_row['photo_after']):
+                if selected_row.get('photo_after') and os.path.exists(photo_path(selected_row['photo_after'])):
                     st.markdown("---")
                     st.subheader("📷 Existing Resolution Photo")
                     try:
-                        existing_image = Image.open(selected_row['photo_after'])
-                        display_image_fixed(existing_image, caption="Current resolution photo", size="medium")
+                        display_image_fixed(selected_row['photo_after'], caption="Current resolution photo", size="medium")
                     except Exception as e:
                         st.warning(f"⚠️ Could not load image: {str(e)}")
+            
+            render_bulk_update(complaint_ids)
         else:
             st.warning("No complaints match the selected filters.")
     else:
         st.info(f"No complaints found for {st.session_state.assigned_zone} zone.")
 
+def _selector_next(cursor):
+    """Button callback: page forward, after the current page's last option"""
+    st.session_state.selector_cursors.append(cursor)
+
+def _selector_previous():
+    """Button callback: page back"""
+    st.session_state.selector_cursors.pop()
+
+@profiled()
+def render_bulk_update(complaint_ids):
+    """Render the bulk action form for the complaints on the selector's current page"""
+    st.markdown("---")
+    st.subheader("📦 Bulk Update")
+    st.caption("Apply one status change and action to many complaints in a single transaction.")
+    
+    with st.form("bulk_update_form"):
+        selected_ids = st.multiselect("Complaints", complaint_ids, format_func=lambda x: f"#{x}")
+        select_all = st.checkbox(f"Apply to all {len(complaint_ids)} complaints on this page")
+        new_status = st.selectbox("New Status *", STATUS_OPTIONS, index=STATUS_OPTIONS.index("Resolved"))
+        action_text = st.text_area("Action Description *", height=80, placeholder="Describe the action taken...")
+        submitted = st.form_submit_button("✅ Apply to Selected", type="primary", use_container_width=True)
+        
+        if submitted:
+            target_ids = complaint_ids if select_all else selected_ids
+            if not target_ids:
+                st.error("⚠️ Please select at least one complaint")
+            elif not action_text:
+                st.error("⚠️ Please provide an action description")
+            else:
+                officer_id = ZONE_OFFICER_IDS.get(st.session_state.assigned_zone, 1)
+                try:
+                    updated = bulk_update_status(target_ids, new_status, officer_id, action_text)
+                    _reload_dashboard()
+                    st.success(f"✅ Updated {updated} complaint(s) to **{new_status}**")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"❌ Error updating complaints: {str(e)}")
+
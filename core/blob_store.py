@@ -0,0 +1,311 @@
+"""
+Upload Blob Store
+Resolution photos are stored by content: the key of a blob is the SHA-256 of
+its bytes, sharded two levels deep so no directory grows without bound:
+
+    uploads/3f/a2/3fa2...e9.jpg
+
+Identical uploads map to the same key and are stored once. Writes go to a
+temporary file in the target directory and are renamed into place, so a
+reader never sees a half-written photo and a crash leaves no partial blob.
+
+The database stores the key itself, not a file path, so references survive
+moving the checkout or sharing the database between hosts; photo_path()
+turns a reference into the local file. References saved before content
+addressing (paths, relative to the project directory) still resolve.
+
+Storage sits behind BlobBackend; LocalBlobBackend keeps blobs on disk under
+CITYVOICE_UPLOAD_DIR (default "uploads"; relative to the project directory,
+whatever the working directory). An object-store backend only needs the same
+handful of methods.
+
+Blobs no longer referenced by any complaint or action (including archived
+ones) are removed by collect_garbage(), together with their derivatives:
+    python -m core.blob_store --gc [--grace-hours 24] [--dry-run]
+"""
+
+import abc
+import argparse
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Blobs younger than this are never collected: their complaint row may not
+# be committed yet
+GC_GRACE_SECONDS = 24 * 3600
+# Files being written, renamed into place once complete (here and in
+# core.image_derivatives)
+TEMP_PREFIX = ".tmp-"
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9.]+$")
+# Blobs, their derivatives and abandoned temp files; nothing else in the
+# upload directory (.gitkeep, legacy complaint_* uploads) is ever collected
+_COLLECTABLE_PATTERN = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64}\.[a-z0-9.]+|" + re.escape(TEMP_PREFIX) + r"[^/]+)$")
+
+# Every column that can hold a blob reference
+REFERENCES_SQL = """
+    SELECT photo_after FROM complaints WHERE photo_after IS NOT NULL
+    UNION SELECT image_path FROM action_log WHERE image_path IS NOT NULL
+    UNION SELECT photo_after FROM complaints_archive WHERE photo_after IS NOT NULL
+    UNION SELECT image_path FROM action_log_archive WHERE image_path IS NOT NULL
+"""
+
+
+def content_key(data, ext):
+    """Sharded key for a blob's bytes, e.g. "3f/a2/3fa2...e9.jpg" """
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{ext.lstrip('.').lower()}"
+
+
+def is_key(reference):
+    """Whether a database reference is a content key (rather than a legacy path)"""
+    return bool(_KEY_PATTERN.match(reference))
+
+
+def blob_id(key):
+    """
+    The part of a key shared by a blob and its derivatives: "3fa2...e9" for
+    both "3f/a2/3fa2...e9.jpg" and "3f/a2/3fa2...e9.large.webp"
+    """
+    return key.rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+class BlobBackend(abc.ABC):
+    """Storage interface used by BlobStore"""
+
+    @abc.abstractmethod
+    def exists(self, key):
+        pass
+
+    @abc.abstractmethod
+    def write(self, key, data):
+        """Store data under key atomically"""
+
+    @abc.abstractmethod
+    def read(self, key):
+        pass
+
+    @abc.abstractmethod
+    def touch(self, key):
+        """Mark a blob as just stored (restarts its GC grace period)"""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        pass
+
+    @abc.abstractmethod
+    def list(self):
+        """Yield (key, modified_timestamp) for every stored file"""
+
+    @abc.abstractmethod
+    def path_of(self, reference):
+        """Local file path of a database reference"""
+
+    @abc.abstractmethod
+    def key_of(self, reference):
+        """The key behind a database reference, or None if it is not ours"""
+
+
+class LocalBlobBackend(BlobBackend):
+    """
+    Blobs as files under a root directory. A relative root, and legacy
+    relative path references, are resolved against `base` (the project
+    directory), never the working directory, so the app and the GC agree
+    from anywhere.
+    """
+
+    def __init__(self, root, base=project_root):
+        self.base = base
+        self.directory = os.path.abspath(os.path.join(base, root))
+
+    def _path(self, key):
+        return os.path.join(self.directory, *key.split("/"))
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def write(self, key, data):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def read(self, key):
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def touch(self, key):
+        os.utime(self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self):
+        for directory, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    modified = os.path.getmtime(path)
+                except FileNotFoundError:
+                    continue
+                yield os.path.relpath(path, self.directory).replace(os.sep, "/"), modified
+
+    def path_of(self, reference):
+        if is_key(reference):
+            return self._path(reference)
+        return os.path.abspath(os.path.join(self.base, reference))
+
+    def key_of(self, reference):
+        if is_key(reference):
+            return reference
+        relative = os.path.relpath(self.path_of(reference), self.directory)
+        if relative.startswith(os.pardir):
+            return None
+        return relative.replace(os.sep, "/")
+
+
+class BlobStore:
+    """Content-addressed, deduplicating store on top of a BlobBackend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def put(self, data, ext):
+        """
+        Store bytes (once per distinct content) and return the reference to
+        save: their key. Returns (key, created); created is False for a
+        duplicate.
+        """
+        key = content_key(data, ext)
+        if self.backend.exists(key):
+            # The new reference may not be committed yet: keep GC off it
+            self.backend.touch(key)
+            return key, False
+        self.backend.write(key, data)
+        return key, True
+
+    def path_of(self, reference):
+        """Local file path of a database reference (a key or a legacy path)"""
+        return self.backend.path_of(reference)
+
+    def collect_garbage(self, referenced, grace_seconds=GC_GRACE_SECONDS, dry_run=False):
+        """
+        Delete blobs (and their derivatives) not in the `referenced`
+        database references and older than grace_seconds. Abandoned temp
+        files are swept the same way; other files are left alone. Returns
+        the deleted keys.
+        """
+        live = {blob_id(key) for key in map(self.backend.key_of, referenced) if key}
+        cutoff = time.time() - grace_seconds
+        deleted = []
+        for key, modified in list(self.backend.list()):
+            if not _COLLECTABLE_PATTERN.match(key) or modified > cutoff or blob_id(key) in live:
+                continue
+            if not dry_run:
+                self.backend.delete(key)
+            deleted.append(key)
+        return deleted
+
+
+def store_from_env():
+    return BlobStore(LocalBlobBackend(os.getenv("CITYVOICE_UPLOAD_DIR", "uploads")))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    """The process-wide blob store, created from the environment on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = store_from_env()
+        return _store
+
+
+def set_blob_store(store):
+    """Replace the process-wide blob store (tests, admin tools); returns the old one"""
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+        return previous
+
+
+def photo_path(reference):
+    """Local file path of a photo reference from the database"""
+    return get_blob_store().path_of(reference)
+
+
+def referenced_blobs():
+    """Every photo reference held by the database"""
+    from database.db import get_connection
+
+    connection = None
+    try:
+        connection = get_connection()
+        if not connection:
+            raise Exception("Database connection failed")
+        cursor = connection.cursor()
+        cursor.execute(REFERENCES_SQL)
+        references = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        return references
+    finally:
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def collect_garbage(grace_seconds=GC_GRACE_SECONDS, dry_run=False):
+    """Remove unreferenced blobs from the process-wide store; returns the deleted keys"""
+    return get_blob_store().collect_garbage(referenced_blobs(), grace_seconds, dry_run)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the upload blob store")
+    parser.add_argument("--gc", action="store_true", help="Delete blobs no complaint or action refers to")
+    parser.add_argument("--grace-hours", type=float, default=GC_GRACE_SECONDS / 3600,
+                        help="Keep unreferenced blobs younger than this")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be deleted")
+    args = parser.parse_args(argv)
+    if not args.gc:
+        parser.print_help()
+        return 0
+
+    print("=" * 60)
+    print("City Voice - Collecting unreferenced uploads")
+    print("=" * 60)
+    try:
+        deleted = collect_garbage(args.grace_hours * 3600, args.dry_run)
+    except Exception as e:
+        print(f"\n[ERROR] Garbage collection failed: {e}")
+        return 1
+    for key in deleted:
+        print(f"  {'would delete' if args.dry_run else 'deleted'} {key}")
+    print(f"\n[OK] {len(deleted):,} blobs {'to delete' if args.dry_run else 'deleted'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Rendered Fragment Cache
+Process-wide LRU cache of rendered HTML, shared by every Streamlit session.
+
+Each entry belongs to one key (e.g. a complaint_id) and is tagged with a
+version: a digest of exactly the fields the HTML is built from. Looking a key
+up with a different version (the status changed, say) rebuilds the HTML
+and replaces the stale entry, so no explicit invalidation is needed and a
+key never holds more than one version. Per-viewer state must not go into
+cached HTML; compose it around the fragment at render time.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """Bounded LRU of key -> (version, html)"""
+
+    def __init__(self, maxsize=2000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key, fields, build):
+        """
+        HTML for key at the version given by `fields` (a hashable tuple of
+        the viewer-independent values it is built from); build() makes it
+        on a miss.
+        """
+        version = hash(fields)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+
+        html = build()
+        with self._lock:
+            self._entries[key] = (version, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return html
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
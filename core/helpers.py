@@ -14,18 +14,13 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from database.db import get_connection
+from database.query_cache import cached_query, complaint_tags
+from database.queries import QUERIES, ZoneComplaint, fetch, pad_ids, timeline_query
+from database.zones import ZONE_MAPPING, assign_zone
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Zone Mapping for Bangalore Neighborhoods
-ZONE_MAPPING = {
-    "North": ["Hebbal", "Yelahanka", "RT Nagar", "Vidyaranyapura", "Sahakara Nagar", "Thanisandra"],
-    "South": ["Jayanagar", "JP Nagar", "BTM Layout", "Banashankari", "HSR Layout", "Koramangala"],
-    "East": ["Indiranagar", "Whitefield", "Marathahalli", "CV Raman Nagar", "Mahadevapura", "Varthur"],
-    "West": ["Rajajinagar", "Malleshwaram", "Vijayanagar", "Basaveshwaranagar", "Kengeri", "Yeshwanthpur"]
-}
-
 # Available categories
 CATEGORIES = ["Waste", "Water", "Traffic", "Electricity", "Sanitation", "Noise", "Other"]
 
@@ -44,82 +39,106 @@ ZONE_AUTHORITIES = {
     "Admin": {"password": "admin_123", "officer_name": "System Admin"}
 }
 
-def assign_zone(location):
-    """Assign zone based on location"""
-    location_normalized = location.strip().lower()
-    for zone, neighborhoods in ZONE_MAPPING.items():
-        for neighborhood in neighborhoods:
-            if neighborhood.lower() == location_normalized:
-                return zone
-    return "Unknown"
+def build_timeline_query(complaint_ids):
+    """
+    Build the batched timeline query: each complaint joined to its actions.
+    Rows come back grouped by complaint (primary key order); actions are
+    ordered per complaint in Python so MySQL never has to filesort.
+    Returns (Query, params), with the ids padded to a standard IN-list size.
+    """
+    params = pad_ids(complaint_ids)
+    return timeline_query(len(params)), tuple(params)
+
+def get_complaint_timelines(complaint_ids):
+    """
+    Get the timelines of several complaints in one round trip.
+    Returns {complaint_id: [event, ...]}; unknown ids are omitted.
+    """
+    complaint_ids = tuple(sorted(set(complaint_ids)))
+    if not complaint_ids:
+        return {}
+    try:
+        rows = cached_query(
+            "timelines", complaint_ids,
+            lambda: _load_timeline_rows(complaint_ids),
+            tags=("complaints", "action_log"),
+        )
+    except Exception as e:
+        logger.error(f"Error fetching timelines: {str(e)}")
+        return {}
+    
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.complaint_id, []).append(row)
+    return {complaint_id: _build_timeline(complaint_rows) for complaint_id, complaint_rows in grouped.items()}
 
 def get_complaint_timeline(complaint_id):
     """Get timeline of actions for a complaint"""
-    conn = get_connection()
+    return get_complaint_timelines([complaint_id]).get(complaint_id, [])
+
+def _load_timeline_rows(complaint_ids):
+    """Run the batched timeline query; raises on failure so errors are never cached"""
+    conn = get_connection(read_only=True)
     if not conn:
-        return []
-    
+        raise Exception("Database connection failed")
     try:
-        query_complaint = "SELECT * FROM complaints WHERE complaint_id = %s"
-        df_complaint = pd.read_sql(query_complaint, conn, params=(complaint_id,))
-        
-        if df_complaint.empty:
-            return []
-        
-        complaint = df_complaint.iloc[0]
-        timeline = []
-        
-        timeline.append({
-            "date": complaint['created_at'],
-            "status": "Submitted",
-            "description": f"Complaint submitted by {complaint['citizen_name']}",
-            "details": f"Category: {complaint['category']}, Priority: {complaint['priority']}",
-            "image_path": None
-        })
-        
-        query_logs = """
-            SELECT * FROM action_log 
-            WHERE complaint_id = %s 
-            ORDER BY action_time ASC
-        """
-        df_logs = pd.read_sql(query_logs, conn, params=(complaint_id,))
-        
-        for _, log in df_logs.iterrows():
-            timeline.append({
-                "date": log['action_time'],
-                "status": "Updated",
-                "description": log['action'] if log['action'] else "Status updated",
-                "details": f"Officer ID: {log['officer_id']}",
-                "image_path": log.get('image_path') if 'image_path' in log else None
-            })
-        
-        timeline.append({
-            "date": datetime.now(),
-            "status": complaint['status'],
-            "description": f"Current Status: {complaint['status']}",
-            "details": f"Zone: {complaint['zone']}",
-            "image_path": None
-        })
-        
-        return timeline
-        
-    except Exception as e:
-        logger.error(f"Error fetching timeline: {str(e)}")
-        return []
+        return fetch(conn, *build_timeline_query(complaint_ids))
     finally:
         conn.close()
 
+def _build_timeline(rows):
+    """Turn one complaint's joined rows into timeline events"""
+    complaint = rows[0]
+    timeline = [{
+        "date": complaint.created_at,
+        "status": "Submitted",
+        "description": f"Complaint submitted by {complaint.citizen_name}",
+        "details": f"Category: {complaint.category}, Priority: {complaint.priority}",
+        "image_path": None
+    }]
+    
+    # A complaint without actions joins to a single row of NULL action columns
+    actions = sorted((row for row in rows if row.action_time is not None), key=lambda row: row.action_time)
+    for row in actions:
+        timeline.append({
+            "date": row.action_time,
+            "status": "Updated",
+            "description": row.action if row.action else "Status updated",
+            "details": f"Officer ID: {row.officer_id}",
+            "image_path": row.image_path
+        })
+    
+    timeline.append({
+        "date": datetime.now(),
+        "status": complaint.status,
+        "description": f"Current Status: {complaint.status}",
+        "details": f"Zone: {complaint.zone}",
+        "image_path": None
+    })
+    return timeline
+
 def fetch_complaints_by_zone(zone):
-    """Fetch complaints by zone"""
-    conn = get_connection()
-    if conn:
+    """Fetch complaints by zone (served from the shared query cache)"""
+    tags = complaint_tags(None if zone == "Admin" else zone)
+    try:
+        df = cached_query("zone_complaints", (zone,), lambda: _load_complaints_by_zone(zone), tags=tags)
+    except Exception as e:
+        logger.error(f"Error fetching complaints for zone {zone}: {str(e)}")
+        return pd.DataFrame()
+    # Cached frames are shared across sessions; callers may modify their copy
+    return df.copy()
+
+def _load_complaints_by_zone(zone):
+    """Run the zone query; raises on failure so errors are never cached"""
+    conn = get_connection(read_only=True)
+    if not conn:
+        raise Exception("Database connection failed")
+    try:
         if zone == "Admin":
-            query = "SELECT * FROM complaints ORDER BY priority DESC, created_at DESC"
+            rows = fetch(conn, QUERIES["all_complaints"])
         else:
-            query = f"SELECT * FROM complaints WHERE zone = '{zone}' ORDER BY priority DESC, created_at DESC"
-        
-        df = pd.read_sql(query, conn)
+            rows = fetch(conn, QUERIES["zone_complaints"], (zone,))
+        return pd.DataFrame(rows, columns=ZoneComplaint._fields)
+    finally:
         conn.close()
-        return df
-    return pd.DataFrame()
 
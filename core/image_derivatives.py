@@ -0,0 +1,124 @@
+"""
+Image Derivatives
+Resolution photos are rendered once, at upload, into the sizes the UI shows
+them at ("small", "medium", "large", matching display_image_fixed) and
+stored next to the original as JPEG plus, where Pillow supports it, WebP:
+
+    uploads/3f/a2/3fa2...e9.jpg
+    uploads/3f/a2/3fa2...e9.large.jpg
+    uploads/3f/a2/3fa2...e9.large.webp
+    ...
+
+Each file is written to a temp file and renamed into place, so a reader
+never sees a half-written derivative.
+
+Pages then embed the small pre-rendered file instead of re-encoding the
+full-size original on every rerun. Photos uploaded before derivatives
+existed get theirs generated the first time they are shown.
+"""
+
+import base64
+import os
+import tempfile
+from functools import lru_cache
+
+from PIL import Image, features
+
+from core.blob_store import TEMP_PREFIX
+
+# Bounding boxes of the display_image_fixed containers
+DERIVATIVE_SIZES = {
+    "small": (400, 300),
+    "medium": (550, 420),
+    "large": (700, 550),
+}
+DERIVATIVE_QUALITY = 80
+WEBP_ENABLED = features.check("webp") and os.getenv("CITYVOICE_WEBP_DERIVATIVES", "1") != "0"
+
+
+def derivative_path(original_path, size, fmt="jpg"):
+    """Path of one derivative of an original photo"""
+    root, _ = os.path.splitext(original_path)
+    return f"{root}.{size}.{fmt}"
+
+
+def to_rgb(image):
+    """Flatten transparency onto white, for JPEG output"""
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[-1])
+        return rgb_image
+    if image.mode != "RGB":
+        return image.convert("RGB")
+    return image
+
+
+def create_derivatives(original_path, image=None, webp=WEBP_ENABLED):
+    """
+    Render every derivative of a photo, largest first, each downscaled from
+    the previous one. Pass the already-decoded image to skip reading the
+    original again. Returns {size: jpeg_path}.
+    """
+    if image is None:
+        with Image.open(original_path) as original:
+            image = to_rgb(original)
+            image.load()
+    else:
+        image = to_rgb(image)
+
+    paths = {}
+    sizes = sorted(DERIVATIVE_SIZES.items(), key=lambda item: item[1][0] * item[1][1], reverse=True)
+    for size, box in sizes:
+        image = image.copy()
+        image.thumbnail(box, Image.LANCZOS)
+        paths[size] = derivative_path(original_path, size)
+        _save(image, paths[size], format="JPEG", quality=DERIVATIVE_QUALITY, optimize=True, progressive=True)
+        if webp:
+            _save(image, derivative_path(original_path, size, "webp"), format="WEBP", quality=DERIVATIVE_QUALITY, method=4)
+    _data_uri.cache_clear()
+    return paths
+
+
+def _save(image, path, **options):
+    """Save an image atomically, as LocalBlobBackend.write stores blobs"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=TEMP_PREFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, **options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def get_derivative(original_path, size="medium"):
+    """
+    Path and MIME type of the best stored derivative of a photo (WebP if
+    present), generating the derivatives first for photos that lack them.
+    """
+    size = size if size in DERIVATIVE_SIZES else "medium"
+    webp_path = derivative_path(original_path, size, "webp")
+    if os.path.exists(webp_path):
+        return webp_path, "image/webp"
+    jpeg_path = derivative_path(original_path, size)
+    if not os.path.exists(jpeg_path):
+        create_derivatives(original_path)
+        if os.path.exists(webp_path):
+            return webp_path, "image/webp"
+    return jpeg_path, "image/jpeg"
+
+
+@lru_cache(maxsize=256)
+def _data_uri(path, mime, mtime):
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def derivative_data_uri(original_path, size="medium"):
+    """Data URI of a stored derivative, read from disk once per file version"""
+    path, mime = get_derivative(original_path, size)
+    return _data_uri(path, mime, os.path.getmtime(path))
@@ -0,0 +1,102 @@
+"""
+Image Processing Service
+Decoding, downscaling and re-encoding an authority's resolution photo runs
+on a shared worker pool instead of the Streamlit script thread. Pillow
+releases the GIL while it decodes, resizes and encodes, so uploads from
+several officers are processed on several cores at once.
+
+Each upload is processed once: process_upload() returns a future memoized
+by the content of the upload, so the preview rendered while the form is
+being filled in and the save on submit share one result. JPEGs are decoded
+with draft(), letting libjpeg scale down by 1/2, 1/4 or 1/8 while decoding
+instead of materializing the full-resolution photo first.
+"""
+
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from PIL import Image
+
+from core.blob_store import get_blob_store
+from core.image_derivatives import DERIVATIVE_QUALITY, DERIVATIVE_SIZES, create_derivatives, to_rgb
+
+MAX_WIDTH, MAX_HEIGHT = 1280, 720
+JPEG_QUALITY = 85
+IMAGE_WORKERS = int(os.getenv("CITYVOICE_IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+MEMO_SIZE = 16  # processed uploads kept for reuse
+
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="cityvoice-image")
+_memo = OrderedDict()  # upload sha256 -> Future[ProcessedImage]
+_memo_lock = threading.Lock()
+
+
+class ProcessedImage(NamedTuple):
+    """An upload decoded, downscaled and encoded for storage"""
+    original_size: tuple
+    image: Image.Image   # RGB, at most MAX_WIDTH x MAX_HEIGHT
+    jpeg: bytes          # what gets stored
+    preview: str         # data URI at the "small" display size
+
+
+def optimize_image(data, max_width=MAX_WIDTH, max_height=MAX_HEIGHT):
+    """
+    Decode an upload scaled to fit max_width x max_height, keeping the aspect
+    ratio. Returns (original_size, RGB image).
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        original_size = image.size
+        image.draft("RGB", (max_width, max_height))
+        image = to_rgb(image)
+        image.load()
+    if image.width > max_width or image.height > max_height:
+        image.thumbnail((max_width, max_height), Image.LANCZOS)
+    return original_size, image
+
+
+def _process(data):
+    original_size, image = optimize_image(data)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+
+    preview = image.copy()
+    preview.thumbnail(DERIVATIVE_SIZES["small"], Image.LANCZOS)
+    preview_buffer = io.BytesIO()
+    preview.save(preview_buffer, format="JPEG", quality=DERIVATIVE_QUALITY)
+    preview_uri = f"data:image/jpeg;base64,{base64.b64encode(preview_buffer.getvalue()).decode()}"
+
+    return ProcessedImage(original_size, image, buffer.getvalue(), preview_uri)
+
+
+def process_upload(data):
+    """Future of the ProcessedImage for an upload's bytes, computed once per content"""
+    digest = hashlib.sha256(data).digest()
+    with _memo_lock:
+        future = _memo.get(digest)
+        if future is not None:
+            _memo.move_to_end(digest)
+            return future
+        future = _executor.submit(_process, data)
+        _memo[digest] = future
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return future
+
+
+def _store(processed):
+    store = get_blob_store()
+    key, created = store.put(processed.jpeg, "jpg")
+    if created:
+        create_derivatives(store.path_of(key), processed.image)
+    return key
+
+
+def save_upload(processed):
+    """Future of the blob key of a processed upload (stored with its derivatives)"""
+    return _executor.submit(_store, processed)
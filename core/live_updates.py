@@ -0,0 +1,80 @@
+"""
+Live Updates
+Keeps an open feed or dashboard current without reloading it on a timer.
+
+Every full rerun starts by applying new change_log entries to the shared
+query cache (database.changes) and remembering how far this session has
+seen. render_live_updates() is a fragment that runs every
+CHANGE_POLL_SECONDS on its own; it applies any newer changes and, only if
+one of them touches what the page shows, reruns the page, which then
+redraws from the already-patched cache.
+
+A section that refreshes itself (a fragment with run_every) asks
+section_changed() instead, and reloads only its own data when that says
+so; the rest of the page is left alone.
+"""
+
+import streamlit as st
+
+from database.changes import CHANGE_POLL_SECONDS, INSERT, changes_since, sync_changes
+
+
+def start_rerun():
+    """Apply pending changes and mark them seen; call before the page loads data"""
+    sync_changes()
+    st.session_state.change_position = changes_since(None)[1]
+
+
+@st.fragment(run_every=CHANGE_POLL_SECONDS)
+def render_live_updates(complaint_ids=(), zone=None, inserts=True, kinds=None):
+    """
+    Rerun the page when a shown complaint changes (complaint_ids), when
+    anything in `zone` changes ("Admin" for every zone) or, with inserts,
+    when a complaint is added. With kinds, only changes of those kinds
+    count. Renders nothing.
+    """
+    sync_changes()
+    changes, position = changes_since(st.session_state.get("change_position"))
+    st.session_state.change_position = position
+    if _any_relevant(changes, complaint_ids, zone, inserts, kinds):
+        st.rerun()
+
+
+def section_changed(key, complaint_ids=(), zone=None, inserts=True, kinds=None):
+    """
+    Whether anything the section `key` shows changed since it last asked
+    (same filters as render_live_updates). True on its first call.
+    """
+    sync_changes()
+    positions = st.session_state.setdefault("section_positions", {})
+    first = key not in positions
+    changes, positions[key] = changes_since(positions.get(key))
+    return first or _any_relevant(changes, complaint_ids, zone, inserts, kinds)
+
+
+def note_own_change(change_id):
+    """Don't rerun this session's page for a change it made itself"""
+    if change_id is not None:
+        st.session_state.setdefault("own_changes", set()).add(change_id)
+
+
+def _any_relevant(changes, complaint_ids, zone, inserts, kinds):
+    if changes is None:
+        return True
+    # This session's own writes are already on screen
+    own = st.session_state.get("own_changes", set())
+    mine = {change.change_id for change in changes if change.change_id in own}
+    own.difference_update(mine)
+    return any(
+        _relevant(change, set(complaint_ids), zone, inserts)
+        for change in changes
+        if change.change_id not in mine and (kinds is None or change.kind in kinds)
+    )
+
+
+def _relevant(change, complaint_ids, zone, inserts):
+    if change.complaint_id in complaint_ids:
+        return True
+    if zone is not None and zone in ("Admin", change.zone):
+        return True
+    return inserts and change.kind == INSERT
@@ -0,0 +1,191 @@
+"""
+Render Profiler
+Opt-in, per-rerun profiling of the Streamlit app. While a rerun is profiled:
+
+- render functions decorated with @profiled and blocks wrapped in span()
+  are timed, with their nesting;
+- every database statement issued by the script is recorded as a
+  "sql:<query name>" span (via database.instrumentation);
+- a sampling thread snapshots the script thread's Python stack every
+  CITYVOICE_PROFILE_INTERVAL_MS, giving a flame-graph profile of the rerun.
+
+Each profiled rerun is written to CITYVOICE_PROFILE_DIR (default
+"profiles") as <name>.json (spans and per-span totals) and <name>.folded
+(collapsed stacks for flamegraph.pl / speedscope), so a page can be compared
+before and after a change. unified_app shows the slowest spans of the
+current rerun in a collapsible overlay.
+
+Enable for every session with CITYVOICE_PROFILE=1 (optionally only a
+fraction of reruns with CITYVOICE_PROFILE_SAMPLE_RATE=0.1), or for one
+admin session with the toggle on the Statistics tab. When a rerun is not
+profiled, @profiled and span() cost one context-variable lookup.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+
+from database import instrumentation
+
+PROFILE_ALL = os.getenv("CITYVOICE_PROFILE", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("CITYVOICE_PROFILE_SAMPLE_RATE", "1"))
+PROFILE_DIR = os.getenv("CITYVOICE_PROFILE_DIR", "profiles")
+SAMPLE_INTERVAL = float(os.getenv("CITYVOICE_PROFILE_INTERVAL_MS", "5")) / 1000
+OVERLAY_SPANS = 15
+
+_current = ContextVar("cityvoice_profile", default=None)
+_sequence = iter(range(1, sys.maxsize))
+_sequence_lock = threading.Lock()
+
+
+class RerunProfile:
+    """Spans and stack samples of one script rerun"""
+
+    def __init__(self, label, session=""):
+        with _sequence_lock:
+            sequence = next(_sequence)
+        self.name = f"{datetime.now():%Y%m%d-%H%M%S}-{label}-{session[:8]}-{sequence}"
+        self.label = label
+        self.spans = []   # [name, depth, start_ms, duration_ms]
+        self.depth = 0
+        self.stacks = Counter()
+        self.interrupted = False
+        self.token = None
+        self._started = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name="cityvoice-profiler", daemon=True)
+
+    def now_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def summary(self):
+        """Per span name: calls, total and max ms, slowest total first"""
+        totals = {}
+        for name, _, _, duration in self.spans:
+            entry = totals.setdefault(name, {"span": name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += duration
+            entry["max_ms"] = max(entry["max_ms"], duration)
+        for entry in totals.values():
+            entry["total_ms"] = round(entry["total_ms"], 2)
+            entry["max_ms"] = round(entry["max_ms"], 2)
+        return sorted(totals.values(), key=lambda entry: entry["total_ms"], reverse=True)
+
+    def write(self, directory=None):
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.name)
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "label": self.label,
+                "total_ms": round(self.now_ms(), 2),
+                "interrupted": self.interrupted,
+                "summary": self.summary(),
+                "spans": [
+                    {"name": name, "depth": depth, "start_ms": round(start, 3), "duration_ms": round(duration, 3)}
+                    for name, depth, start, duration in self.spans
+                ],
+            }, f, indent=1)
+        with open(path + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+def current_profile():
+    return _current.get()
+
+
+def should_profile(session_enabled=False):
+    """Whether to profile this rerun (env flag, sampled, or the session's toggle)"""
+    if session_enabled:
+        return True
+    return PROFILE_ALL and random.random() < PROFILE_SAMPLE_RATE
+
+
+def start_profile(label, session=""):
+    """Start profiling the rerun on this thread; returns the RerunProfile"""
+    profile = RerunProfile(label, session)
+    profile.token = _current.set(profile)
+    profile._sampler.start()
+    return profile
+
+
+def finish_profile(profile, interrupted=False):
+    """Stop the sampler and write the trace files; returns their path prefix"""
+    profile._stop.set()
+    profile._sampler.join()
+    _current.reset(profile.token)
+    profile.interrupted = interrupted
+    return profile.write()
+
+
+@contextmanager
+def span(name):
+    """Time a block as a span of the current profile (no-op if not profiling)"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    entry = [name, profile.depth, profile.now_ms(), 0.0]
+    profile.spans.append(entry)
+    profile.depth += 1
+    try:
+        yield
+    finally:
+        profile.depth -= 1
+        entry[3] = profile.now_ms() - entry[2]
+
+
+def profiled(name=None):
+    """Decorator: time every call of a function as a span"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _record_statement(name, elapsed_ms):
+    profile = _current.get()
+    if profile is not None:
+        end = profile.now_ms()
+        profile.spans.append([f"sql:{name}", profile.depth, end - elapsed_ms, elapsed_ms])
+
+
+instrumentation.add_listener(_record_statement)
+
+
+def render_overlay(profile):
+    """Collapsible table of the slowest spans of this rerun"""
+    import streamlit as st
+
+    with st.expander(f"⏱️ Rerun profile — {profile.now_ms():.0f} ms", expanded=False):
+        st.dataframe(profile.summary()[:OVERLAY_SPANS], use_container_width=True, hide_index=True)
+        st.caption(f"Trace: {os.path.join(PROFILE_DIR, profile.name)}.json / .folded")
@@ -19,20 +19,45 @@ if project_root not in sys.path:
 
 from database.db import get_connection, insert_complaint
 from database.user_auth import register_user, login_user, get_user_by_id
-from database.upvotes import upvote_complaint, remove_upvote, get_upvote_count, has_user_upvoted, get_complaints_with_upvotes
-from core.helpers import ALL_AREAS, CATEGORIES, assign_zone, get_complaint_timeline
-from core.ui_theme import inject_global_styles, hero, badge, complaint_card_start, complaint_card_end, display_image_fixed
+from database.routing import set_session
+from database.upvotes import upvote_complaint, remove_upvote, get_complaints_with_upvotes, count_feed_complaints, load_user_upvoted_set
+from core.helpers import ALL_AREAS, CATEGORIES, assign_zone, get_complaint_timelines
+from core.ui_theme import hero, badge, complaint_card_start, complaint_card_end, display_image_fixed
+from core.fragment_cache import FragmentCache
+from core.blob_store import photo_path
+from core.profiler import profiled, span
+from core.live_updates import start_rerun, render_live_updates, note_own_change
+from database.severity import severity_from_priority
 from ai.priority import assign_priority_with_reasoning
 
+FEED_PAGE_SIZE = 20
+FEED_WINDOW_PAGES = 5  # at most this many pages of cards on screen
+
+# Fields a card body is rendered from; a change to any of them re-renders it
+CARD_FIELDS = ("category", "location", "status", "priority", "citizen_name", "created_at", "zone", "complaint_text")
+card_html = FragmentCache(maxsize=2000)
+
+@profiled()
 def render_reddit_interface():
     """Main Reddit-like interface renderer"""
-    inject_global_styles()
     # Check if user is logged in
     if "user_id" not in st.session_state or st.session_state.user_id is None:
         render_login_register()
     else:
         render_main_feed()
 
+def get_upvoted_set():
+    """
+    Per-session set of complaint_ids the logged-in user has upvoted.
+    Loaded with one query per login and updated in place on every toggle.
+    """
+    user_id = st.session_state.get("user_id")
+    if st.session_state.get("upvoted_set_user") != user_id or "upvoted_set" not in st.session_state:
+        st.session_state.upvoted_set = load_user_upvoted_set(user_id)
+        st.session_state.upvoted_set_user = user_id
+    return st.session_state.upvoted_set
+
+@profiled()
 def render_login_register():
     """Render login/registration interface"""
     hero("🏛️ Community", "Login to upvote and track issues, or create an account to post new complaints.")
@@ -95,6 +120,7 @@ def render_login_register():
                 else:
                     st.error("⚠️ Please fill in all fields")
 
+@profiled()
 def render_main_feed():
     """Render the main Reddit-like feed"""
     # Enhanced header
@@ -106,6 +132,8 @@ def render_main_feed():
             st.session_state.user_id = None
             st.session_state.username = None
             st.session_state.email = None
+            st.session_state.pop("upvoted_set", None)
+            st.session_state.pop("upvoted_set_user", None)
             st.rerun()
     
     st.markdown("<div class='cv-divider'></div>", unsafe_allow_html=True)
@@ -119,6 +147,7 @@ def render_main_feed():
     with tab2:
         render_submit_complaint()
 
+@profiled()
 def render_community_feed():
     """Render the Reddit-like feed of complaints"""
     st.markdown("<div class='cv-title' style='font-size:1.35rem; margin-bottom:1rem;'>📰 All City Complaints</div>", unsafe_allow_html=True)
@@ -135,171 +164,251 @@ def render_community_feed():
         sort_by = st.selectbox("🔄 Sort by", ["Most Upvoted", "Newest", "Oldest"])
     st.markdown("</div>", unsafe_allow_html=True)
     
-    # Get complaints with upvotes
-    complaints = get_complaints_with_upvotes(st.session_state.user_id)
-    
-    # Apply filters
-    if area_filter != "All Areas":
-        complaints = [c for c in complaints if c.get('location') == area_filter]
-    if category_filter != "All Categories":
-        complaints = [c for c in complaints if c.get('category') == category_filter]
+    # Only a window of pages is rendered: first paint costs FEED_PAGE_SIZE
+    # cards however large the feed is. A new filter or sort starts over.
+    filters = dict(
+        location=area_filter if area_filter != "All Areas" else None,
+        category=category_filter if category_filter != "All Categories" else None,
+    )
+    # Pick up other sessions' changes before loading the pages
+    start_rerun()
+    window = st.session_state.get("feed_window")
+    if not window or window["view"] != (area_filter, category_filter, sort_by):
+        window = st.session_state.feed_window = {"view": (area_filter, category_filter, sort_by), "first_page": 0, "pages": 1}
     
-    # Sort
-    if sort_by == "Newest":
-        complaints = sorted(complaints, key=lambda x: x.get('created_at', ''), reverse=True)
-    elif sort_by == "Oldest":
-        complaints = sorted(complaints, key=lambda x: x.get('created_at', ''))
-    # Most Upvoted is already sorted by default
+    # Each page is its own cached query (per-user upvote state comes from the
+    # session set), so loading more only queries the new page
+    with span("data:feed"):
+        total = count_feed_complaints(**filters)
+        complaints = []
+        for page in range(window["first_page"], window["first_page"] + window["pages"]):
+            complaints += get_complaints_with_upvotes(**filters, sort=sort_by, limit=FEED_PAGE_SIZE, offset=page * FEED_PAGE_SIZE)
     
     # Display complaints
     if complaints:
-        st.write(f"**Showing {len(complaints)} complaint(s)**")
+        first = window["first_page"] * FEED_PAGE_SIZE
+        st.write(f"**Showing {first + 1}–{first + len(complaints)} of {total} complaint(s)**")
+        if window["first_page"] > 0:
+            st.button("⬆️ Show previous", key="feed_previous", on_click=_shift_feed_window, args=(-1,), use_container_width=True)
+        
+        # Load every expanded card's timeline in one round trip
+        expanded_ids = [c['complaint_id'] for c in complaints if st.session_state.get(f"show_details_{c['complaint_id']}", False)]
+        with span("data:timelines"):
+            timelines = get_complaint_timelines(expanded_ids)
         
         for complaint in complaints:
-            render_complaint_card(complaint)
+            render_complaint_card(complaint, timelines.get(complaint['complaint_id']))
+        
+        if first + len(complaints) < total:
+            st.button("⬇️ Load more", key="feed_more", on_click=_shift_feed_window, args=(1,), use_container_width=True)
     else:
         st.info("No complaints found matching your filters.")
+    
+    # New complaints only show up on the first page
+    render_live_updates([c['complaint_id'] for c in complaints], inserts=window["first_page"] == 0)
 
-def render_complaint_card(complaint):
-    """Render a single complaint card in Reddit style"""
-    complaint_id = complaint['complaint_id']
-    upvote_count = complaint.get('upvote_count', 0) or get_upvote_count(complaint_id)
-    user_id = st.session_state.get('user_id')
-    user_upvoted = complaint.get('user_upvoted', 0) == 1 or (has_user_upvoted(complaint_id, user_id) if user_id else False)
+def _shift_feed_window(step):
+    """
+    Load the next page (step 1) or bring back the previous one (step -1).
+    Past FEED_WINDOW_PAGES the page at the other end is dropped.
+    """
+    window = st.session_state.feed_window
+    if step > 0:
+        window["pages"] += 1
+        if window["pages"] > FEED_WINDOW_PAGES:
+            window["first_page"] += 1
+            window["pages"] = FEED_WINDOW_PAGES
+    elif window["first_page"] > 0:
+        window["first_page"] -= 1
+        window["pages"] = min(window["pages"] + 1, FEED_WINDOW_PAGES)
 
-    status = complaint.get("status", "New")
-    status_variant = "success" if status == "Resolved" else "warning" if status in ["In Progress", "Assigned", "Acknowledged"] else "info"
-    priority = complaint.get("priority", "Medium")
-    priority_variant = "danger" if priority == "High" else "warning" if priority == "Medium" else "success"
+@profiled()
+def render_complaint_card(complaint, timeline=None):
+    """Render a single complaint card in Reddit style (timeline is shown when details are open)"""
+    complaint_id = complaint['complaint_id']
     
     # Card container
     complaint_card_start()
     col1, col2 = st.columns([1.2, 20])
     
     with col1:
-        # Upvote section
-        st.markdown("<div style='text-align:center; padding:0.5rem 0;'>", unsafe_allow_html=True)
-        
-        user_id = st.session_state.get('user_id')
-        if user_id:
-            upvote_emoji = "🔼" if user_upvoted else "⬆️"
-            if st.button(upvote_emoji, key=f"upvote_{complaint_id}", help="Upvote this complaint", use_container_width=True):
-                if user_upvoted:
-                    result = remove_upvote(complaint_id, user_id)
-                else:
-                    result = upvote_complaint(complaint_id, user_id)
-                
-                if result["success"]:
-                    st.rerun()
-        else:
-            st.button("⬆️", key=f"upvote_{complaint_id}", disabled=True, help="Login to upvote", use_container_width=True)
-        
-        # Upvote count with styling
-        upvote_color = "#EF4444" if user_upvoted else "rgba(243,244,246,0.7)"
-        st.markdown(
-            f"<div style='text-align:center; margin-top:0.5rem;'>"
-            f"<div style='font-weight:800; font-size:1.5rem; color:{upvote_color};'>{upvote_count}</div>"
-            f"<div style='font-size:0.75rem; color:rgba(243,244,246,0.6); text-transform:uppercase; letter-spacing:0.05em;'>votes</div>"
-            f"</div>",
-            unsafe_allow_html=True
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
+        render_upvote_control(complaint_id, complaint.get('upvote_count', 0))
     
     with col2:
-        # Title + badges row
-        category = complaint.get('category', 'Other')
-        location = complaint.get('location', 'Unknown')
-        title_html = f"""
-        <div style='display:flex; justify-content:space-between; align-items:flex-start; gap:1rem; margin-bottom:0.75rem; flex-wrap:wrap;'>
-            <div>
-                <div style='font-weight:900; font-size:1.25rem; line-height:1.3; margin-bottom:0.25rem;'>
-                    {category}
-                </div>
-                <div style='color:rgba(243,244,246,0.7); font-size:0.9rem;'>
-                    📍 {location}
-                </div>
+        # Viewer-independent body, shared across sessions until the complaint changes
+        fields = tuple(complaint.get(field) for field in CARD_FIELDS)
+        st.markdown(card_html.get(complaint_id, fields, lambda: build_card_body_html(complaint)), unsafe_allow_html=True)
+        
+        render_complaint_details(complaint, timeline)
+    
+    complaint_card_end()
+
+def build_card_body_html(complaint):
+    """Title, badges, metadata and text of a feed card (no per-viewer state)"""
+    status = complaint.get("status", "New")
+    status_variant = "success" if status == "Resolved" else "warning" if status in ["In Progress", "Assigned", "Acknowledged"] else "info"
+    priority = complaint.get("priority", "Medium")
+    priority_variant = "danger" if priority == "High" else "warning" if priority == "Medium" else "success"
+    category = complaint.get('category', 'Other')
+    location = complaint.get('location', 'Unknown')
+    
+    created = complaint.get('created_at', '')
+    date_html = ""
+    if created:
+        date_str = created[:10] if isinstance(created, str) else str(created)[:10]
+        date_html = f"📅 {date_str}"
+    meta_style = "flex:1; color:rgba(243,244,246,0.7); font-size:0.85rem;"
+    
+    return f"""
+    <div style='display:flex; justify-content:space-between; align-items:flex-start; gap:1rem; margin-bottom:0.75rem; flex-wrap:wrap;'>
+        <div>
+            <div style='font-weight:900; font-size:1.25rem; line-height:1.3; margin-bottom:0.25rem;'>
+                {category}
             </div>
-            <div style='display:flex; gap:0.5rem; flex-wrap:wrap; align-items:flex-start;'>
-                {badge(f'📝 {status}', status_variant)}
-                {badge(f'⚡ {priority}', priority_variant)}
+            <div style='color:rgba(243,244,246,0.7); font-size:0.9rem;'>
+                📍 {location}
             </div>
         </div>
-        """
-        st.markdown(title_html, unsafe_allow_html=True)
-        
-        # Metadata row
-        col_meta1, col_meta2, col_meta3 = st.columns(3)
-        with col_meta1:
-            st.markdown(f"<div style='color:rgba(243,244,246,0.7); font-size:0.85rem;'>👤 <strong>{complaint.get('citizen_name', 'Anonymous')}</strong></div>", unsafe_allow_html=True)
-        with col_meta2:
-            created = complaint.get('created_at', '')
-            if created:
-                date_str = created[:10] if isinstance(created, str) else str(created)[:10]
-                st.markdown(f"<div style='color:rgba(243,244,246,0.7); font-size:0.85rem;'>📅 {date_str}</div>", unsafe_allow_html=True)
-        with col_meta3:
-            zone = complaint.get('zone', 'Unknown')
-            st.markdown(f"<div style='color:rgba(243,244,246,0.7); font-size:0.85rem;'>🗺️ {zone} Zone</div>", unsafe_allow_html=True)
-        
-        st.markdown("<div style='height:0.75rem;'></div>", unsafe_allow_html=True)
+        <div style='display:flex; gap:0.5rem; flex-wrap:wrap; align-items:flex-start;'>
+            {badge(f'📝 {status}', status_variant)}
+            {badge(f'⚡ {priority}', priority_variant)}
+        </div>
+    </div>
+    <div style='display:flex; gap:1rem; flex-wrap:wrap;'>
+        <div style='{meta_style}'>👤 <strong>{complaint.get('citizen_name', 'Anonymous')}</strong></div>
+        <div style='{meta_style}'>{date_html}</div>
+        <div style='{meta_style}'>🗺️ {complaint.get('zone', 'Unknown')} Zone</div>
+    </div>
+    <div style='height:0.75rem;'></div>
+    <div style='color:rgba(243,244,246,0.9); line-height:1.7; font-size:0.95rem;'>{complaint.get('complaint_text', '')}</div>
+    <div style='height:0.75rem;'></div>
+    """
+
+@st.fragment
+@profiled()
+def render_upvote_control(complaint_id, upvote_count):
+    """
+    Upvote button and vote count. Runs as a fragment: a click reruns only
+    this control, not the feed. The count is updated optimistically from the
+    one the feed was loaded with, and put back if the write fails.
+    """
+    # A fragment rerun skips unified_app, so route this thread's reads here
+    set_session(st.session_state.get("db_session"))
+    user_id = st.session_state.get('user_id')
+    upvoted_set = get_upvoted_set()
+    user_upvoted = complaint_id in upvoted_set
+    
+    # complaint_id -> (feed count, shown count); dropped once the feed is
+    # reloaded with a fresh count or the count shown matches the feed's
+    vote_counts = st.session_state.setdefault("vote_counts", {})
+    feed_count, shown_count = vote_counts.get(complaint_id, (upvote_count, upvote_count))
+    if feed_count != upvote_count or shown_count == upvote_count:
+        vote_counts.pop(complaint_id, None)
+        shown_count = upvote_count
+    
+    st.markdown("<div style='text-align:center; padding:0.5rem 0;'>", unsafe_allow_html=True)
+    
+    clicked = False
+    if user_id:
+        upvote_emoji = "🔼" if user_upvoted else "⬆️"
+        clicked = st.button(upvote_emoji, key=f"upvote_{complaint_id}", help="Upvote this complaint", use_container_width=True)
+        if clicked:
+            user_upvoted = not user_upvoted
+            shown_count += 1 if user_upvoted else -1
+    else:
+        st.button("⬆️", key=f"upvote_{complaint_id}", disabled=True, help="Login to upvote", use_container_width=True)
+    
+    # Upvote count with styling
+    upvote_color = "#EF4444" if user_upvoted else "rgba(243,244,246,0.7)"
+    st.markdown(
+        f"<div style='text-align:center; margin-top:0.5rem;'>"
+        f"<div style='font-weight:800; font-size:1.5rem; color:{upvote_color};'>{shown_count}</div>"
+        f"<div style='font-size:0.75rem; color:rgba(243,244,246,0.6); text-transform:uppercase; letter-spacing:0.05em;'>votes</div>"
+        f"</div>",
+        unsafe_allow_html=True
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # The new count is already on screen; now record the vote
+    if clicked:
+        if user_upvoted:
+            result = upvote_complaint(complaint_id, user_id)
+        else:
+            result = remove_upvote(complaint_id, user_id)
+        if result["success"]:
+            if user_upvoted:
+                upvoted_set.add(complaint_id)
+            else:
+                upvoted_set.discard(complaint_id)
+            vote_counts[complaint_id] = (upvote_count, shown_count)
+            note_own_change(result.get("change_id"))
+        else:
+            st.toast(f"⚠️ {result['message']}")
+        # The button was drawn with the label from before the click
+        st.rerun(scope="fragment")
+
+@st.fragment
+@profiled()
+def render_complaint_details(complaint, timeline=None):
+    """
+    View Details button and panel. Runs as a fragment, so opening or
+    closing a card reruns only that card's details.
+    """
+    set_session(st.session_state.get("db_session"))
+    complaint_id = complaint['complaint_id']
+    status = complaint.get("status", "New")
+    
+    # View details button
+    col_btn1, col_btn2 = st.columns([1, 4])
+    with col_btn1:
+        if st.button("📋 View Details", key=f"details_{complaint_id}", use_container_width=True):
+            st.session_state[f"show_details_{complaint_id}"] = True
+    
+    # Show details if clicked
+    if st.session_state.get(f"show_details_{complaint_id}", False):
+        st.markdown("<div style='margin-top:1rem; padding-top:1rem; border-top:1px solid rgba(255,255,255,0.1);'>", unsafe_allow_html=True)
         
-        # Complaint text
-        complaint_text = complaint.get('complaint_text', '')
-        st.markdown(f"<div style='color:rgba(243,244,246,0.9); line-height:1.7; font-size:0.95rem;'>{complaint_text}</div>", unsafe_allow_html=True)
+        col_d1, col_d2 = st.columns(2)
+        with col_d1:
+            st.markdown(f"**Zone:** {complaint.get('zone', 'Unknown')}")
+            st.markdown(f"**Category:** {complaint.get('category', 'Other')}")
+            if complaint.get('address'):
+                st.markdown(f"**Address:** {complaint.get('address')}")
+        with col_d2:
+            st.markdown(f"**Priority:** {complaint.get('priority', 'Medium')}")
+            st.markdown(f"**Complaint ID:** #{complaint_id}")
+            st.markdown(f"**Status:** {status}")
         
-        st.markdown("<div style='height:0.75rem;'></div>", unsafe_allow_html=True)
+        # Timeline (details opened on this click were not in the page batch)
+        if timeline is None:
+            with span("data:timelines"):
+                timeline = get_complaint_timelines([complaint_id]).get(complaint_id, [])
+        if timeline:
+            st.markdown("---")
+            st.markdown("**📅 Timeline:**")
+            for event in timeline:
+                st.markdown(f"""
+                <div style='padding:0.75rem; background:rgba(255,255,255,0.03); border-radius:8px; margin-bottom:0.5rem; border-left:3px solid var(--cv-primary);'>
+                    <div style='font-weight:600; margin-bottom:0.25rem;'>{event['status']}</div>
+                    <div style='color:rgba(243,244,246,0.8); font-size:0.9rem;'>{event['description']}</div>
+                    <div style='color:rgba(243,244,246,0.6); font-size:0.85rem; margin-top:0.25rem;'>{event.get('details', '')}</div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                # Display image if available
+                if event.get('image_path') and os.path.exists(photo_path(event['image_path'])):
+                    try:
+                        display_image_fixed(event['image_path'], caption=f"📸 Update photo - {event['status']}", size="large")
+                    except Exception as e:
+                        st.warning(f"⚠️ Could not load image: {str(e)}")
         
-        # View details button
-        col_btn1, col_btn2 = st.columns([1, 4])
-        with col_btn1:
-            if st.button("📋 View Details", key=f"details_{complaint_id}", use_container_width=True):
-                st.session_state[f"show_details_{complaint_id}"] = True
+        if st.button("✖️ Close Details", key=f"close_{complaint_id}", use_container_width=True):
+            st.session_state[f"show_details_{complaint_id}"] = False
+            st.rerun(scope="fragment")
         
-        # Show details if clicked
-        if st.session_state.get(f"show_details_{complaint_id}", False):
-            st.markdown("<div style='margin-top:1rem; padding-top:1rem; border-top:1px solid rgba(255,255,255,0.1);'>", unsafe_allow_html=True)
-            
-            col_d1, col_d2 = st.columns(2)
-            with col_d1:
-                st.markdown(f"**Zone:** {complaint.get('zone', 'Unknown')}")
-                st.markdown(f"**Category:** {complaint.get('category', 'Other')}")
-                if complaint.get('address'):
-                    st.markdown(f"**Address:** {complaint.get('address')}")
-            with col_d2:
-                st.markdown(f"**Priority:** {complaint.get('priority', 'Medium')}")
-                st.markdown(f"**Complaint ID:** #{complaint_id}")
-                st.markdown(f"**Status:** {status}")
-            
-            # Timeline
-            timeline = get_complaint_timeline(complaint_id)
-            if timeline:
-                st.markdown("---")
-                st.markdown("**📅 Timeline:**")
-                for event in timeline:
-                    st.markdown(f"""
-                    <div style='padding:0.75rem; background:rgba(255,255,255,0.03); border-radius:8px; margin-bottom:0.5rem; border-left:3px solid var(--cv-primary);'>
-                        <div style='font-weight:600; margin-bottom:0.25rem;'>{event['status']}</div>
-                        <div style='color:rgba(243,244,246,0.8); font-size:0.9rem;'>{event['description']}</div>
-                        <div style='color:rgba(243,244,246,0.6); font-size:0.85rem; margin-top:0.25rem;'>{event.get('details', '')}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display image if available
-                    if event.get('image_path') and os.path.exists(event['image_path']):
-                        try:
-                            from PIL import Image
-                            img = Image.open(event['image_path'])
-                            display_image_fixed(img, caption=f"📸 Update photo - {event['status']}", size="large")
-                        except Exception as e:
-                            st.warning(f"⚠️ Could not load image: {str(e)}")
-            
-            if st.button("✖️ Close Details", key=f"close_{complaint_id}", use_container_width=True):
-                st.session_state[f"show_details_{complaint_id}"] = False
-                st.rerun()
-            
-            st.markdown("</div>", unsafe_allow_html=True)
-    
-    complaint_card_end()
+        st.markdown("</div>", unsafe_allow_html=True)
 
+@profiled()
 def render_submit_complaint():
     """Render complaint submission form"""
     st.markdown("<div class='cv-title' style='font-size:1.35rem; margin-bottom:0.5rem;'>➕ Submit a New Complaint</div>", unsafe_allow_html=True)
@@ -374,7 +483,8 @@ def render_submit_complaint():
                     with st.spinner("🔄 Analyzing and submitting your complaint..."):
                         try:
                             # Use AI to assign priority based on complaint content
-                            priority_result = assign_priority_with_reasoning(complaint_text)
+                            with span("ai:assign_priority"):
+                                priority_result = assign_priority_with_reasoning(complaint_text)
                             ai_priority = priority_result["priority"]
                             priority_reasoning = priority_result["reasoning"]
                             
@@ -393,7 +503,8 @@ def render_submit_complaint():
                                 ai_summary=None,
                                 priority_reasoning=priority_reasoning,
                                 is_ai_processed=True,
-                                address=address
+                                address=address,
+                                severity=severity_from_priority(ai_priority)
                             )
                             
                             if complaint_id:
@@ -6,372 +6,47 @@ Goal: Make the app look polished for demos without changing business logic.
 
 from __future__ import annotations
 
+import hashlib
+import os
+from functools import lru_cache
+
 import streamlit as st
 from PIL import Image
 
+from core.profiler import profiled
 
-_CSS = r"""
-<style>
-  @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800;900&display=swap');
-  
-  :root {
-    --cv-bg: #0A0E1A;
-    --cv-panel: #111827;
-    --cv-panel-2: #0F172A;
-    --cv-border: rgba(255, 255, 255, 0.1);
-    --cv-text: #F3F4F6;
-    --cv-muted: rgba(243, 244, 246, 0.7);
-    --cv-primary: #3B82F6;
-    --cv-primary-2: #60A5FA;
-    --cv-primary-dark: #2563EB;
-    --cv-success: #10B981;
-    --cv-warning: #F59E0B;
-    --cv-danger: #EF4444;
-    --cv-purple: #8B5CF6;
-    --cv-radius: 20px;
-    --cv-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.3), 0 2px 4px -1px rgba(0, 0, 0, 0.2);
-    --cv-shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.4), 0 4px 6px -2px rgba(0, 0, 0, 0.3);
-  }
-
-  * {
-    font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif !important;
-  }
-
-  /* Reduce Streamlit chrome */
-  #MainMenu { visibility: hidden; }
-  footer { visibility: hidden; }
-  header { visibility: hidden; }
-  .stDeployButton { display: none; }
-
-  /* Smooth scrolling */
-  html { scroll-behavior: smooth; }
-
-  /* Main container */
-  .block-container {
-    padding-top: 1.5rem;
-    padding-bottom: 3rem;
-    max-width: 1400px;
-  }
-
-  /* Enhanced Buttons */
-  .stButton > button {
-    border-radius: 14px !important;
-    border: 1px solid var(--cv-border) !important;
-    padding: 0.75rem 1.5rem !important;
-    font-weight: 600 !important;
-    font-size: 0.95rem !important;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    box-shadow: var(--cv-shadow) !important;
-    background: rgba(255,255,255,0.05) !important;
-  }
-  .stButton > button:hover {
-    transform: translateY(-2px) !important;
-    box-shadow: var(--cv-shadow-lg) !important;
-    border-color: rgba(255,255,255,0.2) !important;
-  }
-  .stButton > button[kind="primary"] {
-    border: none !important;
-    background: linear-gradient(135deg, var(--cv-primary), var(--cv-primary-2)) !important;
-    color: white !important;
-    font-weight: 700 !important;
-    box-shadow: 0 4px 14px rgba(59, 130, 246, 0.4) !important;
-  }
-  .stButton > button[kind="primary"]:hover {
-    background: linear-gradient(135deg, var(--cv-primary-dark), var(--cv-primary)) !important;
-    box-shadow: 0 6px 20px rgba(59, 130, 246, 0.5) !important;
-    transform: translateY(-2px) !important;
-  }
-
-  /* Enhanced Tabs */
-  div[data-baseweb="tab-list"] {
-    gap: 0.5rem;
-    background: rgba(255,255,255,0.02);
-    padding: 0.4rem;
-    border-radius: 16px;
-    border: 1px solid var(--cv-border);
-  }
-  button[data-baseweb="tab"] {
-    border-radius: 12px !important;
-    border: 1px solid transparent !important;
-    background: transparent !important;
-    padding: 0.6rem 1.2rem !important;
-    font-weight: 600 !important;
-    transition: all 0.2s ease !important;
-  }
-  button[data-baseweb="tab"]:hover {
-    background: rgba(255,255,255,0.05) !important;
-  }
-  button[aria-selected="true"][data-baseweb="tab"] {
-    background: linear-gradient(135deg, rgba(59,130,246,0.2), rgba(96,165,250,0.15)) !important;
-    border-color: rgba(59,130,246,0.3) !important;
-    color: var(--cv-primary-2) !important;
-  }
-
-  /* Enhanced Cards */
-  .cv-card {
-    background: linear-gradient(180deg, rgba(255,255,255,0.08), rgba(255,255,255,0.03));
-    border: 1px solid var(--cv-border);
-    border-radius: var(--cv-radius);
-    padding: 1.5rem 1.75rem;
-    box-shadow: var(--cv-shadow);
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    backdrop-filter: blur(10px);
-  }
-  .cv-card:hover {
-    transform: translateY(-2px);
-    box-shadow: var(--cv-shadow-lg);
-    border-color: rgba(255,255,255,0.15);
-  }
-  .cv-card + .cv-card { margin-top: 1rem; }
-  
-  .cv-card-interactive {
-    cursor: pointer;
-  }
-  .cv-card-interactive:hover {
-    transform: translateY(-4px) !important;
-    border-color: var(--cv-primary) !important;
-  }
-
-  /* Typography */
-  .cv-title {
-    font-size: 1.75rem;
-    font-weight: 900;
-    letter-spacing: -0.03em;
-    margin: 0 0 0.5rem 0;
-    background: linear-gradient(135deg, var(--cv-text), var(--cv-muted));
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-  }
-  .cv-subtitle {
-    color: var(--cv-muted);
-    margin: 0;
-    font-size: 0.95rem;
-    line-height: 1.6;
-  }
-  .cv-divider {
-    height: 1px;
-    background: linear-gradient(90deg, transparent, var(--cv-border), transparent);
-    margin: 1.5rem 0;
-  }
-
-  /* Enhanced Badges */
-  .cv-badge {
-    display: inline-flex;
-    align-items: center;
-    gap: 0.4rem;
-    padding: 0.35rem 0.75rem;
-    border-radius: 999px;
-    border: 1px solid var(--cv-border);
-    background: rgba(255,255,255,0.05);
-    font-size: 0.8rem;
-    font-weight: 600;
-    color: var(--cv-text);
-    white-space: nowrap;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-    transition: all 0.2s ease;
-  }
-  .cv-badge:hover {
-    transform: scale(1.05);
-  }
-  .cv-badge--success {
-    border-color: rgba(16,185,129,0.4);
-    background: linear-gradient(135deg, rgba(16,185,129,0.2), rgba(16,185,129,0.1));
-    color: #6EE7B7;
-  }
-  .cv-badge--warning {
-    border-color: rgba(245,158,11,0.4);
-    background: linear-gradient(135deg, rgba(245,158,11,0.2), rgba(245,158,11,0.1));
-    color: #FCD34D;
-  }
-  .cv-badge--danger {
-    border-color: rgba(239,68,68,0.4);
-    background: linear-gradient(135deg, rgba(239,68,68,0.2), rgba(239,68,68,0.1));
-    color: #FCA5A5;
-  }
-  .cv-badge--info {
-    border-color: rgba(59,130,246,0.4);
-    background: linear-gradient(135deg, rgba(59,130,246,0.2), rgba(59,130,246,0.1));
-    color: #93C5FD;
-  }
-
-  /* Enhanced Hero */
-  .cv-hero {
-    border-radius: 28px;
-    padding: 2.5rem 2rem;
-    border: 1px solid var(--cv-border);
-    background:
-      radial-gradient(1400px 700px at 15% 0%, rgba(59,130,246,0.4), transparent 60%),
-      radial-gradient(1000px 600px at 85% 25%, rgba(139,92,246,0.25), transparent 60%),
-      radial-gradient(800px 500px at 50% 100%, rgba(16,185,129,0.15), transparent 60%),
-      linear-gradient(180deg, rgba(255,255,255,0.08), rgba(255,255,255,0.03));
-    box-shadow: var(--cv-shadow-lg);
-    position: relative;
-    overflow: hidden;
-  }
-  .cv-hero::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background: radial-gradient(circle at 50% 50%, rgba(59,130,246,0.1), transparent 70%);
-    pointer-events: none;
-  }
-  .cv-hero p {
-    margin: 0.5rem 0 0 0;
-    color: var(--cv-muted);
-    font-size: 1.05rem;
-    line-height: 1.7;
-  }
-  .cv-hero .cv-title {
-    margin-bottom: 0.5rem;
-    font-size: 2.25rem;
-  }
-
-  /* Form enhancements */
-  .stTextInput > div > div > input,
-  .stTextArea > div > div > textarea,
-  .stSelectbox > div > div > select {
-    background: rgba(255,255,255,0.05) !important;
-    border: 1px solid var(--cv-border) !important;
-    border-radius: 12px !important;
-    color: var(--cv-text) !important;
-    padding: 0.75rem 1rem !important;
-    transition: all 0.2s ease !important;
-  }
-  .stTextInput > div > div > input:focus,
-  .stTextArea > div > div > textarea:focus,
-  .stSelectbox > div > div > select:focus {
-    border-color: var(--cv-primary) !important;
-    box-shadow: 0 0 0 3px rgba(59,130,246,0.1) !important;
-    background: rgba(255,255,255,0.08) !important;
-  }
-
-  /* Metric cards */
-  [data-testid="stMetricValue"] {
-    font-size: 2rem !important;
-    font-weight: 800 !important;
-    background: linear-gradient(135deg, var(--cv-text), var(--cv-muted));
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-  }
-  [data-testid="stMetricLabel"] {
-    color: var(--cv-muted) !important;
-    font-weight: 600 !important;
-  }
-
-  /* Success/Error messages */
-  .stSuccess, .stError, .stInfo, .stWarning {
-    border-radius: 14px !important;
-    border: 1px solid var(--cv-border) !important;
-    padding: 1rem 1.25rem !important;
-    box-shadow: var(--cv-shadow) !important;
-  }
 
-  /* Complaint card styling */
-  .complaint-card {
-    background: linear-gradient(180deg, rgba(255,255,255,0.08), rgba(255,255,255,0.03));
-    border: 1px solid var(--cv-border);
-    border-radius: var(--cv-radius);
-    padding: 1.5rem;
-    margin-bottom: 1.25rem;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-  }
+# Theme stylesheet, served from core/static by Streamlit's static file serving
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STYLESHEET = "cityvoice.css"
 
-  /* Image container styling */
-  .cv-image-container {
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    background: linear-gradient(180deg, rgba(255,255,255,0.05), rgba(255,255,255,0.02));
-    border: 1px solid var(--cv-border);
-    border-radius: 16px;
-    padding: 1rem;
-    margin: 1rem 0;
-    overflow: hidden;
-    width: 100%;
-    max-width: 500px;
-    height: 400px;
-  }
 
-  .cv-image-container img,
-  .cv-image-container [data-testid="stImage"] {
-    max-width: 100%;
-    max-height: 100%;
-    width: auto !important;
-    height: auto !important;
-    object-fit: contain !important;
-    border-radius: 12px;
-    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-  }
-
-  .cv-image-container [data-testid="stImage"] img {
-    max-width: 100% !important;
-    max-height: 100% !important;
-    width: auto !important;
-    height: auto !important;
-    object-fit: contain !important;
-  }
-
-  .cv-image-small {
-    max-width: 400px;
-    height: 300px;
-  }
-
-  .cv-image-medium {
-    max-width: 550px;
-    height: 420px;
-  }
-
-  .cv-image-large {
-    max-width: 700px;
-    height: 550px;
-  }
-    box-shadow: var(--cv-shadow);
-  }
-  .complaint-card:hover {
-    transform: translateY(-3px);
-    box-shadow: var(--cv-shadow-lg);
-    border-color: rgba(59,130,246,0.3);
-  }
-
-  /* Animations */
-  @keyframes fadeIn {
-    from { opacity: 0; transform: translateY(10px); }
-    to { opacity: 1; transform: translateY(0); }
-  }
-  .cv-card, .complaint-card {
-    animation: fadeIn 0.4s ease-out;
-  }
-
-  /* Scrollbar styling */
-  ::-webkit-scrollbar {
-    width: 8px;
-    height: 8px;
-  }
-  ::-webkit-scrollbar-track {
-    background: rgba(255,255,255,0.02);
-  }
-  ::-webkit-scrollbar-thumb {
-    background: rgba(255,255,255,0.15);
-    border-radius: 4px;
-  }
-  ::-webkit-scrollbar-thumb:hover {
-    background: rgba(255,255,255,0.25);
-  }
-</style>
-"""
+@lru_cache(maxsize=1)
+def _stylesheet() -> tuple:
+    """The theme CSS and a short hash of its content"""
+    with open(os.path.join(STATIC_DIR, STYLESHEET), "rb") as f:
+        css = f.read()
+    return css.decode("utf-8"), hashlib.sha256(css).hexdigest()[:12]
 
 
+@profiled()
 def inject_global_styles() -> None:
-    """Inject global CSS once per session."""
-    if st.session_state.get("_cv_styles_injected"):
-        return
-    st.markdown(_CSS, unsafe_allow_html=True)
-    st.session_state["_cv_styles_injected"] = True
+    """
+    Apply the theme stylesheet. Call it once per rerun, from unified_app only;
+    Streamlit removes elements a rerun does not draw again.
+
+    With static serving enabled (.streamlit/config.toml) each rerun only
+    sends a one-line @import; the browser caches core/static/cityvoice.css,
+    and the content hash in its URL makes it refetch after a change.
+    Otherwise the CSS is inlined. Streamlit releases before 1.57 (Tornado)
+    serve .css from app/static as text/plain and browsers drop the @import,
+    hence the requirement floor.
+    """
+    css, digest = _stylesheet()
+    if st.get_option("server.enableStaticServing"):
+        st.markdown(f'<style>@import url("app/static/{STYLESHEET}?v={digest}");</style>', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 
 def hero(title: str, subtitle: str) -> None:
@@ -439,14 +114,22 @@ def display_image_fixed(image, caption: str = "", size: str = "medium") -> None:
     """
     Display an image in a fixed-size container with proper scaling.
     Uses base64 encoding to ensure proper CSS application.
-    
+
+    A stored photo reference (blob key or legacy path, see core.blob_store)
+    is shown through its pre-rendered derivative for the size (see
+    core.image_derivatives), cached in memory, so the original is not
+    re-encoded on every rerun. A PIL Image (e.g. an upload preview) is
+    downscaled to the container before encoding.
+
     Args:
-        image: PIL Image object or file path string
+        image: PIL Image object, photo reference or data URI
         caption: Text to display below the image
-        size: 'small' (300px), 'medium' (400px), or 'large' (500px)
+        size: 'small' (400px), 'medium' (550px), or 'large' (700px)
     """
     import base64
     from io import BytesIO
+    from core.blob_store import photo_path
+    from core.image_derivatives import DERIVATIVE_SIZES, DERIVATIVE_QUALITY, derivative_data_uri, to_rgb
     
     # Size configuration
     size_config = {
@@ -458,22 +141,18 @@ def display_image_fixed(image, caption: str = "", size: str = "medium") -> None:
     
     # Convert PIL Image to base64
     if hasattr(image, 'save'):  # It's a PIL Image
+        preview = to_rgb(image).copy()
+        preview.thumbnail(DERIVATIVE_SIZES.get(size, DERIVATIVE_SIZES["medium"]), Image.LANCZOS)
         buffer = BytesIO()
-        # Convert RGBA to RGB if necessary
-        if image.mode in ('RGBA', 'LA', 'P'):
-            rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-            rgb_image.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-            rgb_image.save(buffer, format='JPEG', quality=90)
-        else:
-            image.save(buffer, format='JPEG', quality=90)
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.read()).decode()
+        preview.save(buffer, format='JPEG', quality=DERIVATIVE_QUALITY)
+        img_base64 = base64.b64encode(buffer.getvalue()).decode()
         src = f"data:image/jpeg;base64,{img_base64}"
+    elif image.startswith("data:"):
+        # Already encoded (e.g. a processed upload's preview)
+        src = image
     else:
-        # It's a file path
-        with open(image, 'rb') as f:
-            img_base64 = base64.b64encode(f.read()).decode()
-        src = f"data:image/jpeg;base64,{img_base64}"
+        # It's a stored photo reference
+        src = derivative_data_uri(photo_path(image), size)
     
     # Create HTML with inline styles for strict control
     caption_html = f'<div style="margin-top:0.75rem; color:rgba(243,244,246,0.7); font-size:0.9rem; text-align:center;">{caption}</div>' if caption else ''
@@ -8,6 +8,7 @@ Single website with 2 authentication modes:
 import streamlit as st
 import os
 import sys
+import uuid
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -17,13 +18,12 @@ if project_root not in sys.path:
 from core.ui_theme import inject_global_styles, hero, feature_card
 from core.reddit_interface import render_reddit_interface
 from core.authority_interface import render_authority_interface
+from database.routing import set_session
+from core.profiler import should_profile, start_profile, finish_profile, render_overlay, profiled
 
 # Page configuration
 st.set_page_config(page_title="City Voice", page_icon="🏛️", layout="wide", initial_sidebar_state="collapsed")
 
-# Global presentation theme
-inject_global_styles()
-
 # Initialize session state
 if "user_mode" not in st.session_state:
     st.session_state.user_mode = None  # None, "public", or "authority"
@@ -31,6 +31,20 @@ if "user_mode" not in st.session_state:
     st.session_state.assigned_zone = None
     st.session_state.officer_name = None
 
+# Route this session's reads (read-your-writes after its own changes)
+if "db_session" not in st.session_state:
+    st.session_state.db_session = uuid.uuid4().hex
+set_session(st.session_state.db_session)
+
+# Opt-in per-rerun profiling (CITYVOICE_PROFILE=1 or the Admin toggle)
+profile = None
+if should_profile(st.session_state.get("profiling", False)):
+    profile = start_profile(st.session_state.user_mode or "landing", st.session_state.db_session)
+
+# Global presentation theme
+inject_global_styles()
+
+@profiled()
 def render_landing_page():
     """Render the landing page with mode selection"""
     hero("🏛️ City Voice", "A modern, citizen-first platform to report issues and track resolution — built for transparency and efficiency.")
@@ -109,29 +123,39 @@ def render_landing_page():
             st.session_state.user_mode = "authority"
             st.rerun()
 
-# ==========================================
-# LANDING PAGE / MODE SELECTION
-# ==========================================
-if st.session_state.user_mode is None:
-    render_landing_page()
+interrupted = True
+try:
+    # ==========================================
+    # LANDING PAGE / MODE SELECTION
+    # ==========================================
+    if st.session_state.user_mode is None:
+        render_landing_page()
 
-# ==========================================
-# PUBLIC USER MODE (Reddit-like Interface)
-# ==========================================
-elif st.session_state.user_mode == "public":
-    render_reddit_interface()
+    # ==========================================
+    # PUBLIC USER MODE (Reddit-like Interface)
+    # ==========================================
+    elif st.session_state.user_mode == "public":
+        render_reddit_interface()
 
-# ==========================================
-# AUTHORITY MODE
-# ==========================================
-elif st.session_state.user_mode == "authority":
-    render_authority_interface()
+    # ==========================================
+    # AUTHORITY MODE
+    # ==========================================
+    elif st.session_state.user_mode == "authority":
+        render_authority_interface()
 
-# Footer
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: rgba(229,231,235,0.65); padding: 20px;'>
-    <p style="margin:0;">🏛️ City Voice</p>
-    <p style="margin:0.35rem 0 0 0; font-size: 0.95rem;">Your voice matters • support@cityvoice.gov.in</p>
-</div>
-""", unsafe_allow_html=True)
+    # Footer
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; color: rgba(229,231,235,0.65); padding: 20px;'>
+        <p style="margin:0;">🏛️ City Voice</p>
+        <p style="margin:0.35rem 0 0 0; font-size: 0.95rem;">Your voice matters • support@cityvoice.gov.in</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if profile:
+        render_overlay(profile)
+    interrupted = False
+finally:
+    # st.rerun() / st.stop() end a rerun early by raising; still record it
+    if profile:
+        finish_profile(profile, interrupted)
@@ -0,0 +1,192 @@
+"""
+Hot/Cold Complaint Archive
+Complaints resolved or closed more than ARCHIVE_AFTER_DAYS ago move, with
+their action_log rows, from the hot (zone-partitioned) tables into
+complaints_archive / action_log_archive. The feed, zone lists and work queue
+only ever see the hot tables, so their working set stays small; old cases
+remain searchable through search_archive(), a separate uncached path.
+
+Dashboard rollups are left untouched: archived complaints still count.
+
+Each run also prunes change_log entries older than a week (see
+database.changes).
+
+Run it periodically (e.g. nightly):
+    python -m database.archive [--days 90] [--batch-size 500]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from database.db import get_connection, transaction
+from database.changes import ARCHIVE, prune_changes, record_changes
+from database.query_cache import invalidate, invalidate_complaints
+
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 500
+SEARCH_LIMIT = 50
+
+# Uses idx_complaints_resolved (is_open, resolved_at)
+ARCHIVE_CANDIDATES_SQL = """
+    SELECT complaint_id, zone FROM complaints
+    WHERE is_open = 0 AND resolved_at < %s
+    ORDER BY resolved_at
+    LIMIT %s
+    FOR UPDATE
+"""
+
+_COMPLAINT_COLUMNS = (
+    "complaint_id, citizen_name, location, complaint_text, clean_text, category, priority, status, zone, "
+    "address, photo_after, created_at, ai_summary, priority_reasoning, is_ai_processed, model_used, "
+    "processing_time, severity, sla_due_at, source_key, resolved_at"
+)
+_ACTION_COLUMNS = "log_id, complaint_id, officer_id, action, image_path, action_time"
+
+
+def _move_batch(cursor, complaint_ids):
+    placeholders = ", ".join(["%s"] * len(complaint_ids))
+    ids = tuple(complaint_ids)
+    cursor.execute(f"""
+        INSERT INTO complaints_archive ({_COMPLAINT_COLUMNS}, upvote_count)
+        SELECT {_COMPLAINT_COLUMNS},
+               (SELECT COUNT(*) FROM upvotes u WHERE u.complaint_id = c.complaint_id)
+        FROM complaints c
+        WHERE c.complaint_id IN ({placeholders})
+    """, ids)
+    cursor.execute(f"""
+        INSERT INTO action_log_archive ({_ACTION_COLUMNS})
+        SELECT {_ACTION_COLUMNS} FROM action_log WHERE complaint_id IN ({placeholders})
+    """, ids)
+    record_changes(cursor, ARCHIVE, complaint_ids)
+    for table in ("upvotes", "action_log", "complaints"):
+        cursor.execute(f"DELETE FROM {table} WHERE complaint_id IN ({placeholders})", ids)
+
+
+def archive_resolved(days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, progress=False):
+    """
+    Move complaints closed more than `days` ago into the archive tables,
+    `batch_size` complaints per transaction. Returns the number moved.
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    moved = 0
+    zones = set()
+    while True:
+        with transaction() as cursor:
+            cursor.execute(ARCHIVE_CANDIDATES_SQL, (cutoff, batch_size))
+            batch = cursor.fetchall()
+            if batch:
+                _move_batch(cursor, [row[0] for row in batch])
+        if not batch:
+            break
+        moved += len(batch)
+        zones.update(row[1] for row in batch)
+        if progress:
+            print(f"  {moved:>10,} archived")
+
+    for zone in zones:
+        invalidate_complaints(zone)
+    if moved:
+        invalidate("action_log", "upvotes")
+    return moved
+
+
+def search_archive(text=None, zone=None, category=None, limit=SEARCH_LIMIT):
+    """
+    Search archived complaints, most recently resolved first.
+    text matches the complaint text, location or address; zone "Admin"
+    (or None) searches every zone. Returns a list of dicts.
+    """
+    conditions, params = [], []
+    if zone and zone != "Admin":
+        conditions.append("zone = %s")
+        params.append(zone)
+    if category:
+        conditions.append("category = %s")
+        params.append(category)
+    if text:
+        pattern = f"%{text.strip()}%"
+        conditions.append("(complaint_text LIKE %s OR location LIKE %s OR address LIKE %s)")
+        params.extend([pattern] * 3)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit)
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        cursor = connection.cursor()
+        cursor.execute(f"""
+            SELECT complaint_id, citizen_name, location, category, priority, status, zone,
+                   created_at, resolved_at, upvote_count, complaint_text
+            FROM complaints_archive
+            {where}
+            ORDER BY resolved_at DESC
+            LIMIT %s
+        """, tuple(params))
+        columns = [desc[0] for desc in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def get_archived_actions(complaint_id):
+    """Return the archived action_log rows of one complaint, oldest first"""
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        cursor = connection.cursor()
+        cursor.execute(f"""
+            SELECT {_ACTION_COLUMNS} FROM action_log_archive
+            WHERE complaint_id = %s
+            ORDER BY action_time
+        """, (complaint_id,))
+        columns = [desc[0] for desc in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move long-closed complaints into the archive tables")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="Archive complaints closed this many days ago")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"City Voice - Archiving complaints closed over {args.days} days ago")
+    print("=" * 60)
+    try:
+        moved = archive_resolved(args.days, args.batch_size, progress=True)
+        pruned = prune_changes()
+    except Exception as e:
+        print(f"\n[ERROR] Archival failed: {e}")
+        return 1
+    print(f"\n[OK] Archived {moved:,} complaints")
+    print(f"[OK] Pruned {pruned:,} change log entries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
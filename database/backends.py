@@ -0,0 +1,403 @@
+"""
+Storage Backends
+The database helpers talk to a backend through get_connection(); the backend
+decides where the data lives.
+
+  - MySQLBackend: the MySQL server (pooled connections)
+  - SQLiteBackend: an embedded SQLite file in WAL mode, for single-node
+    ward offices and test rigs that should not need a MySQL server
+
+Pick one with environment variables:
+  CITYVOICE_DB_BACKEND   mysql (default) or sqlite
+  CITYVOICE_DB_HOST / CITYVOICE_DB_PORT / CITYVOICE_DB_USER /
+  CITYVOICE_DB_PASSWORD / CITYVOICE_DB_NAME      (MySQL)
+  CITYVOICE_SQLITE_PATH                          (SQLite, default database/cityvoice.db)
+  CITYVOICE_DB_REPLICAS      comma-separated host[:port] read replicas (MySQL)
+  CITYVOICE_SQLITE_REPLICAS  comma-separated replica file paths (SQLite)
+
+Read-only connections (get_connection(read_only=True)) go to the replicas in
+turn and fall back to the primary when none is configured or reachable.
+
+The helpers are written in MySQL-flavoured SQL; the SQLite connection
+rewrites the few MySQL-only constructs (see translate_sql) so every helper
+keeps a single query text and the same function signature on both.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import count
+
+import mysql.connector
+from mysql.connector import errorcode, pooling
+
+DEFAULT_DATABASE_NAME = os.getenv("CITYVOICE_DB_NAME", "cityvoice")
+POOL_SIZE = 10
+SQLITE_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema_sqlite.sql")
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cityvoice.db")
+
+# Tuned for a single-node app: concurrent readers alongside one writer,
+# durable at checkpoint rather than every commit, hot pages kept in memory.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -32000",
+    "PRAGMA mmap_size = 268435456",
+]
+
+# Compiled statements kept per connection, so hot queries are prepared once
+SQLITE_STATEMENT_CACHE = 256
+# Server-side prepared statements kept per MySQL connection (least recently
+# used are closed), well under max_prepared_stmt_count across the pool
+MYSQL_STATEMENT_CACHE = 64
+# Errors after which a prepared statement must be prepared again
+_REPREPARE_ERRORS = (
+    errorcode.CR_SERVER_LOST, errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.ER_UNKNOWN_STMT_HANDLER, errorcode.ER_NEED_REPREPARE,
+)
+
+
+class MySQLBackend:
+    """MySQL server backend with a shared connection pool for the app database"""
+
+    name = "mysql"
+
+    def __init__(self, host="localhost", port=3306, user="root", password="", database=DEFAULT_DATABASE_NAME,
+                 pool_size=POOL_SIZE, replicas=()):
+        """replicas: (host, port) pairs sharing the primary's credentials"""
+        self.database = database
+        self.pool_size = pool_size
+        self._config = {"host": host, "port": port, "user": user, "password": password}
+        self._replica_configs = [dict(self._config, host=r_host, port=r_port) for r_host, r_port in replicas]
+        self._pools = {}
+        self._pool_lock = threading.Lock()
+        self._next_replica = count()
+        # physical connection -> {sql: prepared cursor}
+        self._statements = weakref.WeakKeyDictionary()
+        self._statements_lock = threading.Lock()
+
+    def _get_pool(self, config):
+        name = f"cityvoice_{config['host']}_{config['port']}"
+        with self._pool_lock:
+            if name not in self._pools:
+                # No session reset on return: it would drop the prepared statements
+                # cached per connection (every unit of work commits or rolls back)
+                self._pools[name] = pooling.MySQLConnectionPool(
+                    pool_name=name, pool_size=self.pool_size, pool_reset_session=False,
+                    database=self.database, **config
+                )
+            return self._pools[name]
+
+    def _pooled(self, config):
+        try:
+            return PooledConnection(self._get_pool(config).get_connection())
+        except pooling.PoolError:
+            # pool exhausted: fall back to a dedicated connection
+            return mysql.connector.connect(database=self.database, **config)
+
+    def connect(self, database, read_only=False):
+        """
+        Pooled connection for the app database (from a replica when
+        read_only), a dedicated one otherwise
+        """
+        if database != self.database:
+            return mysql.connector.connect(database=database, **self._config)
+        if read_only and self._replica_configs:
+            start = next(self._next_replica)
+            for i in range(len(self._replica_configs)):
+                config = self._replica_configs[(start + i) % len(self._replica_configs)]
+                try:
+                    return self._pooled(config)
+                except mysql.connector.Error as e:
+                    print(f"Replica {config['host']}:{config['port']} unavailable, trying next:", e)
+        return self._pooled(self._config)
+
+    def begin(self, connection):
+        """Transactions start implicitly (autocommit is off)"""
+
+    def _prepared_cursor(self, connection, sql, fresh=False):
+        # Pooled connections are new wrappers around a long-lived connection
+        physical = getattr(connection, "_cnx", None) or connection
+        with self._statements_lock:
+            cursors = self._statements.setdefault(physical, OrderedDict())
+        cursor = None if fresh else cursors.get(sql)
+        if cursor is not None:
+            cursors.move_to_end(sql)
+            return cursor
+        cursor = cursors[sql] = connection.cursor(prepared=True)
+        while len(cursors) > MYSQL_STATEMENT_CACHE:
+            _, evicted = cursors.popitem(last=False)
+            try:
+                evicted.close()  # deallocates the server-side statement
+            except mysql.connector.Error:
+                pass
+        return cursor
+
+    def fetch_prepared(self, connection, sql, params):
+        """
+        Run sql as a server-side prepared statement that stays prepared on
+        this physical connection for the next request; returns all rows
+        """
+        cursor = self._prepared_cursor(connection, sql)
+        try:
+            cursor.execute(sql, params)
+        except mysql.connector.Error as e:
+            # The statement is gone after a reconnect: prepare it again.
+            # Anything else (a bad query, a constraint) is a real error.
+            if e.errno not in _REPREPARE_ERRORS:
+                raise
+            cursor = self._prepared_cursor(connection, sql, fresh=True)
+            cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+class PooledConnection:
+    """
+    A pooled MySQL connection that ends any open transaction when it is
+    returned, since the pool no longer resets sessions (see MySQLBackend)
+    """
+
+    def __init__(self, connection):
+        self._pooled = connection
+
+    def close(self):
+        if self._pooled.in_transaction:
+            self._pooled.rollback()
+        self._pooled.close()
+
+    def __getattr__(self, attr):
+        return getattr(self._pooled, attr)
+
+
+class SQLiteConnection:
+    """
+    Wraps a thread's sqlite3 connection with the small part of the
+    mysql.connector connection API the helpers use. close() hands the
+    connection back for reuse by the same thread, like a pool would.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, dictionary=False, prepared=False):
+        return SQLiteCursor(self._connection.cursor(), dictionary)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        if self._connection.in_transaction:
+            self._connection.rollback()
+
+
+class SQLiteCursor:
+    """sqlite3 cursor that accepts the helpers' MySQL-flavoured SQL"""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(translate_sql(sql), tuple(params or ()))
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate_sql(sql), [tuple(p) for p in seq_of_params])
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip((d[0] for d in self._cursor.description), row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+_TRANSLATIONS = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE), ""),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE), r"excluded.\1"),
+]
+
+
+@lru_cache(maxsize=512)
+def translate_sql(sql):
+    """
+    Rewrite MySQL-only syntax for SQLite: %s placeholders, INSERT IGNORE,
+    FOR UPDATE (SQLite write transactions already lock), NOW() and
+    ON DUPLICATE KEY UPDATE ... VALUES(col) upserts.
+    """
+    for pattern, replacement in _TRANSLATIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def _adapt_datetime(value):
+    return value.isoformat(" ")
+
+
+def _convert_timestamp(value):
+    return datetime.fromisoformat(value.decode())
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+sqlite3.register_converter("DATE", _convert_date)
+
+
+class SQLiteBackend:
+    """Embedded SQLite backend: one WAL-mode connection per thread"""
+
+    name = "sqlite"
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, replica_paths=()):
+        """replica_paths: database files kept in sync by an external replicator"""
+        self.path = path
+        self.replica_paths = list(replica_paths)
+        self.database = DEFAULT_DATABASE_NAME
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = set()
+        self._next_replica = count()
+
+    def connect(self, database=None, read_only=False):
+        """
+        The thread's connection to the primary file, or to a replica file
+        when read_only (the database argument is ignored)
+        """
+        path = self.path
+        if read_only and self.replica_paths:
+            path = self.replica_paths[next(self._next_replica) % len(self.replica_paths)]
+        connections = self._connections()
+        connection = connections.get(path)
+        if connection is None:
+            connection = sqlite3.connect(
+                path,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                cached_statements=SQLITE_STATEMENT_CACHE,
+            )
+            for pragma in SQLITE_PRAGMAS:
+                connection.execute(pragma)
+            self._ensure_schema(path, connection)
+            connections[path] = connection
+        return SQLiteConnection(connection)
+
+    def fetch_prepared(self, connection, sql, params):
+        """Run sql and return all rows (sqlite3 caches the compiled statement per connection)"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _connections(self):
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def begin(self, connection):
+        """Take the write lock up front so read-then-write units of work are atomic"""
+        connection._connection.execute("BEGIN IMMEDIATE")
+
+    def _ensure_schema(self, path, connection):
+        with self._schema_lock:
+            if path in self._schema_ready:
+                return
+            with open(SQLITE_SCHEMA_PATH, encoding="utf-8") as f:
+                connection.executescript(f.read())
+            self._schema_ready.add(path)
+
+    def close(self):
+        """Close the calling thread's connections"""
+        for connection in self._connections().values():
+            connection.close()
+        self._local.connections = {}
+
+
+def backend_from_env():
+    """Build the backend selected by the CITYVOICE_DB_* environment variables"""
+    kind = os.getenv("CITYVOICE_DB_BACKEND", "mysql").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(
+            os.getenv("CITYVOICE_SQLITE_PATH", DEFAULT_SQLITE_PATH),
+            replica_paths=_split_list(os.getenv("CITYVOICE_SQLITE_REPLICAS", "")),
+        )
+    if kind != "mysql":
+        raise ValueError(f"Unknown CITYVOICE_DB_BACKEND '{kind}' (expected mysql or sqlite)")
+    return MySQLBackend(
+        host=os.getenv("CITYVOICE_DB_HOST", "localhost"),
+        port=int(os.getenv("CITYVOICE_DB_PORT", "3306")),
+        user=os.getenv("CITYVOICE_DB_USER", "root"),
+        password=os.getenv("CITYVOICE_DB_PASSWORD", "newpassword"),
+        replicas=[_host_port(item) for item in _split_list(os.getenv("CITYVOICE_DB_REPLICAS", ""))],
+    )
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _host_port(value):
+    host, _, port = value.partition(":")
+    return host, int(port or 3306)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The process-wide backend, created from the environment on first use"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_env()
+        return _backend
+
+
+def set_backend(backend):
+    """Replace the process-wide backend (tests, admin tools); returns the old one"""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+        return previous
@@ -0,0 +1,205 @@
+"""
+Change Feed
+Every write that changes what the feed or the authority dashboard shows
+appends a row to change_log in the same transaction: a new complaint
+("insert"), a status change ("status"), an upvote or its removal ("upvote"),
+or a move to the archive ("archive").
+
+sync_changes() polls change_log with a "since" cursor, at most once per
+CHANGE_POLL_SECONDS per process, and applies only the deltas to the shared
+query cache:
+- status and upvote changes re-read just the changed feed rows and patch
+  them into the cached feed pages; for status changes the dashboard
+  entries of the affected zones (and the all-zone ones) are invalidated,
+  for upvote changes the feed pages sorted by upvotes (their windows
+  would be out of order);
+- inserts and archivals change which complaints are on which page, so
+  the affected zones' complaint entries are invalidated.
+This keeps every server process fresh, not only the one that made the
+write, for the cost of one small primary-key range query.
+
+Changes seen by the process are numbered in the order they were observed.
+Sessions keep their own position in that sequence and ask changes_since()
+whether anything they show has changed.
+
+Auto-increment ids are allocated at insert but become visible at commit,
+so a lower id can appear after a higher one. Each poll re-reads the last
+CHANGE_LOOKBACK ids to catch those; applying a change twice is harmless.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from database.query_cache import invalidate, invalidate_complaints
+
+INSERT, STATUS, UPVOTE, ARCHIVE = "insert", "status", "upvote", "archive"
+
+CHANGE_POLL_SECONDS = float(os.getenv("CITYVOICE_CHANGE_POLL_SECONDS", "5"))
+CHANGE_LOOKBACK = 100
+CHANGE_BATCH = 1000        # more changes than this in one poll: invalidate instead
+CHANGE_RETENTION_DAYS = 7
+RECENT_CHANGES = 5000      # observed changes kept for changes_since()
+
+
+class Change(NamedTuple):
+    change_id: int
+    complaint_id: int
+    zone: str
+    kind: str
+
+
+def record_changes(cursor, kind, complaint_ids):
+    """
+    Log a change of the given complaints on the writer's cursor (same
+    transaction). Returns the change_id logged for a single complaint.
+    """
+    if complaint_ids:
+        _record(cursor, kind, "complaint_id", list(complaint_ids))
+        return cursor.lastrowid
+
+
+def record_source_key_changes(cursor, kind, source_keys):
+    """Log a change of the complaints with the given import source keys"""
+    if source_keys:
+        _record(cursor, kind, "source_key", list(source_keys))
+
+
+def _record(cursor, kind, column, values):
+    placeholders = ", ".join(["%s"] * len(values))
+    cursor.execute(f"""
+        INSERT INTO change_log (complaint_id, zone, kind)
+        SELECT complaint_id, zone, %s FROM complaints WHERE {column} IN ({placeholders})
+    """, (kind, *values))
+
+
+_lock = threading.Lock()
+_cursor = None       # highest change_id read
+_last_poll = 0.0
+_recent = deque(maxlen=RECENT_CHANGES)  # (sequence, Change)
+_seen = set()        # change_ids within the lookback window
+_sequence = 0
+
+
+def _fetch_changes(since, limit):
+    from database.db import get_connection
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        if not connection:
+            raise Exception("Database connection failed")
+        cursor = connection.cursor()
+        if since is None:
+            cursor.execute("SELECT COALESCE(MAX(change_id), 0) FROM change_log")
+            since = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT change_id, complaint_id, zone, kind FROM change_log
+            WHERE change_id > %s
+            ORDER BY change_id
+            LIMIT %s
+        """, (max(0, since - CHANGE_LOOKBACK), limit))
+        return since, [Change(*row) for row in cursor.fetchall()]
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def apply_changes(changes):
+    """Apply change deltas to the shared query cache"""
+    from database.upvotes import RANKED_FEED_TAG, load_feed_rows, patch_feed_rows
+
+    structural = {change.zone for change in changes if change.kind in (INSERT, ARCHIVE)}
+    for zone in structural:
+        invalidate_complaints(zone)
+    if any(change.kind == ARCHIVE for change in changes):
+        invalidate("action_log", "upvotes")
+
+    updated = [change for change in changes if change.kind in (STATUS, UPVOTE) and change.zone not in structural]
+    if not updated:
+        return
+    status_changes = [change for change in updated if change.kind == STATUS]
+    if status_changes:
+        # Dashboard entries, but not the feed: its rows are patched below
+        invalidate(
+            "complaints:all", "action_log",
+            *{f"complaints:{change.zone}" for change in status_changes},
+            *{f"complaint:{change.complaint_id}" for change in status_changes},
+        )
+    if any(change.kind == UPVOTE for change in updated):
+        invalidate(RANKED_FEED_TAG)
+
+    patch_feed_rows(load_feed_rows({change.complaint_id for change in updated}))
+
+
+def sync_changes(force=False):
+    """
+    Read new change_log rows (at most once per CHANGE_POLL_SECONDS unless
+    forced) and apply them to the cache. Returns the changes applied.
+    """
+    global _cursor, _last_poll, _sequence
+    with _lock:
+        now = time.monotonic()
+        if not force and now - _last_poll < CHANGE_POLL_SECONDS:
+            return []
+        _last_poll = now
+
+        try:
+            start, rows = _fetch_changes(_cursor, CHANGE_BATCH)
+        except Exception as e:
+            # Pages still load from the cache and its TTL; retry next poll
+            print("Failed to read change log:", e)
+            return []
+        if _cursor is not None and len(rows) >= CHANGE_BATCH:
+            # Too far behind to patch: start over from the current state
+            invalidate_complaints()
+            invalidate("upvotes", "action_log")
+        if _cursor is None:
+            # First poll: what is already in the log is already in the cache
+            _seen.update(change.change_id for change in rows if change.change_id <= start)
+        new = [change for change in rows if change.change_id not in _seen]
+        _cursor = max([start] + [change.change_id for change in rows])
+        _seen.update(change.change_id for change in new)
+        _seen.difference_update({change_id for change_id in _seen if change_id <= _cursor - CHANGE_LOOKBACK})
+        for change in new:
+            _sequence += 1
+            _recent.append((_sequence, change))
+
+    if new and len(rows) < CHANGE_BATCH:
+        try:
+            apply_changes(new)
+        except Exception as e:
+            print("Failed to apply changes, invalidating:", e)
+            invalidate_complaints()
+            invalidate("upvotes", "action_log")
+    return new
+
+
+def changes_since(position):
+    """
+    Changes this process has observed after `position` (a session's
+    cursor; None for a new session). Returns (changes, new position);
+    changes is None if the position is too old to tell.
+    """
+    with _lock:
+        latest = _recent[-1][0] if _recent else _sequence
+        if position is None:
+            return [], latest
+        if _recent and position < _recent[0][0] - 1:
+            return None, latest
+        return [change for sequence, change in _recent if sequence > position], latest
+
+
+def prune_changes(days=CHANGE_RETENTION_DAYS):
+    """Delete change_log rows older than `days`; returns the number deleted"""
+    from database.db import transaction
+
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM change_log WHERE changed_at < %s", (datetime.now() - timedelta(days=days),))
+        return cursor.rowcount
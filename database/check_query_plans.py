@@ -0,0 +1,188 @@
+"""
+Query Plan Regression Check
+Seeds a scratch database, runs EXPLAIN on every hot query and fails if any of
+them falls back to a full table scan, a full index scan or a filesort.
+
+Usage:
+    python -m database.check_query_plans [--database cityvoice_plancheck] [--rows 20000]
+
+Exits with status 1 when a plan regresses, so it can run in CI.
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from database.archive import ARCHIVE_CANDIDATES_SQL
+from database.db import get_connection
+from database.migrations import run_migrations
+from database.severity import severity_from_priority, sla_deadline
+from database.upvotes import build_feed_query
+from database.complaint_search import build_search_query
+from database.work_queue import build_work_queue_query
+from database.queries import QUERIES
+from database.zones import ZONE_MAPPING
+from core.helpers import CATEGORIES, build_timeline_query
+
+STATUSES = ["New", "Acknowledged", "Assigned", "In Progress", "Resolved", "Closed"]
+PRIORITIES = ["High", "Medium", "Low"]
+# An unfiltered page read in index order shows up as an "index" scan that
+# stops after LIMIT rows; one estimated to read more is a full index scan
+LIMITED_INDEX_SCAN_ROWS = 1000
+
+
+def hot_queries():
+    """(name, sql, params) for every hot read path"""
+    feeds = [
+        (f"feed{label}, {sort}", *build_feed_query(1, **filters, sort=sort, limit=10))
+        for label, filters in [
+            ("", {}),
+            (" by area", {"location": "Hebbal"}),
+            (" by area and category", {"location": "Hebbal", "category": "Water"}),
+            (" by category", {"category": "Water"}),
+        ]
+        for sort in ("Most Upvoted", "Newest", "Oldest")
+    ]
+    queue, queue_params = build_work_queue_query("North", 1)
+    all_queue, all_queue_params = build_work_queue_query("Admin", 1)
+    timeline, timeline_params = build_timeline_query(list(range(1, 21)))
+    selector, selector_params = build_search_query("North", status="New")
+    selector_next, selector_next_params = build_search_query("North", status="New", after=(1, datetime.now() - timedelta(days=365), 10000))
+    all_selector, all_selector_params = build_search_query("Admin")
+    return [
+        ("zone complaints", QUERIES["zone_complaints"].sql, ("North",)),
+        ("zone recent complaints", QUERIES["zone_recent_complaints"].sql, ("North", 20)),
+        ("zone work queue", queue.sql, queue_params),
+        ("all-zone work queue", all_queue.sql, all_queue_params),
+        *feeds,
+        ("timelines", timeline.sql, timeline_params),
+        ("complaint selector page", selector.sql, selector_params),
+        ("complaint selector next page", selector_next.sql, selector_next_params),
+        ("all-zone complaint selector page", all_selector.sql, all_selector_params),
+        ("complaint by id", QUERIES["complaint_by_id"].sql, (1,)),
+        ("archive candidates", ARCHIVE_CANDIDATES_SQL, (datetime.now() - timedelta(days=90), 500)),
+    ]
+
+
+def seed(connection, rows):
+    """Fill an empty scratch database with a realistic spread of complaints"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM complaints")
+    if cursor.fetchone()[0] >= rows:
+        cursor.close()
+        return
+
+    areas = [(zone, area) for zone, zone_areas in ZONE_MAPPING.items() for area in zone_areas]
+    start = datetime.now() - timedelta(days=730)
+    batch = []
+    for i in range(rows):
+        zone, area = random.choice(areas)
+        priority = random.choice(PRIORITIES)
+        severity = severity_from_priority(priority)
+        created_at = start + timedelta(minutes=i * 50)
+        batch.append((
+            f"Citizen {i}", area, "Seeded complaint text", "seeded complaint text",
+            random.choice(CATEGORIES), priority, severity, sla_deadline(severity, created_at),
+            random.choice(STATUSES), zone, created_at,
+        ))
+        if len(batch) == 1000:
+            _insert_batch(cursor, batch)
+            batch = []
+    if batch:
+        _insert_batch(cursor, batch)
+
+    cursor.execute("SELECT complaint_id FROM complaints")
+    ids = [row[0] for row in cursor.fetchall()]
+    actions = [(random.choice(ids), random.randint(1, 5), "Seeded action") for _ in range(rows)]
+    cursor.executemany(
+        "INSERT INTO action_log (complaint_id, officer_id, action) VALUES (%s, %s, %s)",
+        actions,
+    )
+    cursor.executemany(
+        "INSERT IGNORE INTO users (username, email, password_hash) VALUES (%s, %s, %s)",
+        [(f"seed{u}", f"seed{u}@example.com", "x") for u in range(200)],
+    )
+    cursor.execute("SELECT user_id FROM users")
+    user_ids = [row[0] for row in cursor.fetchall()]
+    cursor.executemany(
+        "INSERT IGNORE INTO upvotes (complaint_id, user_id) VALUES (%s, %s)",
+        [(random.choice(ids), random.choice(user_ids)) for _ in range(rows)],
+    )
+    cursor.execute("""
+        UPDATE complaints SET upvote_count =
+            (SELECT COUNT(*) FROM upvotes u WHERE u.complaint_id = complaints.complaint_id)
+    """)
+    connection.commit()
+    cursor.execute("ANALYZE TABLE complaints, action_log, upvotes")
+    cursor.fetchall()
+    cursor.close()
+
+
+def _insert_batch(cursor, batch):
+    cursor.executemany("""
+        INSERT INTO complaints
+        (citizen_name, location, complaint_text, clean_text, category, priority, severity, sla_due_at,
+         status, zone, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, batch)
+
+
+def plan_problems(connection, sql, params):
+    """Return a list of problems found in the EXPLAIN output for one query"""
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute("EXPLAIN " + sql, params)
+    plan = cursor.fetchall()
+    cursor.close()
+
+    problems = []
+    for step in plan:
+        table = step.get("table")
+        extra = step.get("Extra") or ""
+        if step.get("type") == "ALL":
+            problems.append(f"full scan of {table}")
+        if step.get("type") == "index" and (step.get("rows") or 0) > LIMITED_INDEX_SCAN_ROWS:
+            problems.append(f"full index scan of {table}")
+        if "Using filesort" in extra:
+            problems.append(f"filesort on {table}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot queries against a seeded database")
+    parser.add_argument("--database", default="cityvoice_plancheck")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    server = get_connection(database=None)
+    if not server:
+        print("[ERROR] Database connection failed")
+        return 2
+    server.cursor().execute(f"CREATE DATABASE IF NOT EXISTS `{args.database}`")
+    server.close()
+
+    run_migrations(args.database)
+    connection = get_connection(args.database)
+    seed(connection, args.rows)
+
+    failures = 0
+    for name, sql, params in hot_queries():
+        problems = plan_problems(connection, sql, params)
+        if problems:
+            failures += 1
+            print(f"[FAIL] {name}: {', '.join(problems)}")
+        else:
+            print(f"[OK]   {name}")
+    connection.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Authority Complaint Selector
+Server-side search and pagination for the Update Status selector, so a zone
+with tens of thousands of complaints never has to be listed, formatted or
+scanned in the browser session. Only one page of options is fetched; the
+selected complaint is then loaded by primary key.
+
+Pages are keyset-paginated: the next page starts after the last option of
+the current one, read in index order (migration 7), so a deep page costs
+the same as the first instead of skipping an ever longer OFFSET.
+"""
+
+from database.db import get_connection
+from database.query_cache import cached_query, complaint_tags
+from database.queries import QUERIES, ComplaintOption, Query, columns, fetch
+from database.rollups import fetch_rollup_counts
+
+SELECTOR_PAGE_SIZE = 100
+
+
+def build_search_conditions(zone, status=None, priority=None, text=None):
+    """
+    WHERE clause and parameters for a selector search ("Admin" = all zones).
+    Text matches "#<id>" / "<id>" exactly, otherwise location, category,
+    citizen name or complaint text.
+    """
+    conditions = []
+    params = []
+    if zone != "Admin":
+        conditions.append("zone = %s")
+        params.append(zone)
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+    if priority:
+        conditions.append("priority = %s")
+        params.append(priority)
+    text = (text or "").strip()
+    if text.lstrip("#").isdigit():
+        conditions.append("complaint_id = %s")
+        params.append(int(text.lstrip("#")))
+    elif text:
+        conditions.append(
+            "(location LIKE %s ESCAPE '!' OR category LIKE %s ESCAPE '!' "
+            "OR citizen_name LIKE %s ESCAPE '!' OR complaint_text LIKE %s ESCAPE '!')"
+        )
+        params.extend([f"%{escape_like(text)}%"] * 4)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def escape_like(text):
+    """Match % and _ in a search term literally (LIKE ... ESCAPE '!')"""
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def page_after(option):
+    """Keyset cursor of the page that follows `option` (the last one shown)"""
+    return (option.severity, option.created_at, option.complaint_id)
+
+
+def build_search_query(zone, status=None, priority=None, text=None, limit=SELECTOR_PAGE_SIZE, after=None):
+    """
+    Selector page query, in the zone list's order (severity, then newest),
+    starting after the keyset cursor `after` (see page_after)
+    """
+    where, params = build_search_conditions(zone, status, priority, text)
+    if after is not None:
+        severity, created_at, complaint_id = after
+        # The order mixes directions, so no row constructor; the leading
+        # severity bound gives the index range a start
+        keyset = (
+            "severity >= %s AND (severity > %s OR created_at < %s "
+            "OR (created_at = %s AND complaint_id < %s))"
+        )
+        where = f"{where} AND {keyset}" if where else f"WHERE {keyset}"
+        params = [*params, severity, severity, created_at, created_at, complaint_id]
+    query = Query("complaint_search", f"""
+        SELECT {columns(ComplaintOption._fields)} FROM complaints
+        {where}
+        ORDER BY severity ASC, created_at DESC, complaint_id DESC
+        LIMIT %s
+    """, ComplaintOption)
+    return query, (*params, limit)
+
+
+def search_complaints(zone, status=None, priority=None, text=None, after=None, page_size=SELECTOR_PAGE_SIZE):
+    """
+    One page of selector options, starting after the keyset cursor `after`
+    (None for the first page), and the total number of matches.
+    Returns (list of ComplaintOption, total). Free-text searches are not
+    cached: every keystroke would add an entry nobody asks for again.
+    """
+    if text:
+        return _load_search(zone, status, priority, text, after, page_size)
+    key = (zone, status, priority, None, after, page_size)
+    return cached_query(
+        "complaint_search", key,
+        lambda: _load_search(zone, status, priority, text, after, page_size),
+        tags=complaint_tags(None if zone == "Admin" else zone),
+    )
+
+
+def get_filter_values(zone):
+    """
+    (statuses, priorities) present in a zone ("Admin" = all zones), for the
+    selector's filters. Read from the rollup counters, which also count
+    archived complaints, rather than from the zone's complaints.
+    """
+    return cached_query(
+        "selector_filters", (zone,),
+        lambda: _load_filter_values(zone),
+        tags=complaint_tags(None if zone == "Admin" else zone),
+    )
+
+
+def get_complaint(complaint_id):
+    """A single complaint by id as a dict, or None"""
+    row = cached_query(
+        "complaint_by_id", (complaint_id,),
+        lambda: _load_complaint(complaint_id),
+        tags=("complaints", f"complaint:{complaint_id}"),
+    )
+    return row._asdict() if row else None
+
+
+def _load_search(zone, status, priority, text, after, page_size):
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        query, params = build_search_query(zone, status, priority, text, page_size, after)
+        options = fetch(connection, query, params)
+
+        where, count_params = build_search_conditions(zone, status, priority, text)
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM complaints {where}", tuple(count_params))
+        return options, cursor.fetchone()[0]
+
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def _load_filter_values(zone):
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        cursor = connection.cursor()
+        rows = fetch_rollup_counts(cursor, zone)
+        return sorted({row[2] for row in rows}), sorted({row[1] for row in rows})
+
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def _load_complaint(complaint_id):
+    connection = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        rows = fetch(connection, QUERIES["complaint_by_id"], (complaint_id,))
+        return rows[0] if rows else None
+
+    finally:
+        if connection and connection.is_connected():
+            connection.close()
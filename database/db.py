@@ -1,22 +1,69 @@
-import mysql.connector
-
-def get_connection():
+import time
+from contextlib import contextmanager
+
+from database.backends import get_backend, DEFAULT_DATABASE_NAME
+from database.instrumentation import InstrumentedConnection, record_acquire
+from database.query_cache import invalidate, invalidate_complaints
+from database.routing import record_write, reads_pinned_to_primary
+from database.rollups import apply_complaints_delta, apply_complaint_delta, lock_complaints
+from database.changes import INSERT, STATUS, record_changes
+from database.severity import severity_from_priority, sla_deadline
+
+DATABASE_NAME = DEFAULT_DATABASE_NAME
+
+def get_connection(database=DATABASE_NAME, read_only=False):
+    """
+    Get a connection from the configured backend (MySQL by default, SQLite
+    with CITYVOICE_DB_BACKEND=sqlite); pass database=None to connect
+    without selecting one. close() hands the connection back for reuse.
+
+    read_only=True marks a pure read: it is served by a replica unless the
+    current session wrote recently (read-your-writes).
+
+    Every statement on the connection is timed (see database.instrumentation).
+    """
+    started = time.perf_counter()
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",            # change if your username is different
-            password="newpassword", # your MySQL password
-            database="cityvoice"
-        )
-        
-        return connection
+        connection = get_backend().connect(database, read_only=read_only and not reads_pinned_to_primary())
     except Exception as e:
+        record_acquire((time.perf_counter() - started) * 1000, error=True)
         print("Database connection failed:", e)
         return None
+    record_acquire((time.perf_counter() - started) * 1000)
+    return InstrumentedConnection(connection)
+
+@contextmanager
+def transaction():
+    """
+    Unit of work: yields a cursor on one pooled connection and commits
+    everything done through it at the end, or rolls it all back on error.
+    """
+    connection = get_connection()
+    if not connection:
+        raise Exception("Database connection failed. Check MySQL is running and credentials are correct.")
+    cursor = connection.cursor()
+    try:
+        get_backend().begin(connection)
+        yield cursor
+        connection.commit()
+        record_write()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        if connection.is_connected():
+            connection.close()
 
 
 def insert_complaint(name, location, original_text, clean_text, category, priority, 
-                     zone=None, ai_summary=None, priority_reasoning=None, is_ai_processed=True, address=None):
+                     zone=None, ai_summary=None, priority_reasoning=None, is_ai_processed=True, address=None,
+                     severity=None):
+    """
+    Insert a complaint and return its complaint_id.
+    severity is the numeric P0-P3 level (0-3); when omitted it is derived
+    from the text priority. The SLA deadline follows from the severity.
+    """
     connection = None
     cursor = None
     try:
@@ -29,21 +76,31 @@ def insert_complaint(name, location, original_text, clean_text, category, priori
         sql = """
         INSERT INTO complaints 
         (citizen_name, location, complaint_text, clean_text, category, priority, zone,
-         ai_summary, priority_reasoning, is_ai_processed, address)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+         ai_summary, priority_reasoning, is_ai_processed, address, severity, sla_due_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
 
+        if severity is None:
+            severity = severity_from_priority(priority)
+        zone = zone or "Unknown"  # complaints are partitioned by zone
         values = (name, location, original_text, clean_text, category, priority, zone,
-                  ai_summary, priority_reasoning, is_ai_processed, address)
+                  ai_summary, priority_reasoning, is_ai_processed, address,
+                  severity, sla_deadline(severity))
         cursor.execute(sql, values)
-        connection.commit()
         
         # Return the inserted complaint_id
         complaint_id = cursor.lastrowid
+        apply_complaint_delta(cursor, complaint_id, +1)
+        record_changes(cursor, INSERT, [complaint_id])
+        connection.commit()
+        record_write()
+        invalidate_complaints(zone)
         print(f"Complaint inserted successfully! ID: {complaint_id}")
         return complaint_id
 
     except Exception as e:
+        if connection:
+            connection.rollback()
         error_msg = f"Failed to insert complaint: {str(e)}"
         print(error_msg)
         # Re-raise exception so it can be caught and displayed in Streamlit
@@ -55,50 +112,114 @@ def insert_complaint(name, location, original_text, clean_text, category, priori
         if connection and connection.is_connected():
             connection.close()
 
-def update_status(complaint_id, new_status, image_path=None):
+def _set_status(cursor, complaint_ids, new_status, image_path=None):
+    """
+    Change the status of complaints on the caller's cursor, moving their
+    rollup counts from the old status to the new one. Returns {complaint_id:
+    zone} for the complaints that exist (and were updated).
+    """
+    locked = lock_complaints(cursor, complaint_ids)
+    if not locked:
+        return {}
+    complaint_ids = [row[0] for row in locked]
+
+    apply_complaints_delta(cursor, complaint_ids, -1)
+    # resolved_at starts the archive clock (see database.archive)
+    resolved_sql = "resolved_at = CASE WHEN %s IN ('Resolved', 'Closed') THEN COALESCE(resolved_at, NOW()) ELSE NULL END"
+    if image_path:
+        cursor.executemany(
+            f"UPDATE complaints SET status = %s, {resolved_sql}, photo_after = %s WHERE complaint_id = %s",
+            [(new_status, new_status, image_path, complaint_id) for complaint_id in complaint_ids],
+        )
+    else:
+        cursor.executemany(
+            f"UPDATE complaints SET status = %s, {resolved_sql} WHERE complaint_id = %s",
+            [(new_status, new_status, complaint_id) for complaint_id in complaint_ids],
+        )
+    apply_complaints_delta(cursor, complaint_ids, +1)
+    record_changes(cursor, STATUS, complaint_ids)
+    return {row[0]: row[1] for row in locked}
+
+
+def _insert_actions(cursor, actions):
+    """Insert (complaint_id, officer_id, action, image_path) rows into action_log"""
+    cursor.executemany("""
+        INSERT INTO action_log (complaint_id, officer_id, action, image_path)
+        VALUES (%s, %s, %s, %s)
+    """, actions)
+
+
+def _invalidate_status_change(zones):
+    for zone in zones:
+        invalidate_complaints(zone)
+    invalidate("action_log")
+
+
+def apply_status_update(complaint_id, new_status, officer_id, action_text, image_path=None):
+    """
+    Change a complaint's status, store the resolution photo and write the
+    action_log entry in a single transaction. Raises on failure, in which
+    case nothing is changed.
+    """
     try:
-        connection = get_connection()
-        cursor = connection.cursor()
+        with transaction() as cursor:
+            updated = _set_status(cursor, [complaint_id], new_status, image_path)
+            if not updated:
+                raise Exception(f"Complaint #{complaint_id} not found")
+            _insert_actions(cursor, [(complaint_id, officer_id, action_text, image_path)])
+    except Exception as e:
+        error_msg = f"Failed to update complaint: {str(e)}"
+        print(error_msg)
+        raise Exception(error_msg)
 
-        if image_path:
-            sql = "UPDATE complaints SET status = %s, photo_after = %s WHERE complaint_id = %s"
-            cursor.execute(sql, (new_status, image_path, complaint_id))
-        else:
-            sql = "UPDATE complaints SET status = %s WHERE complaint_id = %s"
-            cursor.execute(sql, (new_status, complaint_id))
+    _invalidate_status_change(set(updated.values()))
+    print("Status updated and action logged!")
 
-        connection.commit()
+
+def bulk_update_status(complaint_ids, new_status, officer_id, action_text):
+    """
+    Apply the same status change and action to many complaints in one
+    transaction (e.g. "mark all selected as Resolved"). Ids that no longer
+    exist are skipped and get no action_log entry. Returns the number of
+    complaints updated; raises on failure, in which case none are.
+    """
+    complaint_ids = sorted(set(complaint_ids))
+    if not complaint_ids:
+        return 0
+    try:
+        with transaction() as cursor:
+            updated = _set_status(cursor, complaint_ids, new_status)
+            _insert_actions(cursor, [(complaint_id, officer_id, action_text, None) for complaint_id in sorted(updated)])
+    except Exception as e:
+        error_msg = f"Failed to update complaints: {str(e)}"
+        print(error_msg)
+        raise Exception(error_msg)
+
+    _invalidate_status_change(set(updated.values()))
+    print(f"Updated {len(updated)} complaints!")
+    return len(updated)
+
+
+def update_status(complaint_id, new_status, image_path=None):
+    try:
+        with transaction() as cursor:
+            updated = _set_status(cursor, [complaint_id], new_status, image_path)
+        for zone in set(updated.values()):
+            invalidate_complaints(zone)
 
         print("Status updated successfully!")
 
     except Exception as e:
         print("Failed to update status:", e)
 
-    finally:
-        if connection and connection.is_connected():
-            cursor.close()
-            connection.close()
-
 
 def log_action(complaint_id, officer_id, action_text, image_path=None):
     try:
-        connection = get_connection()
-        cursor = connection.cursor()
-
-        sql = """
-        INSERT INTO action_log (complaint_id, officer_id, action, image_path)
-        VALUES (%s, %s, %s, %s)
-        """
-        cursor.execute(sql, (complaint_id, officer_id, action_text, image_path))
-        connection.commit()
+        with transaction() as cursor:
+            _insert_actions(cursor, [(complaint_id, officer_id, action_text, image_path)])
+        invalidate("action_log")
 
         print("Action logged!")
 
     except Exception as e:
         print("Failed to log action:", e)
-
-    finally:
-        if connection and connection.is_connected():
-            cursor.close()
-            connection.close()
-
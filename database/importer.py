@@ -0,0 +1,237 @@
+"""
+Bulk Complaint Importer
+Streams CSV or JSONL complaint dumps from other channels into the database
+in constant memory: records are read one at a time, triaged and inserted in
+chunks, each chunk in its own transaction.
+
+Usage:
+    python -m database.importer database/complaints.csv [--triage none|fallback|ai]
+        [--source NAME] [--chunk-size 1000] [--workers 8]
+
+Every record gets a source key ("<source>:<id>", or a content hash when the
+file has no id column), so re-running an import skips rows already loaded.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from database.db import transaction
+from database.changes import INSERT, record_source_key_changes
+from database.query_cache import invalidate_complaints
+from database.rollups import apply_source_keys_delta
+from database.severity import severity_from_priority, sla_deadline
+from database.zones import assign_zone
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Accepted spellings for each field, first match wins
+FIELD_ALIASES = {
+    "id": ("complaint_id", "id", "source_id"),
+    "name": ("citizen_name", "name"),
+    "location": ("location", "area"),
+    "text": ("complaint_text", "text", "description"),
+    "created_at": ("created_at", "date"),
+    "category": ("category",),
+    "priority": ("priority",),
+    "address": ("address",),
+}
+
+_INSERT_SQL = """
+    INSERT IGNORE INTO complaints
+    (citizen_name, location, complaint_text, clean_text, category, priority, zone,
+     is_ai_processed, address, severity, sla_due_at, created_at, source_key)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def iter_records(path):
+    """Yield one dict per record from a .csv or .jsonl/.ndjson file"""
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def _field(record, name):
+    for alias in FIELD_ALIASES[name]:
+        value = record.get(alias)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def _parse_date(value):
+    """ISO date/time, or None if missing or unparseable"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def normalize(record, source):
+    """Map a raw record onto complaint fields; returns None if it has no text"""
+    text = _field(record, "text")
+    if not text:
+        return None
+    location = _field(record, "location") or "Unknown"
+    name = _field(record, "name") or "Anonymous"
+    created_at = _parse_date(_field(record, "created_at"))
+    source_id = _field(record, "id")
+    if source_id is None:
+        # Only what is in the file: an undated record must hash the same on every run
+        day = f"{created_at:%Y-%m-%d}" if created_at else ""
+        source_id = hashlib.sha1(f"{name}|{location}|{text}|{day}".encode()).hexdigest()
+    return {
+        "name": name,
+        "location": location,
+        "text": text,
+        "created_at": created_at or datetime.now(),
+        "category": _field(record, "category"),
+        "priority": _field(record, "priority"),
+        "address": _field(record, "address"),
+        "zone": assign_zone(location),
+        "source_key": f"{source}:{source_id}"[:100],
+        "is_ai_processed": False,
+    }
+
+
+def _triage_fallback(row):
+    from ai.classifier import classify_complaint_fallback
+    from ai.priority import assign_priority_fallback
+
+    row["category"] = row["category"] or classify_complaint_fallback(row["text"])
+    row["priority"] = row["priority"] or assign_priority_fallback(row["text"])
+    return row
+
+
+def _triage_ai(row):
+    from ai.classifier import validate_and_classify_complaint_ai
+
+    result = validate_and_classify_complaint_ai(row["text"], row["category"])
+    if not isinstance(result, dict):
+        # The AI call failed and the classifier fell back to a bare category
+        return _triage_fallback(row)
+    row["category"] = row["category"] or result.get("category") or "Other"
+    row["priority"] = row["priority"] or result.get("priority") or "P2"
+    row["is_ai_processed"] = True
+    return row
+
+
+TRIAGE = {"none": None, "fallback": _triage_fallback, "ai": _triage_ai}
+
+
+def _to_values(row):
+    # Triage yields P0-P3; files may carry High/Medium/Low. Store both scales.
+    severity = severity_from_priority(row["priority"])
+    priority = {0: "High", 1: "High", 2: "Medium", 3: "Low"}[severity]
+    return (
+        row["name"], row["location"], row["text"], row["text"], row["category"] or "Other",
+        priority, row["zone"], row["is_ai_processed"], row["address"],
+        severity, sla_deadline(severity, row["created_at"]), row["created_at"], row["source_key"],
+    )
+
+
+def _import_chunk(rows):
+    """Insert one chunk in a single transaction; returns the number inserted"""
+    # Keep the first occurrence of each key within the chunk
+    unique = {}
+    for row in rows:
+        unique.setdefault(row["source_key"], row)
+    keys = list(unique)
+
+    with transaction() as cursor:
+        placeholders = ", ".join(["%s"] * len(keys))
+        cursor.execute(f"SELECT source_key FROM complaints WHERE source_key IN ({placeholders})", tuple(keys))
+        existing = {row[0] for row in cursor.fetchall()}
+        new_rows = [row for key, row in unique.items() if key not in existing]
+        if not new_rows:
+            return 0
+        cursor.executemany(_INSERT_SQL, [_to_values(row) for row in new_rows])
+        new_keys = [row["source_key"] for row in new_rows]
+        apply_source_keys_delta(cursor, new_keys, +1)
+        record_source_key_changes(cursor, INSERT, new_keys)
+    return len(new_rows)
+
+
+def import_file(path, triage="fallback", source=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=8, progress=True):
+    """
+    Import a CSV/JSONL file. Returns a summary dict with counts and rows/sec.
+    """
+    source = source or os.path.splitext(os.path.basename(path))[0]
+    triage_fn = TRIAGE[triage]
+    summary = {"read": 0, "inserted": 0, "duplicates": 0, "skipped": 0}
+    started = time.perf_counter()
+
+    records = iter_records(path)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            summary["read"] += len(chunk)
+
+            rows = [row for row in (normalize(record, source) for record in chunk) if row]
+            summary["skipped"] += len(chunk) - len(rows)
+            if triage_fn and rows:
+                # AI triage is network-bound, so it fans out; keyword fallback is cheap inline
+                mapper = pool.map if triage == "ai" else map
+                rows = list(mapper(triage_fn, rows))
+            if rows:
+                inserted = _import_chunk(rows)
+                summary["inserted"] += inserted
+                summary["duplicates"] += len(rows) - inserted
+
+            if progress:
+                elapsed = time.perf_counter() - started
+                print(f"  {summary['read']:>10,} read  {summary['inserted']:>10,} inserted  "
+                      f"{summary['read'] / elapsed:>8,.0f} rows/sec")
+
+    invalidate_complaints()
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    summary["rows_per_sec"] = round(summary["read"] / summary["seconds"]) if summary["seconds"] else summary["read"]
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a CSV/JSONL complaint dump into City Voice")
+    parser.add_argument("path")
+    parser.add_argument("--triage", choices=sorted(TRIAGE), default="fallback")
+    parser.add_argument("--source", help="Source name used in dedup keys (default: file name)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=8, help="Parallel AI triage requests")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"City Voice - Importing {args.path}")
+    print("=" * 60)
+    try:
+        summary = import_file(args.path, args.triage, args.source, args.chunk_size, args.workers)
+    except Exception as e:
+        print(f"\n[ERROR] Import failed: {e}")
+        return 1
+    print(f"\n[OK] {summary['inserted']:,} inserted, {summary['duplicates']:,} duplicates, "
+          f"{summary['skipped']:,} skipped in {summary['seconds']}s ({summary['rows_per_sec']:,} rows/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
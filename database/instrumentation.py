@@ -0,0 +1,226 @@
+"""
+Database Instrumentation
+Every connection handed out by get_connection() is wrapped so each statement
+is timed. Per query name it records a latency histogram, rows returned and
+errors; connection acquire time is tracked separately. Statements slower
+than SLOW_QUERY_MS go to the "cityvoice.slow_query" logger and a short
+in-memory slow log, with parameter values redacted.
+
+Query names come from the query cache (e.g. "feed", "zone_complaints") or
+query_label(); anything else is named by its verb and table, e.g.
+"insert:complaints".
+
+snapshot() returns all of it for the admin dashboard and tests.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+SLOW_QUERY_MS = float(os.getenv("CITYVOICE_SLOW_QUERY_MS", "200"))
+SLOW_LOG_SIZE = 100
+
+# Histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+slow_logger = logging.getLogger("cityvoice.slow_query")
+
+_label = ContextVar("cityvoice_query_label", default=None)
+_lock = threading.Lock()
+_queries = {}    # name -> stats dict
+_acquire = None  # stats dict for connection acquisition
+_slow = deque(maxlen=SLOW_LOG_SIZE)
+_listeners = []  # called with (name, elapsed_ms) after every statement
+
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+`?(\w+)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _new_stats():
+    return {"count": 0, "errors": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "buckets": [0] * len(LATENCY_BUCKETS_MS)}
+
+
+def _observe(stats, elapsed_ms, error=False):
+    stats["count"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    if error:
+        stats["errors"] += 1
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if elapsed_ms <= bound:
+            stats["buckets"][i] += 1
+            break
+
+
+@contextmanager
+def query_label(name):
+    """Name the statements issued inside this block (for the metrics)"""
+    token = _label.set(name)
+    try:
+        yield
+    finally:
+        _label.reset(token)
+
+
+def query_name(sql):
+    """The current label, or "<verb>:<table>" derived from the SQL"""
+    label = _label.get()
+    if label:
+        return label
+    verb = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else "?"
+    match = _TABLE_RE.search(sql)
+    return f"{verb}:{match.group(1).lower()}" if match else verb
+
+
+def redact(params):
+    """Replace parameter values by their type, so the slow log holds no user data"""
+    if params is None:
+        return None
+    return tuple("NULL" if value is None else f"<{type(value).__name__}>" for value in params)
+
+
+def add_listener(listener):
+    """Call listener(name, elapsed_ms) after every statement (e.g. the render profiler)"""
+    _listeners.append(listener)
+
+
+def record_statement(name, sql, params, elapsed_ms, error=False):
+    with _lock:
+        _observe(_queries.setdefault(name, _new_stats()), elapsed_ms, error)
+    for listener in _listeners:
+        listener(name, elapsed_ms)
+    if elapsed_ms >= SLOW_QUERY_MS:
+        entry = {
+            "name": name,
+            "ms": round(elapsed_ms, 1),
+            "sql": _SPACE_RE.sub(" ", sql).strip()[:500],
+            "params": redact(params),
+            "at": time.time(),
+        }
+        with _lock:
+            _slow.append(entry)
+        slow_logger.warning("slow query %s took %.1f ms: %s %s", name, elapsed_ms, entry["sql"], entry["params"])
+
+
+def record_rows(name, rows):
+    with _lock:
+        stats = _queries.get(name)
+        if stats:
+            stats["rows"] += rows
+
+
+def record_acquire(elapsed_ms, error=False):
+    global _acquire
+    with _lock:
+        if _acquire is None:
+            _acquire = _new_stats()
+        _observe(_acquire, elapsed_ms, error)
+
+
+class InstrumentedCursor:
+    """Cursor wrapper that times statements and counts fetched rows"""
+
+    def __init__(self, cursor):
+        self._raw = cursor
+        self._name = None
+
+    def _timed(self, method, sql, params, many=False):
+        self._name = query_name(sql)
+        started = time.perf_counter()
+        try:
+            result = method(sql, params)
+        except Exception:
+            record_statement(self._name, sql, None if many else params, (time.perf_counter() - started) * 1000, error=True)
+            raise
+        record_statement(self._name, sql, None if many else params, (time.perf_counter() - started) * 1000)
+        return result
+
+    def execute(self, sql, params=()):
+        return self._timed(self._raw.execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._timed(self._raw.executemany, sql, seq_of_params, many=True)
+
+    def fetchone(self):
+        row = self._raw.fetchone()
+        if row is not None:
+            record_rows(self._name, 1)
+        return row
+
+    def fetchall(self):
+        rows = self._raw.fetchall()
+        record_rows(self._name, len(rows))
+        return rows
+
+    def __getattr__(self, attr):
+        return getattr(self._raw, attr)
+
+
+class InstrumentedConnection:
+    """Connection wrapper whose cursors are instrumented"""
+
+    def __init__(self, connection):
+        self._raw = connection
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs))
+
+    def __getattr__(self, attr):
+        return getattr(self._raw, attr)
+
+
+def _percentile(buckets, count, fraction):
+    """Upper bound of the bucket holding the given fraction of observations"""
+    if not count:
+        return 0.0
+    target = count * fraction
+    seen = 0
+    for bound, n in zip(LATENCY_BUCKETS_MS, buckets):
+        seen += n
+        if seen >= target:
+            return bound
+    return LATENCY_BUCKETS_MS[-1]
+
+
+def _summary(stats):
+    count = stats["count"]
+    return {
+        "count": count,
+        "errors": stats["errors"],
+        "rows": stats["rows"],
+        "mean_ms": round(stats["total_ms"] / count, 2) if count else 0.0,
+        "max_ms": round(stats["max_ms"], 2),
+        "p50_ms": _percentile(stats["buckets"], count, 0.50),
+        "p95_ms": _percentile(stats["buckets"], count, 0.95),
+        "p99_ms": _percentile(stats["buckets"], count, 0.99),
+        "histogram": dict(zip((str(bound) for bound in LATENCY_BUCKETS_MS), stats["buckets"])),
+    }
+
+
+def snapshot():
+    """
+    Current metrics: {"queries": {name: summary}, "acquire": summary,
+    "slow": [recent slow statements, newest last]}. Percentiles are bucket
+    upper bounds in milliseconds.
+    """
+    with _lock:
+        return {
+            "queries": {name: _summary(stats) for name, stats in sorted(_queries.items())},
+            "acquire": _summary(_acquire or _new_stats()),
+            "slow": list(_slow),
+        }
+
+
+def reset():
+    """Drop all recorded metrics"""
+    global _acquire
+    with _lock:
+        _queries.clear()
+        _acquire = None
+        _slow.clear()
@@ -0,0 +1,549 @@
+"""
+Versioned Schema Migrations
+Each migration runs once; applied versions are recorded in schema_migrations.
+
+Migrations are written to run against a live database:
+  - columns: declared per table and added in a single ALTER TABLE, using
+    ALGORITHM=INSTANT where MySQL supports it, else INPLACE with LOCK=NONE,
+    and only falling back to a table copy when neither is possible
+  - backfills: UPDATEs applied in primary-key chunks, one commit per chunk,
+    sleeping between chunks so writers keep up. Progress is saved in
+    migration_progress, so an interrupted run resumes where it stopped.
+  - migrate: any other DDL (indexes are created INPLACE, without a lock)
+
+The one exception is migration 5's repartitioning of complaints and
+action_log: MySQL rebuilds a table to change its primary key or
+partitioning and blocks writes while it does, so apply migration 5 during a
+maintenance window with the app stopped.
+
+Run this script to bring a database up to date:
+    python -m database.migrations [--batch-size 5000] [--throttle 1.0]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+from mysql.connector import Error as MySQLError, errorcode
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from database.backends import get_backend
+from database.db import get_connection, DATABASE_NAME
+from database.rollups import create_rollup_table
+from database.severity import PRIORITY_SEVERITY, SLA_HOURS, DEFAULT_SEVERITY
+
+BACKFILL_BATCH_SIZE = 5000
+# Sleep this many times as long as each chunk took (1.0 = at most half the time busy)
+BACKFILL_THROTTLE = 1.0
+
+# Tried in order for every ALTER; None means MySQL's default (may copy the table)
+ONLINE_ALGORITHMS = ("ALGORITHM=INSTANT", "ALGORITHM=INPLACE, LOCK=NONE", None)
+_ALGORITHM_NOT_SUPPORTED = (errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED, errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED_REASON)
+
+# columns: {table: [(column, definition), ...]}; backfills: [Backfill, ...]
+# migrate: function(cursor) for other DDL, run after columns and backfills
+Migration = namedtuple("Migration", "version description columns backfills migrate")
+
+# UPDATE {table} SET {assignments} WHERE {where}, applied in chunks of {key}
+Backfill = namedtuple("Backfill", "name table key assignments where")
+
+
+def _index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index_name))
+    return cursor.fetchone() is not None
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+    """, (table, column))
+    return cursor.fetchone() is not None
+
+
+def _alter_online(cursor, table, changes):
+    """Run ALTER TABLE with the least blocking algorithm MySQL accepts; returns it"""
+    for algorithm in ONLINE_ALGORITHMS:
+        try:
+            cursor.execute(f"ALTER TABLE {table} {changes}" + (f", {algorithm}" if algorithm else ""))
+            return algorithm or "COPY"
+        except MySQLError as e:
+            if algorithm is None or e.errno not in _ALGORITHM_NOT_SUPPORTED:
+                raise
+
+
+def _add_columns(cursor, table, columns):
+    """Add every missing column of [(column, definition)] in one ALTER TABLE"""
+    missing = []
+    for column, definition in columns:
+        if _column_exists(cursor, table, column):
+            print(f"• {table}.{column} already exists")
+        else:
+            missing.append((column, definition))
+    if not missing:
+        return
+    algorithm = _alter_online(cursor, table, ", ".join(f"ADD COLUMN {column} {definition}" for column, definition in missing))
+    print(f"✓ Added {table}.{', '.join(column for column, _ in missing)} ({algorithm})")
+
+
+def _drop_index(cursor, table, index_name):
+    if _index_exists(cursor, table, index_name):
+        cursor.execute(f"DROP INDEX {index_name} ON {table}")
+        print(f"✓ Dropped {index_name}")
+
+
+def _ensure_index(cursor, table, index_name, columns, unique=False):
+    """Create an index unless one with the same name already exists"""
+    if _index_exists(cursor, table, index_name):
+        print(f"• {index_name} already exists")
+        return
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    cursor.execute(f"CREATE {kind} {index_name} ON {table} ({', '.join(columns)}) ALGORITHM=INPLACE LOCK=NONE")
+    print(f"✓ Created {index_name}")
+
+
+def _partitioned(cursor, table):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+        LIMIT 1
+    """, (table,))
+    return cursor.fetchone() is not None
+
+
+def _drop_foreign_keys(cursor, table, referenced_table):
+    cursor.execute("""
+        SELECT constraint_name FROM information_schema.referential_constraints
+        WHERE constraint_schema = DATABASE() AND table_name = %s AND referenced_table_name = %s
+    """, (table, referenced_table))
+    for (name,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {name}")
+        print(f"✓ Dropped foreign key {table}.{name}")
+
+
+def _m001_base_schema(cursor):
+    """Base tables (no-op for tables that already exist)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS complaints (
+            complaint_id INT AUTO_INCREMENT PRIMARY KEY,
+            citizen_name VARCHAR(100),
+            location VARCHAR(100),
+            complaint_text TEXT,
+            clean_text TEXT,
+            category VARCHAR(50),
+            priority VARCHAR(20) DEFAULT 'Medium',
+            status VARCHAR(30) DEFAULT 'New',
+            zone VARCHAR(20),
+            address TEXT,
+            photo_after VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ai_summary TEXT DEFAULT NULL,
+            priority_reasoning TEXT DEFAULT NULL,
+            is_ai_processed BOOLEAN DEFAULT TRUE,
+            model_used VARCHAR(50) DEFAULT 'gpt-4o-mini',
+            processing_time FLOAT DEFAULT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS action_log (
+            log_id INT AUTO_INCREMENT PRIMARY KEY,
+            complaint_id INT NOT NULL,
+            officer_id INT,
+            action TEXT,
+            image_path VARCHAR(255),
+            action_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_username (username),
+            INDEX idx_email (email)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS upvotes (
+            upvote_id INT AUTO_INCREMENT PRIMARY KEY,
+            complaint_id INT NOT NULL,
+            user_id INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (complaint_id) REFERENCES complaints(complaint_id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+            UNIQUE KEY unique_upvote (complaint_id, user_id),
+            INDEX idx_complaint (complaint_id),
+            INDEX idx_user (user_id)
+        )
+    """)
+    # Tables created before the AI features lack these (formerly migrate_db.py)
+    _add_columns(cursor, "complaints", [
+        ("ai_summary", "TEXT DEFAULT NULL"),
+        ("priority_reasoning", "TEXT DEFAULT NULL"),
+        ("is_ai_processed", "BOOLEAN DEFAULT TRUE"),
+        ("model_used", "VARCHAR(50) DEFAULT 'gpt-4o-mini'"),
+        ("processing_time", "FLOAT DEFAULT NULL"),
+    ])
+    create_rollup_table(cursor)
+
+
+def _m002_covering_indexes(cursor):
+    """Indexes for the hot WHERE/ORDER BY patterns, so none of them filesorts"""
+    # fetch_complaints_by_zone: WHERE zone = ? ORDER BY priority, created_at
+    _ensure_index(cursor, "complaints", "idx_complaints_zone_priority_created", ["zone", "priority", "created_at"])
+    # Community feed filters: area (+ category), or category alone
+    _ensure_index(cursor, "complaints", "idx_complaints_location_category", ["location", "category", "created_at"])
+    _ensure_index(cursor, "complaints", "idx_complaints_category_created", ["category", "created_at"])
+    # Complaint timelines: action_log rows by complaint_id, in action_time order
+    _ensure_index(cursor, "action_log", "idx_action_log_complaint_time", ["complaint_id", "action_time"])
+
+
+def _m003_numeric_severity(cursor):
+    """Numeric P0-P3 severity, SLA deadline and the indexed open-work queue"""
+    # Zone list now sorts by severity, newest first within a level
+    _drop_index(cursor, "complaints", "idx_complaints_zone_priority_created")
+    _ensure_index(cursor, "complaints", "idx_complaints_zone_severity_created", ["zone", "severity", "created_at DESC"])
+    # Work queue: open complaints by severity, SLA deadline and age
+    _ensure_index(cursor, "complaints", "idx_complaints_zone_queue", ["zone", "is_open", "severity", "sla_due_at", "created_at"])
+    _ensure_index(cursor, "complaints", "idx_complaints_queue", ["is_open", "severity", "sla_due_at", "created_at"])
+
+
+_SEVERITY_COLUMNS = {"complaints": [
+    ("severity", "TINYINT NOT NULL DEFAULT 2"),
+    ("sla_due_at", "DATETIME NULL"),
+    # VIRTUAL so the ALTER stays INSTANT (a STORED generated column forces a
+    # table copy); the work-queue indexes below materialize it
+    ("is_open", "TINYINT AS (COALESCE(status, 'New') NOT IN ('Resolved', 'Closed')) VIRTUAL"),
+]}
+
+_SEVERITY_BACKFILLS = [
+    # Existing rows only have the text priority; map it onto the scale
+    Backfill(
+        "severity_from_priority", "complaints", "complaint_id",
+        "severity = CASE priority "
+        + " ".join(f"WHEN '{text}' THEN {level}" for text, level in PRIORITY_SEVERITY.items())
+        + f" ELSE {DEFAULT_SEVERITY} END",
+        None,
+    ),
+    Backfill(
+        "sla_due_at", "complaints", "complaint_id",
+        "sla_due_at = created_at + INTERVAL CASE severity "
+        + " ".join(f"WHEN {level} THEN {hours}" for level, hours in SLA_HOURS.items())
+        + f" ELSE {SLA_HOURS[DEFAULT_SEVERITY]} END HOUR",
+        "sla_due_at IS NULL",
+    ),
+]
+
+
+def _m004_import_source_key(cursor):
+    """Unique source key index, so re-imports dedupe"""
+    _ensure_index(cursor, "complaints", "uq_complaints_source_key", ["source_key"], unique=True)
+
+
+# One partition per zone; database.zones.assign_zone() returns "Unknown" for anything else
+ZONE_PARTITIONS = {"p_north": "North", "p_south": "South", "p_east": "East", "p_west": "West", "p_unknown": "Unknown"}
+ACTION_LOG_PARTITIONS = 8
+
+
+# The partitions only take these zones; anything else is filed as Unknown
+_ZONE_CLEANUP_BACKFILL = Backfill(
+    "zone_cleanup", "complaints", "complaint_id",
+    "zone = 'Unknown'",
+    "zone IS NULL OR zone NOT IN (%s)" % ", ".join(f"'{zone}'" for zone in ZONE_PARTITIONS.values()),
+)
+
+def _m005_zone_partitions_and_archive(cursor):
+    """
+    Partition complaints by zone and action_log by complaint, and create the
+    cold archive tables used by database.archive.
+
+    This is an offline step. Changing a primary key or partitioning copies
+    the whole table, and MySQL blocks writes to it until the copy is done.
+    Stop the app before applying it. The zone cleanup before it is a chunked
+    backfill, and nothing after it locks the tables.
+    """
+    _ensure_index(cursor, "complaints", "idx_complaints_resolved", ["is_open", "resolved_at"])
+
+    # Partitioned tables can't take part in foreign keys, and every unique
+    # key must include the partitioning column.
+    _drop_foreign_keys(cursor, "upvotes", "complaints")
+    if not _partitioned(cursor, "complaints"):
+        cursor.execute("""
+            ALTER TABLE complaints
+                MODIFY zone VARCHAR(20) NOT NULL DEFAULT 'Unknown',
+                DROP PRIMARY KEY, ADD PRIMARY KEY (complaint_id, zone),
+                DROP INDEX uq_complaints_source_key, ADD UNIQUE INDEX uq_complaints_source_key (source_key, zone)
+        """)
+        partitions = ", ".join(f"PARTITION {name} VALUES IN ('{zone}')" for name, zone in ZONE_PARTITIONS.items())
+        cursor.execute(f"ALTER TABLE complaints PARTITION BY LIST COLUMNS (zone) ({partitions})")
+        print("✓ Partitioned complaints by zone")
+    if not _partitioned(cursor, "action_log"):
+        cursor.execute("ALTER TABLE action_log DROP PRIMARY KEY, ADD PRIMARY KEY (log_id, complaint_id)")
+        cursor.execute(f"ALTER TABLE action_log PARTITION BY HASH (complaint_id) PARTITIONS {ACTION_LOG_PARTITIONS}")
+        print("✓ Partitioned action_log by complaint")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS complaints_archive (
+            complaint_id INT PRIMARY KEY,
+            citizen_name VARCHAR(100),
+            location VARCHAR(100),
+            complaint_text TEXT,
+            clean_text TEXT,
+            category VARCHAR(50),
+            priority VARCHAR(20),
+            status VARCHAR(30),
+            zone VARCHAR(20) NOT NULL,
+            address TEXT,
+            photo_after VARCHAR(255),
+            created_at TIMESTAMP NULL,
+            ai_summary TEXT,
+            priority_reasoning TEXT,
+            is_ai_processed BOOLEAN,
+            model_used VARCHAR(50),
+            processing_time FLOAT,
+            severity TINYINT NOT NULL,
+            sla_due_at DATETIME NULL,
+            source_key VARCHAR(100) NULL,
+            resolved_at DATETIME NULL,
+            upvote_count INT NOT NULL DEFAULT 0,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_complaints_archive_zone (zone, category, resolved_at)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS action_log_archive (
+            log_id INT PRIMARY KEY,
+            complaint_id INT NOT NULL,
+            officer_id INT,
+            action TEXT,
+            image_path VARCHAR(255),
+            action_time TIMESTAMP NULL,
+            INDEX idx_action_log_archive_complaint (complaint_id, action_time)
+        )
+    """)
+
+
+# Closed before resolved_at existed: use the last action, else creation time
+_RESOLVED_AT_BACKFILL = Backfill(
+    "resolved_at", "complaints", "complaint_id",
+    "resolved_at = COALESCE((SELECT MAX(a.action_time) FROM action_log a "
+    "WHERE a.complaint_id = complaints.complaint_id), created_at)",
+    "is_open = 0 AND resolved_at IS NULL",
+)
+
+def _m006_change_log(cursor):
+    """Append-only log of feed-visible changes, polled by database.changes"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            complaint_id INT NOT NULL,
+            zone VARCHAR(20) NOT NULL,
+            kind VARCHAR(20) NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_change_log_changed (changed_at)
+        )
+    """)
+
+
+def _m007_selector_indexes(cursor):
+    """
+    Indexes in the complaint selector's order (severity, newest first, then
+    id), one per filter shape, so its keyset pages never filesort
+    """
+    order = ["severity", "created_at DESC", "complaint_id DESC"]
+    _ensure_index(cursor, "complaints", "idx_complaints_zone_status_severity", ["zone", "status", *order])
+    _ensure_index(cursor, "complaints", "idx_complaints_status_severity", ["status", *order])
+    _ensure_index(cursor, "complaints", "idx_complaints_severity_order", order)
+    # Supersedes (zone, severity, created_at DESC): the id breaks ties
+    _ensure_index(cursor, "complaints", "idx_complaints_zone_severity_order", ["zone", *order])
+    _drop_index(cursor, "complaints", "idx_complaints_zone_severity_created")
+
+
+# Existing votes; kept current by database.upvotes from then on
+_UPVOTE_COUNT_BACKFILL = Backfill(
+    "upvote_count", "complaints", "complaint_id",
+    "upvote_count = (SELECT COUNT(*) FROM upvotes u WHERE u.complaint_id = complaints.complaint_id)",
+    None,
+)
+
+def _m008_feed_order_indexes(cursor):
+    """
+    Indexes in each feed sort's order (votes, newest/oldest) for each filter
+    shape (area, area + category, category, none), so no feed page filesorts,
+    and one for the dashboard's recent complaints. Newest and Oldest share
+    an index, read forwards or backwards.
+    """
+    votes = ["upvote_count", "created_at", "complaint_id"]
+    age = ["created_at", "complaint_id"]
+    _ensure_index(cursor, "complaints", "idx_complaints_location_votes", ["location", *votes])
+    _ensure_index(cursor, "complaints", "idx_complaints_location_category_votes", ["location", "category", *votes])
+    _ensure_index(cursor, "complaints", "idx_complaints_category_votes", ["category", *votes])
+    _ensure_index(cursor, "complaints", "idx_complaints_votes", votes)
+    _ensure_index(cursor, "complaints", "idx_complaints_location_created", ["location", *age])
+    _ensure_index(cursor, "complaints", "idx_complaints_created", age)
+    # (location, category, created_at) and (category, created_at) from
+    # migration 2 already cover the dated sorts of the other two shapes
+    # Dashboard "recent complaints": WHERE zone = ? ORDER BY created_at DESC
+    _ensure_index(cursor, "complaints", "idx_complaints_zone_created", ["zone", "created_at"])
+
+
+# Append only, never renumber
+MIGRATIONS = [
+    Migration(1, "base schema", {}, [], _m001_base_schema),
+    Migration(2, "covering indexes for hot queries", {}, [], _m002_covering_indexes),
+    Migration(3, "numeric severity and SLA work queue", _SEVERITY_COLUMNS, _SEVERITY_BACKFILLS, _m003_numeric_severity),
+    Migration(4, "import source key", {"complaints": [("source_key", "VARCHAR(100) NULL")]}, [], _m004_import_source_key),
+    Migration(
+        5, "zone partitions and cold archive",
+        {"complaints": [("resolved_at", "DATETIME NULL")]}, [_RESOLVED_AT_BACKFILL, _ZONE_CLEANUP_BACKFILL],
+        _m005_zone_partitions_and_archive,
+    ),
+    Migration(6, "change log for incremental feed sync", {}, [], _m006_change_log),
+    Migration(7, "complaint selector keyset indexes", {}, [], _m007_selector_indexes),
+    Migration(
+        8, "vote counter and sort order indexes",
+        {"complaints": [("upvote_count", "INT NOT NULL DEFAULT 0")]}, [_UPVOTE_COUNT_BACKFILL],
+        _m008_feed_order_indexes,
+    ),
+]
+
+
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS migration_progress (
+            version INT NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            last_key BIGINT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (version, name)
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def run_backfill(connection, cursor, version, backfill, batch_size=BACKFILL_BATCH_SIZE, throttle=BACKFILL_THROTTLE):
+    """
+    Apply a backfill in key-range chunks of batch_size, committing and
+    saving progress after each one. Returns the number of rows updated.
+    """
+    cursor.execute(
+        "SELECT last_key FROM migration_progress WHERE version = %s AND name = %s",
+        (version, backfill.name),
+    )
+    row = cursor.fetchone()
+    position = row[0] if row else 0
+    cursor.execute(f"SELECT MAX({backfill.key}) FROM {backfill.table}")
+    high = cursor.fetchone()[0] or 0
+    if position:
+        print(f"  Resuming backfill {backfill.name} after {backfill.key} {position:,}")
+
+    where = f" AND ({backfill.where})" if backfill.where else ""
+    updated = 0
+    while position < high:
+        started = time.perf_counter()
+        upper = position + batch_size
+        cursor.execute(
+            f"UPDATE {backfill.table} SET {backfill.assignments} "
+            f"WHERE {backfill.key} > %s AND {backfill.key} <= %s{where}",
+            (position, upper),
+        )
+        updated += cursor.rowcount
+        cursor.execute("""
+            INSERT INTO migration_progress (version, name, last_key) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE last_key = VALUES(last_key)
+        """, (version, backfill.name, upper))
+        connection.commit()
+        position = upper
+        print(f"  Backfill {backfill.name}: {min(position, high):,} / {high:,}")
+        time.sleep((time.perf_counter() - started) * throttle)
+    return updated
+
+
+def run_migrations(database=DATABASE_NAME, batch_size=BACKFILL_BATCH_SIZE, throttle=BACKFILL_THROTTLE):
+    """Apply every pending migration in version order; returns the versions applied"""
+    connection = None
+    cursor = None
+    applied = []
+    try:
+        connection = get_connection(database)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        cursor = connection.cursor()
+        done = applied_versions(cursor)
+        if get_backend().name == "sqlite":
+            # schema_sqlite.sql already holds the latest schema; record it
+            pending = [(m.version, m.description) for m in MIGRATIONS if m.version not in done]
+            cursor.executemany("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)", pending)
+            connection.commit()
+            return [version for version, _ in pending]
+
+        for migration in MIGRATIONS:
+            if migration.version in done:
+                continue
+            print(f"Applying migration {migration.version}: {migration.description}")
+            for table, columns in migration.columns.items():
+                _add_columns(cursor, table, columns)
+            for backfill in migration.backfills:
+                run_backfill(connection, cursor, migration.version, backfill, batch_size, throttle)
+            migration.migrate(cursor)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (migration.version, migration.description),
+            )
+            connection.commit()
+            applied.append(migration.version)
+        return applied
+
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply pending City Voice schema migrations")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="Rows per backfill chunk")
+    parser.add_argument("--throttle", type=float, default=BACKFILL_THROTTLE,
+                        help="Pause after each chunk, as a multiple of the time it took")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("City Voice - Schema Migrations")
+    print("=" * 60)
+    try:
+        versions = run_migrations(batch_size=args.batch_size, throttle=args.throttle)
+        print(f"\n[OK] Applied {len(versions)} migration(s)" if versions else "\n[OK] Schema is up to date")
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        print("Re-run to resume; finished backfill chunks are not repeated.")
+        return 1
+    finally:
+        print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
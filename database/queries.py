@@ -0,0 +1,182 @@
+"""
+Query Registry
+The hot read queries, each with an explicit minimal column list, %s
+placeholders only (no values formatted into the SQL) and a typed row.
+
+fetch() runs a registered query through the backend's statement cache:
+MySQL keeps one server-side prepared statement per query on each pooled
+connection, so a hot query is parsed and planned once per connection rather
+than on every request; SQLite reuses its compiled statements the same way.
+Rows come back as the query's NamedTuple.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from database.backends import get_backend
+from database.instrumentation import query_label
+
+
+class ZoneComplaint(NamedTuple):
+    """A complaint as listed on the authority Update Status tab"""
+    complaint_id: int
+    citizen_name: str
+    location: str
+    zone: str
+    category: str
+    priority: str
+    severity: int
+    status: str
+    created_at: datetime
+    complaint_text: str
+    photo_after: Optional[str]
+
+
+class FeedComplaint(NamedTuple):
+    """A community feed card"""
+    complaint_id: int
+    citizen_name: str
+    location: str
+    address: Optional[str]
+    complaint_text: str
+    category: str
+    priority: str
+    status: str
+    zone: str
+    created_at: datetime
+    upvote_count: int
+    user_upvoted: int
+
+
+class TimelineRow(NamedTuple):
+    """One complaint joined to one of its actions (action columns NULL if none)"""
+    complaint_id: int
+    citizen_name: str
+    category: str
+    priority: str
+    status: str
+    zone: str
+    created_at: datetime
+    action_time: Optional[datetime]
+    officer_id: Optional[int]
+    action: Optional[str]
+    image_path: Optional[str]
+
+
+class WorkItem(NamedTuple):
+    """An open complaint in the work queue"""
+    complaint_id: int
+    category: str
+    location: str
+    priority: str
+    severity: int
+    status: str
+    sla_due_at: Optional[datetime]
+    created_at: datetime
+
+
+class RecentComplaint(NamedTuple):
+    """A row of the dashboard's recent complaints table"""
+    complaint_id: int
+    citizen_name: str
+    location: str
+    category: str
+    priority: str
+    status: str
+    created_at: datetime
+
+
+class ComplaintOption(NamedTuple):
+    """An entry of the authority complaint selector"""
+    complaint_id: int
+    category: str
+    status: str
+    priority: str
+    location: str
+    severity: int
+    created_at: datetime
+
+
+class Query(NamedTuple):
+    name: str
+    sql: str
+    row: type
+
+
+def columns(fields, alias=None):
+    """A SELECT list of field names, optionally table-qualified"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + field for field in fields)
+
+
+QUERIES = {query.name: query for query in [
+    Query("zone_complaints", f"""
+        SELECT {columns(ZoneComplaint._fields)} FROM complaints
+        WHERE zone = %s
+        ORDER BY severity ASC, created_at DESC
+    """, ZoneComplaint),
+    Query("complaint_by_id", f"""
+        SELECT {columns(ZoneComplaint._fields)} FROM complaints
+        WHERE complaint_id = %s
+    """, ZoneComplaint),
+    Query("all_complaints", f"""
+        SELECT {columns(ZoneComplaint._fields)} FROM complaints
+        ORDER BY severity ASC, created_at DESC
+    """, ZoneComplaint),
+    # Ordering matches idx_complaints_zone_queue / idx_complaints_queue
+    Query("zone_work_queue", f"""
+        SELECT {columns(WorkItem._fields)} FROM complaints
+        WHERE zone = %s AND is_open = 1
+        ORDER BY severity ASC, sla_due_at ASC, created_at ASC
+        LIMIT %s
+    """, WorkItem),
+    Query("work_queue", f"""
+        SELECT {columns(WorkItem._fields)} FROM complaints
+        WHERE is_open = 1
+        ORDER BY severity ASC, sla_due_at ASC, created_at ASC
+        LIMIT %s
+    """, WorkItem),
+    Query("zone_recent_complaints", f"""
+        SELECT {columns(RecentComplaint._fields)} FROM complaints
+        WHERE zone = %s
+        ORDER BY created_at DESC
+        LIMIT %s
+    """, RecentComplaint),
+    Query("recent_complaints", f"""
+        SELECT {columns(RecentComplaint._fields)} FROM complaints
+        ORDER BY created_at DESC
+        LIMIT %s
+    """, RecentComplaint),
+]}
+
+# IN lists are padded up to one of these sizes, so a handful of prepared
+# statements serve every batch size
+IN_LIST_SIZES = (1, 4, 16, 64, 256)
+
+
+@lru_cache(maxsize=None)
+def timeline_query(size):
+    """Timeline query for an IN list of exactly `size` ids"""
+    placeholders = ", ".join(["%s"] * size)
+    return Query("timelines", f"""
+        SELECT {columns(TimelineRow._fields[:7], "c")}, {columns(TimelineRow._fields[7:], "a")}
+        FROM complaints c
+        LEFT JOIN action_log a ON a.complaint_id = c.complaint_id
+        WHERE c.complaint_id IN ({placeholders})
+        ORDER BY c.complaint_id
+    """, TimelineRow)
+
+
+def pad_ids(ids):
+    """Pad a list of ids (repeating the last) to the next IN_LIST_SIZES size"""
+    ids = list(ids)
+    size = next((size for size in IN_LIST_SIZES if size >= len(ids)), len(ids))
+    return ids + ids[-1:] * (size - len(ids))
+
+
+def fetch(connection, query, params=()):
+    """Run a registered query on a connection; returns a list of query.row"""
+    with query_label(query.name):
+        rows = get_backend().fetch_prepared(connection, query.sql, tuple(params))
+    return [query.row._make(row) for row in rows]
@@ -0,0 +1,142 @@
+"""
+Read-Through Query Cache
+Process-wide cache for the feed and dashboard read paths.
+
+Entries are keyed by query name and parameters, expire after a TTL and carry
+table tags. The write paths invalidate exactly the tags they touch, so a new
+upvote does not throw away the authority dashboard data and a status change
+in one zone does not throw away another zone's data. The cache lives at
+module level, so every Streamlit session in the process shares it.
+
+A session inside its read-your-writes window (see database.routing) skips
+the lookup and reloads from the primary, so it never sees a result another
+session filled from a lagging replica.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from database.instrumentation import query_label
+from database.routing import reads_pinned_to_primary
+
+DEFAULT_TTL = 30  # seconds
+MAX_ENTRIES = 5000  # least recently used entries are evicted past this
+
+_lock = threading.RLock()
+_entries = OrderedDict()  # key -> (expires_at, tags, value), least recently used first
+_tag_keys = {}         # tag -> set of keys
+_tag_generation = {}   # tag -> int, bumped on every invalidation
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _drop(key):
+    entry = _entries.pop(key, None)
+    if entry:
+        for tag in entry[1]:
+            keys = _tag_keys.get(tag)
+            if keys:
+                keys.discard(key)
+
+
+def cached_query(name, params, loader, tags, ttl=DEFAULT_TTL):
+    """
+    Return the cached result for (name, params) or call loader() and cache it.
+
+    Args:
+        name: Query name, e.g. "feed" or "zone_complaints"
+        params: Hashable tuple of query parameters
+        loader: Zero-argument function that runs the query
+        tags: Table tags the result depends on (used for invalidation)
+        ttl: Seconds before the entry expires
+
+    Callers must not mutate the returned value; copy it first.
+    """
+    key = (name, params)
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] > now and not reads_pinned_to_primary():
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[2]
+        _stats["misses"] += 1
+        generations = {tag: _tag_generation.get(tag, 0) for tag in tags}
+
+    with query_label(name):
+        value = loader()
+
+    with _lock:
+        # Don't store a result that a concurrent write has already made stale
+        if all(_tag_generation.get(tag, 0) == gen for tag, gen in generations.items()):
+            _drop(key)
+            _entries[key] = (time.monotonic() + ttl, tuple(tags), value)
+            for tag in tags:
+                _tag_keys.setdefault(tag, set()).add(key)
+            while len(_entries) > MAX_ENTRIES:
+                _drop(next(iter(_entries)))
+    return value
+
+
+def invalidate(*tags):
+    """Drop every cached entry that depends on any of the given tags"""
+    with _lock:
+        for tag in tags:
+            _tag_generation[tag] = _tag_generation.get(tag, 0) + 1
+            for key in list(_tag_keys.get(tag, ())):
+                _drop(key)
+            _stats["invalidations"] += 1
+
+
+def patch(name, patcher):
+    """
+    Replace the value of every live entry of query `name` with
+    patcher(params, value), keeping its expiry and tags. Used to apply
+    small deltas (see database.changes) without reloading whole results;
+    patcher must return a new value, never mutate the shared one.
+    """
+    with _lock:
+        for key, (expires_at, tags, value) in list(_entries.items()):
+            if key[0] == name:
+                _entries[key] = (expires_at, tags, patcher(key[1], value))
+
+
+def invalidate_complaints(zone=None):
+    """
+    Invalidate complaint data after a write.
+    With a known zone only that zone's entries (and all-zone entries) are
+    dropped; without one every complaint entry is dropped.
+    """
+    if zone:
+        invalidate("complaints", f"complaints:{zone}")
+    else:
+        invalidate("complaints", "complaints:zoned")
+
+
+def complaint_tags(zone=None):
+    """Tags for a result built from complaints of one zone (or all zones)"""
+    if zone:
+        return (f"complaints:{zone}", "complaints:zoned")
+    return ("complaints", "complaints:all")
+
+
+def clear():
+    """Drop all entries and reset statistics"""
+    with _lock:
+        _entries.clear()
+        _tag_keys.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def cache_stats():
+    """Return hit/miss counters and the hit ratio"""
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            "entries": len(_entries),
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "invalidations": _stats["invalidations"],
+            "hit_ratio": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
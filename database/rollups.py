@@ -0,0 +1,167 @@
+"""
+Complaint Rollups
+Counters keyed by (zone, category, priority, status, day) that the write
+paths in database/db.py keep up to date inside their own transactions.
+Dashboards read these few hundred rows instead of scanning complaints.
+
+Run this module to create the table and rebuild it from complaints:
+    python -m database.rollups --rebuild
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Key columns as stored in the rollup, derived from a complaints row
+_ROLLUP_KEY_SQL = """
+    COALESCE(zone, 'Unknown'), COALESCE(category, 'Other'), COALESCE(priority, 'Medium'),
+    COALESCE(status, 'New'), DATE(created_at)
+"""
+
+
+def create_rollup_table(cursor):
+    """Create the complaint_rollups table if it does not exist"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS complaint_rollups (
+            zone VARCHAR(20) NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            priority VARCHAR(20) NOT NULL,
+            status VARCHAR(30) NOT NULL,
+            day DATE NOT NULL,
+            complaint_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (zone, category, priority, status, day)
+        )
+    """)
+
+
+def apply_complaint_delta(cursor, complaint_id, delta):
+    """
+    Add delta (+1 or -1) to the rollup bucket the complaint currently falls in.
+    Must run on the caller's cursor so it commits or rolls back with the write.
+    """
+    apply_complaints_delta(cursor, [complaint_id], delta)
+
+
+def apply_complaints_delta(cursor, complaint_ids, delta):
+    """Add delta for each of several complaints, one statement for the whole batch"""
+    placeholders = ", ".join(["%s"] * len(complaint_ids))
+    _apply_delta_where(cursor, f"complaint_id IN ({placeholders})", tuple(complaint_ids), delta)
+
+
+def apply_source_keys_delta(cursor, source_keys, delta):
+    """Add delta for complaints identified by their import source_key"""
+    placeholders = ", ".join(["%s"] * len(source_keys))
+    _apply_delta_where(cursor, f"source_key IN ({placeholders})", tuple(source_keys), delta)
+
+
+def _apply_delta_where(cursor, where, params, delta):
+    cursor.execute(f"""
+        INSERT INTO complaint_rollups (zone, category, priority, status, day, complaint_count)
+        SELECT {_ROLLUP_KEY_SQL}, COUNT(*) * %s
+        FROM complaints
+        WHERE {where}
+        GROUP BY {_ROLLUP_KEY_SQL}
+        ON DUPLICATE KEY UPDATE complaint_count = complaint_count + VALUES(complaint_count)
+    """, (delta, *params))
+
+
+def lock_complaint(cursor, complaint_id):
+    """Lock a complaint row so its status transition is counted exactly once"""
+    return lock_complaints(cursor, [complaint_id])
+
+
+def lock_complaints(cursor, complaint_ids):
+    """Lock several complaint rows; returns their (complaint_id, zone) pairs"""
+    placeholders = ", ".join(["%s"] * len(complaint_ids))
+    cursor.execute(
+        f"SELECT complaint_id, zone FROM complaints WHERE complaint_id IN ({placeholders}) FOR UPDATE",
+        tuple(complaint_ids),
+    )
+    return cursor.fetchall()
+
+
+def rebuild_rollups():
+    """Recompute every rollup bucket from the complaints and archive tables"""
+    # Imported here because database.db imports this module for its write paths
+    from database.db import get_connection
+
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        if not connection:
+            raise Exception("Database connection failed")
+
+        cursor = connection.cursor()
+        create_rollup_table(cursor)
+        cursor.execute("DELETE FROM complaint_rollups")
+        # Archived complaints still count towards the dashboards
+        cursor.execute(f"""
+            INSERT INTO complaint_rollups (zone, category, priority, status, day, complaint_count)
+            SELECT {_ROLLUP_KEY_SQL}, COUNT(*)
+            FROM (
+                SELECT zone, category, priority, status, created_at FROM complaints
+                UNION ALL
+                SELECT zone, category, priority, status, created_at FROM complaints_archive
+            ) c
+            GROUP BY {_ROLLUP_KEY_SQL}
+        """)
+        rows = cursor.rowcount
+        connection.commit()
+        return rows
+
+    except Exception:
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def fetch_rollup_counts(cursor, zone):
+    """
+    Return (category, priority, status, count) rows for a zone ("Admin" = all zones)
+    """
+    where, params = ("", ()) if zone == "Admin" else ("WHERE zone = %s", (zone,))
+    cursor.execute(f"""
+        SELECT category, priority, status, SUM(complaint_count)
+        FROM complaint_rollups
+        {where}
+        GROUP BY category, priority, status
+        HAVING SUM(complaint_count) > 0
+    """, params)
+    return cursor.fetchall()
+
+
+def fetch_daily_counts(cursor, zone):
+    """Return (day, count) rows of complaints submitted per day for a zone"""
+    where, params = ("", ()) if zone == "Admin" else ("WHERE zone = %s", (zone,))
+    cursor.execute(f"""
+        SELECT day, SUM(complaint_count)
+        FROM complaint_rollups
+        {where}
+        GROUP BY day
+        ORDER BY day
+    """, params)
+    return cursor.fetchall()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("City Voice - Rebuild Complaint Rollups")
+    print("=" * 60)
+    if "--rebuild" in sys.argv:
+        try:
+            print(f"[OK] Rebuilt {rebuild_rollups()} rollup rows")
+        except Exception as e:
+            print(f"[ERROR] Rebuild failed: {e}")
+    else:
+        print("Usage: python -m database.rollups --rebuild")
+    print("=" * 60)
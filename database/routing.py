@@ -0,0 +1,50 @@
+"""
+Read/Write Routing State
+Read-heavy paths (feed, timelines, stats, auth lookups) ask for a read-only
+connection and are served by a replica. A session that has just written is
+pinned to the primary for READ_YOUR_WRITES_SECONDS, so it always sees its own
+change even while the replicas catch up.
+
+The session key is set once per Streamlit rerun (set_session); code running
+without one (CLI tools, imports) simply reads from the replicas.
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("CITYVOICE_READ_YOUR_WRITES_SECONDS", "5"))
+
+_session = ContextVar("cityvoice_db_session", default=None)
+_lock = threading.Lock()
+_last_write = {}  # session key -> monotonic time of its latest commit
+
+
+def set_session(key):
+    """Route this thread's database calls on behalf of session `key`"""
+    _session.set(key)
+
+
+def record_write():
+    """Note that the current session just committed a write"""
+    key = _session.get()
+    if key is None:
+        return
+    now = time.monotonic()
+    with _lock:
+        _last_write[key] = now
+        if len(_last_write) > 1000:
+            # Forget sessions whose window has long passed
+            for stale in [k for k, t in _last_write.items() if now - t > READ_YOUR_WRITES_SECONDS]:
+                del _last_write[stale]
+
+
+def reads_pinned_to_primary():
+    """True while the current session is inside its read-your-writes window"""
+    key = _session.get()
+    if key is None:
+        return False
+    with _lock:
+        written = _last_write.get(key)
+    return written is not None and time.monotonic() - written < READ_YOUR_WRITES_SECONDS
@@ -0,0 +1,143 @@
+-- City Voice schema for the embedded SQLite backend.
+-- Mirrors the MySQL schema produced by database/migrations.py.
+
+CREATE TABLE IF NOT EXISTS complaints (
+    complaint_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    citizen_name VARCHAR(100),
+    location VARCHAR(100),
+    complaint_text TEXT,
+    clean_text TEXT,
+    category VARCHAR(50),
+    priority VARCHAR(20) DEFAULT 'Medium',
+    status VARCHAR(30) DEFAULT 'New',
+    zone VARCHAR(20) NOT NULL DEFAULT 'Unknown',
+    address TEXT,
+    photo_after VARCHAR(255),
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    ai_summary TEXT DEFAULT NULL,
+    priority_reasoning TEXT DEFAULT NULL,
+    is_ai_processed BOOLEAN DEFAULT 1,
+    model_used VARCHAR(50) DEFAULT 'gpt-4o-mini',
+    processing_time FLOAT DEFAULT NULL,
+    severity TINYINT NOT NULL DEFAULT 2,
+    sla_due_at TIMESTAMP NULL,
+    is_open TINYINT GENERATED ALWAYS AS (COALESCE(status, 'New') NOT IN ('Resolved', 'Closed')) STORED,
+    source_key VARCHAR(100) NULL,
+    resolved_at TIMESTAMP NULL,
+    upvote_count INT NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_complaints_zone_severity_order ON complaints (zone, severity, created_at DESC, complaint_id DESC);
+CREATE INDEX IF NOT EXISTS idx_complaints_zone_status_severity ON complaints (zone, status, severity, created_at DESC, complaint_id DESC);
+CREATE INDEX IF NOT EXISTS idx_complaints_status_severity ON complaints (status, severity, created_at DESC, complaint_id DESC);
+CREATE INDEX IF NOT EXISTS idx_complaints_severity_order ON complaints (severity, created_at DESC, complaint_id DESC);
+CREATE INDEX IF NOT EXISTS idx_complaints_location_category ON complaints (location, category, created_at);
+CREATE INDEX IF NOT EXISTS idx_complaints_category_created ON complaints (category, created_at);
+CREATE INDEX IF NOT EXISTS idx_complaints_location_votes ON complaints (location, upvote_count, created_at, complaint_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_location_category_votes ON complaints (location, category, upvote_count, created_at, complaint_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_category_votes ON complaints (category, upvote_count, created_at, complaint_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_votes ON complaints (upvote_count, created_at, complaint_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_location_created ON complaints (location, created_at, complaint_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_created ON complaints (created_at, complaint_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_zone_created ON complaints (zone, created_at);
+CREATE INDEX IF NOT EXISTS idx_complaints_zone_queue ON complaints (zone, is_open, severity, sla_due_at, created_at);
+CREATE INDEX IF NOT EXISTS idx_complaints_queue ON complaints (is_open, severity, sla_due_at, created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_complaints_source_key ON complaints (source_key);
+CREATE INDEX IF NOT EXISTS idx_complaints_resolved ON complaints (is_open, resolved_at);
+
+CREATE TABLE IF NOT EXISTS action_log (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    complaint_id INT NOT NULL,
+    officer_id INT,
+    action TEXT,
+    image_path VARCHAR(255),
+    action_time TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_action_log_complaint_time ON action_log (complaint_id, action_time);
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS upvotes (
+    upvote_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    complaint_id INT NOT NULL REFERENCES complaints(complaint_id) ON DELETE CASCADE,
+    user_id INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (complaint_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_upvotes_user ON upvotes (user_id);
+
+CREATE TABLE IF NOT EXISTS complaint_rollups (
+    zone VARCHAR(20) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    priority VARCHAR(20) NOT NULL,
+    status VARCHAR(30) NOT NULL,
+    day DATE NOT NULL,
+    complaint_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (zone, category, priority, status, day)
+);
+
+-- Cold storage for complaints closed long ago (see database/archive.py).
+-- SQLite has no partitioning; the hot/cold split is the archive tables alone.
+CREATE TABLE IF NOT EXISTS complaints_archive (
+    complaint_id INTEGER PRIMARY KEY,
+    citizen_name VARCHAR(100),
+    location VARCHAR(100),
+    complaint_text TEXT,
+    clean_text TEXT,
+    category VARCHAR(50),
+    priority VARCHAR(20),
+    status VARCHAR(30),
+    zone VARCHAR(20) NOT NULL,
+    address TEXT,
+    photo_after VARCHAR(255),
+    created_at TIMESTAMP NULL,
+    ai_summary TEXT,
+    priority_reasoning TEXT,
+    is_ai_processed BOOLEAN,
+    model_used VARCHAR(50),
+    processing_time FLOAT,
+    severity TINYINT NOT NULL,
+    sla_due_at TIMESTAMP NULL,
+    source_key VARCHAR(100) NULL,
+    resolved_at TIMESTAMP NULL,
+    upvote_count INT NOT NULL DEFAULT 0,
+    archived_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_complaints_archive_zone ON complaints_archive (zone, category, resolved_at);
+
+CREATE TABLE IF NOT EXISTS action_log_archive (
+    log_id INTEGER PRIMARY KEY,
+    complaint_id INT NOT NULL,
+    officer_id INT,
+    action TEXT,
+    image_path VARCHAR(255),
+    action_time TIMESTAMP NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_action_log_archive_complaint ON action_log_archive (complaint_id, action_time);
+
+-- Feed-visible changes, polled with a "since" cursor (see database/changes.py)
+CREATE TABLE IF NOT EXISTS change_log (
+    change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    complaint_id INT NOT NULL,
+    zone VARCHAR(20) NOT NULL,
+    kind VARCHAR(20) NOT NULL,
+    changed_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_changed ON change_log (changed_at);
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
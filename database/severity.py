@@ -0,0 +1,33 @@
+"""
+Complaint Severity Levels
+Numeric severity keeps the AI's P0-P3 triage scale (0 = most urgent) so
+complaints sort correctly; the text priority column is kept for display.
+"""
+
+from datetime import datetime, timedelta
+
+# AI triage level -> numeric severity
+SEVERITY_LEVELS = {"P0": 0, "P1": 1, "P2": 2, "P3": 3}
+
+# Legacy text priority -> numeric severity (used when no P-level is known)
+PRIORITY_SEVERITY = {"High": 1, "Medium": 2, "Low": 3}
+
+SEVERITY_LABELS = {0: "P0 Emergency", 1: "P1 High", 2: "P2 Medium", 3: "P3 Low"}
+
+# Hours allowed before a complaint of each severity breaches its SLA
+SLA_HOURS = {0: 4, 1: 24, 2: 72, 3: 168}
+
+DEFAULT_SEVERITY = 2
+
+
+def severity_from_priority(priority):
+    """Map a P0-P3 level or a High/Medium/Low priority to numeric severity"""
+    if priority in SEVERITY_LEVELS:
+        return SEVERITY_LEVELS[priority]
+    return PRIORITY_SEVERITY.get(priority, DEFAULT_SEVERITY)
+
+
+def sla_deadline(severity, created_at=None):
+    """SLA due time for a complaint of the given severity"""
+    created_at = created_at or datetime.now()
+    return created_at + timedelta(hours=SLA_HOURS.get(severity, SLA_HOURS[DEFAULT_SEVERITY]))
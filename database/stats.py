@@ -0,0 +1,87 @@
+"""
+Authority Dashboard Statistics
+Aggregates are read from the complaint_rollups table (see database/rollups.py)
+so the dashboard only ever receives a few small frames, independent of how
+many complaints exist.
+"""
+
+import pandas as pd
+
+from database.db import get_connection
+from database.query_cache import cached_query, complaint_tags
+from database.queries import QUERIES, RecentComplaint, fetch
+from database.rollups import fetch_rollup_counts, fetch_daily_counts
+
+RECENT_LIMIT = 20
+
+
+def get_zone_statistics(zone):
+    """
+    Get dashboard statistics for a zone ("Admin" means all zones).
+
+    Returns a dict with the headline totals, status/priority/category
+    distributions (Series sorted by count), the category x status pivot
+    (with an "All" margin), daily submission counts and the most recent
+    complaints.
+    """
+    tags = complaint_tags(None if zone == "Admin" else zone)
+    return cached_query("zone_stats", (zone,), lambda: _load_zone_statistics(zone), tags=tags)
+
+
+def _load_zone_statistics(zone):
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        cursor = connection.cursor()
+
+        counts = pd.DataFrame(fetch_rollup_counts(cursor, zone), columns=["category", "priority", "status", "n"])
+        daily = pd.DataFrame(fetch_daily_counts(cursor, zone), columns=["day", "n"])
+
+        if zone == "Admin":
+            rows = fetch(connection, QUERIES["recent_complaints"], (RECENT_LIMIT,))
+        else:
+            rows = fetch(connection, QUERIES["zone_recent_complaints"], (zone, RECENT_LIMIT))
+        recent = pd.DataFrame(rows, columns=RecentComplaint._fields)
+
+        stats = _summarize(counts, recent)
+        stats["daily_counts"] = daily.set_index("day")["n"].astype(int)
+        return stats
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+def _summarize(counts, recent):
+    """Derive every dashboard figure from the grouped (category, priority, status) counts"""
+    counts["n"] = counts["n"].astype(int)
+
+    def distribution(column):
+        return counts.groupby(column)["n"].sum().sort_values(ascending=False)
+
+    status_counts = distribution("status")
+    if counts.empty:
+        category_status = pd.DataFrame()
+    else:
+        category_status = counts.pivot_table(
+            index="category", columns="status", values="n",
+            aggfunc="sum", fill_value=0, margins=True, margins_name="All",
+        )
+
+    return {
+        "total": int(counts["n"].sum()),
+        "high_priority": int(counts.loc[counts["priority"] == "High", "n"].sum()),
+        "pending": int(counts.loc[counts["status"] != "Resolved", "n"].sum()),
+        "resolved": int(status_counts.get("Resolved", 0)),
+        "in_progress": int(status_counts.get("In Progress", 0)),
+        "status_counts": status_counts,
+        "priority_counts": distribution("priority"),
+        "category_counts": distribution("category"),
+        "category_status": category_status,
+        "recent": recent,
+    }
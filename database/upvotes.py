@@ -4,6 +4,54 @@ Handles upvoting complaints
 """
 
 from database.db import get_connection
+from database.changes import UPVOTE, record_changes
+from database.query_cache import cached_query, invalidate, patch
+from database.routing import record_write
+from database.queries import FeedComplaint, Query, columns, fetch, pad_ids
+from database.zones import assign_zone
+
+
+class UpvotedSet:
+    """
+    Compact bitmap of the complaint_ids a single user has upvoted.
+
+    Membership checks, adds and removals are O(1) and never touch the
+    database; one bit is used per complaint_id.
+    """
+
+    def __init__(self, complaint_ids=()):
+        self._bits = bytearray()
+        self._count = 0
+        for complaint_id in complaint_ids:
+            self.add(complaint_id)
+
+    def __contains__(self, complaint_id):
+        byte_index, bit = divmod(int(complaint_id), 8)
+        if byte_index >= len(self._bits):
+            return False
+        return bool(self._bits[byte_index] & (1 << bit))
+
+    def __len__(self):
+        return self._count
+
+    def add(self, complaint_id):
+        """Mark a complaint as upvoted"""
+        if complaint_id in self:
+            return
+        byte_index, bit = divmod(int(complaint_id), 8)
+        if byte_index >= len(self._bits):
+            self._bits.extend(bytes(byte_index + 1 - len(self._bits)))
+        self._bits[byte_index] |= 1 << bit
+        self._count += 1
+
+    def discard(self, complaint_id):
+        """Unmark a complaint (no-op if it was not upvoted)"""
+        if complaint_id not in self:
+            return
+        byte_index, bit = divmod(int(complaint_id), 8)
+        self._bits[byte_index] &= ~(1 << bit) & 0xFF
+        self._count -= 1
+
 
 def upvote_complaint(complaint_id, user_id):
     """Add an upvote to a complaint"""
@@ -28,9 +76,13 @@ def upvote_complaint(complaint_id, user_id):
             VALUES (%s, %s, NOW())
         """
         cursor.execute(insert_query, (complaint_id, user_id))
+        cursor.execute("UPDATE complaints SET upvote_count = upvote_count + 1 WHERE complaint_id = %s", (complaint_id,))
+        change_id = record_changes(cursor, UPVOTE, [complaint_id])
         connection.commit()
+        record_write()
+        _refresh_feed(complaint_id, user_id, True)
         
-        return {"success": True, "message": "Upvoted successfully"}
+        return {"success": True, "message": "Upvoted successfully", "change_id": change_id}
         
     except Exception as e:
         if connection:
@@ -42,6 +94,18 @@ def upvote_complaint(complaint_id, user_id):
         if connection and connection.is_connected():
             connection.close()
 
+def _refresh_feed(complaint_id, user_id, upvoted):
+    """
+    Patch a new vote count into the cached feed pages instead of dropping
+    them all; only the pages ranked by upvotes are reloaded
+    """
+    try:
+        invalidate(RANKED_FEED_TAG)
+        patch_feed_rows(load_feed_rows([complaint_id]), user_id, upvoted)
+    except Exception as e:
+        print("Failed to patch feed, invalidating:", e)
+        invalidate("upvotes")
+
 def remove_upvote(complaint_id, user_id):
     """Remove an upvote from a complaint"""
     connection = None
@@ -55,9 +119,15 @@ def remove_upvote(complaint_id, user_id):
         
         delete_query = "DELETE FROM upvotes WHERE complaint_id = %s AND user_id = %s"
         cursor.execute(delete_query, (complaint_id, user_id))
+        change_id = None
+        if cursor.rowcount:
+            cursor.execute("UPDATE complaints SET upvote_count = upvote_count - 1 WHERE complaint_id = %s", (complaint_id,))
+            change_id = record_changes(cursor, UPVOTE, [complaint_id])
         connection.commit()
+        record_write()
+        _refresh_feed(complaint_id, user_id, False)
         
-        return {"success": True, "message": "Upvote removed"}
+        return {"success": True, "message": "Upvote removed", "change_id": change_id}
         
     except Exception as e:
         if connection:
@@ -74,7 +144,7 @@ def get_upvote_count(complaint_id):
     connection = None
     cursor = None
     try:
-        connection = get_connection()
+        connection = get_connection(read_only=True)
         if not connection:
             return 0
         
@@ -101,7 +171,7 @@ def has_user_upvoted(complaint_id, user_id):
     connection = None
     cursor = None
     try:
-        connection = get_connection()
+        connection = get_connection(read_only=True)
         if not connection:
             return False
         
@@ -120,64 +190,210 @@ def has_user_upvoted(complaint_id, user_id):
         if connection and connection.is_connected():
             connection.close()
 
-def get_complaints_with_upvotes(user_id=None):
-    """Get all complaints with their upvote counts"""
+def get_user_upvoted_ids(user_id):
+    """Get the sorted complaint_ids a user has upvoted, in a single query"""
+    if not user_id:
+        return []
+    
     connection = None
     cursor = None
     try:
-        connection = get_connection()
+        connection = get_connection(read_only=True)
         if not connection:
             return []
         
         cursor = connection.cursor()
+        query = "SELECT complaint_id FROM upvotes WHERE user_id = %s ORDER BY complaint_id"
+        cursor.execute(query, (user_id,))
+        return [row[0] for row in cursor.fetchall()]
         
-        # Get complaints with upvote counts
-        if user_id:
-            query = """
-                SELECT 
-                    c.complaint_id, c.citizen_name, c.location, c.complaint_text, c.clean_text,
-                    c.category, c.priority, c.status, c.zone, c.created_at, c.photo_after,
-                    c.ai_summary, c.priority_reasoning, c.is_ai_processed, c.model_used, c.processing_time,
-                    COALESCE(COUNT(DISTINCT u.upvote_id), 0) as upvote_count,
-                    CASE WHEN EXISTS (
+    except Exception as e:
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+def load_user_upvoted_set(user_id):
+    """Load a user's upvotes into an UpvotedSet for O(1) membership checks"""
+    return UpvotedSet(get_user_upvoted_ids(user_id))
+
+# Feed sort options; complaint_id breaks ties so pages never overlap
+FEED_ORDERS = {
+    "Most Upvoted": "c.upvote_count DESC, c.created_at DESC, c.complaint_id DESC",
+    "Newest": "c.created_at DESC, c.complaint_id DESC",
+    "Oldest": "c.created_at ASC, c.complaint_id ASC",
+}
+# Feed pages whose order depends on vote counts; a vote moves rows between
+# their windows, so they are dropped rather than patched
+RANKED_FEED_TAG = "upvotes:ranked"
+
+def _feed_tags(sort):
+    if "upvote_count" in FEED_ORDERS.get(sort, FEED_ORDERS["Most Upvoted"]):
+        return ("complaints", "upvotes", RANKED_FEED_TAG)
+    return ("complaints", "upvotes")
+
+def _feed_filters(location, category, complaint_ids=None):
+    """WHERE clause and parameters for the feed's area/category filters (or an id list)"""
+    conditions = []
+    params = []
+    if complaint_ids:
+        conditions.append(f"c.complaint_id IN ({', '.join(['%s'] * len(complaint_ids))})")
+        params.extend(complaint_ids)
+    if location:
+        conditions.append("c.zone = %s AND c.location = %s")
+        params.extend([assign_zone(location), location])
+    if category:
+        conditions.append("c.category = %s")
+        params.append(category)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+def build_feed_query(user_id=None, location=None, category=None, sort="Most Upvoted", limit=None, offset=0, complaint_ids=None):
+    """
+    Build the feed SQL and parameters.
+    Area/category filters are applied in SQL, and every filter and sort
+    has an index in the same order (migration 8), so a page is read off
+    the index instead of sorting the matches; votes are counted in
+    complaints.upvote_count rather than aggregated per read. An area
+    filter also pins the area's zone so only its partition is read.
+    """
+    params = []
+    if user_id:
+        user_upvoted_sql = """CASE WHEN EXISTS (
                         SELECT 1 FROM upvotes uv WHERE uv.complaint_id = c.complaint_id AND uv.user_id = %s
-                    ) THEN 1 ELSE 0 END as user_upvoted
-                FROM complaints c
-                LEFT JOIN upvotes u ON c.complaint_id = u.complaint_id
-                GROUP BY c.complaint_id
-                ORDER BY upvote_count DESC, c.created_at DESC
-            """
-            cursor.execute(query, (user_id,))
-        else:
-            query = """
+                    ) THEN 1 ELSE 0 END"""
+        params.append(user_id)
+    else:
+        user_upvoted_sql = "0"
+    
+    where, filter_params = _feed_filters(location, category, complaint_ids)
+    params.extend(filter_params)
+    page = ""
+    if limit is not None:
+        page = "LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+    
+    query = f"""
                 SELECT 
-                    c.complaint_id, c.citizen_name, c.location, c.complaint_text, c.clean_text,
-                    c.category, c.priority, c.status, c.zone, c.created_at, c.photo_after,
-                    c.ai_summary, c.priority_reasoning, c.is_ai_processed, c.model_used, c.processing_time,
-                    COALESCE(COUNT(DISTINCT u.upvote_id), 0) as upvote_count,
-                    0 as user_upvoted
+                    {columns(FeedComplaint._fields[:-1], "c")},
+                    {user_upvoted_sql} as user_upvoted
                 FROM complaints c
-                LEFT JOIN upvotes u ON c.complaint_id = u.complaint_id
-                GROUP BY c.complaint_id
-                ORDER BY upvote_count DESC, c.created_at DESC
+                {where}
+                ORDER BY {FEED_ORDERS.get(sort, FEED_ORDERS["Most Upvoted"])}
+                {page}
             """
-            cursor.execute(query)
+    return query, tuple(params)
+
+def get_complaints_with_upvotes(user_id=None, location=None, category=None, sort="Most Upvoted", limit=None, offset=0):
+    """
+    Get complaints with their upvote counts (served from the shared query cache).
+    With a limit, only that window of the sorted feed is loaded.
+    """
+    try:
+        complaints = cached_query(
+            "feed", (user_id, location, category, sort, limit, offset),
+            lambda: _load_complaints_with_upvotes(user_id, location, category, sort, limit, offset),
+            tags=_feed_tags(sort),
+        )
+    except Exception as e:
+        return []
+    # Cached rows are shared across sessions; hand out copies
+    return [dict(complaint) for complaint in complaints]
+
+def load_feed_rows(complaint_ids):
+    """
+    Current feed rows of the given complaints, read uncached from the
+    primary (used to apply change deltas). Returns {complaint_id: row}.
+    """
+    connection = None
+    try:
+        connection = get_connection()
+        if not connection:
+            raise Exception("Database connection failed")
+        
+        # Padded so batch sizes share a few prepared statements
+        query, params = build_feed_query(complaint_ids=pad_ids(sorted(complaint_ids)))
+        rows = {}
+        for row in fetch(connection, Query("feed_delta", query, FeedComplaint), params):
+            complaint = row._asdict()
+            complaint['upvote_count'] = int(complaint['upvote_count'] or 0)
+            rows[complaint['complaint_id']] = complaint
+        return rows
+        
+    finally:
+        if connection and connection.is_connected():
+            connection.close()
+
+def patch_feed_rows(rows, user_id=None, upvoted=None):
+    """
+    Replace the given rows ({complaint_id: row}, from load_feed_rows) in
+    every cached feed page. Each page keeps its own per-user upvote flag,
+    except that pages loaded for user_id get `upvoted`. Rows keep their
+    place, so after a vote invalidate RANKED_FEED_TAG first.
+    """
+    def patch_page(params, complaints):
+        if not any(complaint["complaint_id"] in rows for complaint in complaints):
+            return complaints
+        own_page = user_id is not None and params[0] == user_id
+        return [
+            dict(rows[complaint["complaint_id"]], user_upvoted=int(upvoted) if own_page else complaint["user_upvoted"])
+            if complaint["complaint_id"] in rows else complaint
+            for complaint in complaints
+        ]
+    
+    patch("feed", patch_page)
+
+def count_feed_complaints(location=None, category=None):
+    """Number of complaints in the feed for the given filters (cached)"""
+    try:
+        return cached_query(
+            "feed_count", (location, category),
+            lambda: _count_feed_complaints(location, category),
+            tags=("complaints",),
+        )
+    except Exception as e:
+        return 0
+
+def _count_feed_complaints(location, category):
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+        
+        where, params = _feed_filters(location, category)
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM complaints c {where}", tuple(params))
+        return cursor.fetchone()[0]
+        
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+def _load_complaints_with_upvotes(user_id, location, category, sort="Most Upvoted", limit=None, offset=0):
+    """Run the feed query; raises on failure so errors are never cached"""
+    connection = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
         
-        columns = [desc[0] for desc in cursor.description]
+        query, params = build_feed_query(user_id, location, category, sort, limit, offset)
         results = []
-        for row in cursor.fetchall():
-            complaint = dict(zip(columns, row))
+        for row in fetch(connection, Query("feed", query, FeedComplaint), params):
+            complaint = row._asdict()
             # Ensure upvote_count is an integer
-            complaint['upvote_count'] = int(complaint.get('upvote_count', 0) or 0)
+            complaint['upvote_count'] = int(complaint['upvote_count'] or 0)
             results.append(complaint)
         
         return results
         
-    except Exception as e:
-        return []
     finally:
-        if cursor:
-            cursor.close()
         if connection and connection.is_connected():
             connection.close()
 
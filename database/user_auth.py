@@ -5,6 +5,7 @@ Handles user registration, login, and session management
 
 import mysql.connector
 from database.db import get_connection
+from database.routing import record_write
 import hashlib
 
 def hash_password(password):
@@ -50,6 +51,7 @@ def register_user(username, email, password):
         """
         cursor.execute(insert_query, (username, email, hashed_password))
         connection.commit()
+        record_write()
         
         user_id = cursor.lastrowid
         return {"success": True, "user_id": user_id, "message": "User registered successfully"}
@@ -69,7 +71,7 @@ def login_user(username, password):
     connection = None
     cursor = None
     try:
-        connection = get_connection()
+        connection = get_connection(read_only=True)
         if not connection:
             raise Exception("Database connection failed")
         
@@ -119,7 +121,7 @@ def get_user_by_id(user_id):
     connection = None
     cursor = None
     try:
-        connection = get_connection()
+        connection = get_connection(read_only=True)
         if not connection:
             return None
         
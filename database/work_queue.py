@@ -0,0 +1,49 @@
+"""
+Authority Work Queue
+Open complaints ordered by severity, SLA deadline and age. The ordering
+matches idx_complaints_zone_queue / idx_complaints_queue, so fetching the
+next item is an index seek rather than a scan and sort.
+"""
+
+from database.db import get_connection
+from database.query_cache import cached_query, complaint_tags
+from database.queries import QUERIES, fetch
+
+QUEUE_TTL = 10  # seconds
+
+
+def get_work_queue(zone, limit=50):
+    """
+    Get up to `limit` open complaints for a zone ("Admin" = all zones),
+    most urgent first. Returns a list of dicts.
+    """
+    tags = complaint_tags(None if zone == "Admin" else zone)
+    rows = cached_query("work_queue", (zone, limit), lambda: _load_work_queue(zone, limit), tags=tags, ttl=QUEUE_TTL)
+    return [dict(row) for row in rows]
+
+
+def next_work_item(zone):
+    """Get the single most urgent open complaint for a zone, or None"""
+    queue = get_work_queue(zone, limit=1)
+    return queue[0] if queue else None
+
+
+def build_work_queue_query(zone, limit):
+    """Pick the work-queue query and parameters for a zone ("Admin" = all zones)"""
+    if zone == "Admin":
+        return QUERIES["work_queue"], (limit,)
+    return QUERIES["zone_work_queue"], (zone, limit)
+
+
+def _load_work_queue(zone, limit):
+    connection = None
+    try:
+        connection = get_connection(read_only=True)
+        if not connection:
+            raise Exception("Database connection failed")
+
+        return [item._asdict() for item in fetch(connection, *build_work_queue_query(zone, limit))]
+
+    finally:
+        if connection and connection.is_connected():
+            connection.close()
@@ -0,0 +1,23 @@
+"""
+Zone Assignment
+Which zone each Bangalore neighborhood belongs to. Lives with the data
+layer because complaints are stored, partitioned and cached by zone.
+"""
+
+# Zone Mapping for Bangalore Neighborhoods
+ZONE_MAPPING = {
+    "North": ["Hebbal", "Yelahanka", "RT Nagar", "Vidyaranyapura", "Sahakara Nagar", "Thanisandra"],
+    "South": ["Jayanagar", "JP Nagar", "BTM Layout", "Banashankari", "HSR Layout", "Koramangala"],
+    "East": ["Indiranagar", "Whitefield", "Marathahalli", "CV Raman Nagar", "Mahadevapura", "Varthur"],
+    "West": ["Rajajinagar", "Malleshwaram", "Vijayanagar", "Basaveshwaranagar", "Kengeri", "Yeshwanthpur"]
+}
+
+
+def assign_zone(location):
+    """Assign zone based on location"""
+    location_normalized = location.strip().lower()
+    for zone, neighborhoods in ZONE_MAPPING.items():
+        for neighborhood in neighborhoods:
+            if neighborhood.lower() == location_normalized:
+                return zone
+    return "Unknown"
@@ -0,0 +1,84 @@
+"""
+Tests for the content-addressed upload store
+"""
+
+import os
+
+import pytest
+
+from core.blob_store import BlobBackend, BlobStore, LocalBlobBackend, content_key
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = BlobStore(LocalBlobBackend(str(tmp_path)))
+
+    first, created = store.put(b"photo", "JPG")
+    second, duplicate = store.put(b"photo", "jpg")
+    assert created and not duplicate
+    assert first == second == content_key(b"photo", "jpg")
+    assert store.path_of(first) == os.path.join(str(tmp_path), *first.split("/"))
+    assert [key for key, _ in store.backend.list()] == [content_key(b"photo", "jpg")]
+
+
+def test_garbage_collection_keeps_referenced_blobs(tmp_path):
+    store = BlobStore(LocalBlobBackend(str(tmp_path)))
+    kept, _ = store.put(b"kept", "jpg")
+    orphan = store.path_of(store.put(b"orphan", "jpg")[0])
+    orphan_derivative = orphan[:-len(".jpg")] + ".large.webp"
+    open(orphan_derivative, "wb").close()
+
+    # Too recent to collect
+    assert store.collect_garbage([kept]) == []
+
+    deleted = store.collect_garbage([kept], grace_seconds=-1)
+    assert len(deleted) == 2
+    assert os.path.exists(store.path_of(kept))
+    assert not os.path.exists(orphan) and not os.path.exists(orphan_derivative)
+
+
+def test_references_survive_moving_the_project(tmp_path, monkeypatch):
+    store = BlobStore(LocalBlobBackend("uploads", base=str(tmp_path / "project")))
+    key, _ = store.put(b"photo", "jpg")
+    old_path = store.path_of(key)
+
+    moved = BlobStore(LocalBlobBackend("uploads", base=str(tmp_path / "moved")))
+    os.renames(str(tmp_path / "project"), str(tmp_path / "moved"))
+    assert os.path.exists(moved.path_of(key))
+
+    # Legacy path references resolve against the project, not the cwd
+    monkeypatch.chdir(tmp_path)
+    legacy = os.path.join("uploads", *key.split("/"))
+    assert moved.path_of(legacy) == moved.path_of(key)
+    assert moved.collect_garbage([legacy], grace_seconds=-1) == []
+    assert moved.collect_garbage([key], grace_seconds=-1) == []
+    assert moved.backend.key_of(old_path) is None
+
+
+def test_duplicate_upload_restarts_the_grace_period(tmp_path):
+    store = BlobStore(LocalBlobBackend(str(tmp_path)))
+    reference, _ = store.put(b"photo", "jpg")
+    os.utime(store.path_of(reference), (0, 0))
+
+    store.put(b"photo", "jpg")
+    assert store.collect_garbage([]) == []
+
+
+def test_garbage_collection_skips_files_that_are_not_blobs(tmp_path):
+    store = BlobStore(LocalBlobBackend(str(tmp_path)))
+    orphan, _ = store.put(b"orphan", "jpg")
+    temp = os.path.join(os.path.dirname(store.path_of(orphan)), ".tmp-abc123")
+    for path in [temp, str(tmp_path / ".gitkeep"), str(tmp_path / "complaint_12_20240101_120000.jpg")]:
+        open(path, "wb").close()
+
+    assert sorted(store.collect_garbage([], grace_seconds=-1)) == sorted([orphan, orphan.rsplit("/", 1)[0] + "/.tmp-abc123"])
+    assert os.path.exists(tmp_path / ".gitkeep")
+    assert os.path.exists(tmp_path / "complaint_12_20240101_120000.jpg")
+
+
+def test_incomplete_backends_fail_when_created():
+    class ReadOnlyBackend(BlobBackend):
+        def read(self, key):
+            return b""
+
+    with pytest.raises(TypeError):
+        ReadOnlyBackend()
@@ -0,0 +1,27 @@
+"""
+Tests for the shared rendered-fragment cache
+"""
+
+from core.fragment_cache import FragmentCache
+
+
+def test_fragment_rebuilt_only_when_fields_change():
+    cache = FragmentCache(maxsize=2)
+    builds = []
+
+    def build(text):
+        return lambda: builds.append(text) or f"<div>{text}</div>"
+
+    assert cache.get(1, ("New",), build("new")) == "<div>new</div>"
+    assert cache.get(1, ("New",), build("new")) == "<div>new</div>"
+    assert cache.get(1, ("Resolved",), build("resolved")) == "<div>resolved</div>"
+    assert builds == ["new", "resolved"]
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_least_recently_used_fragment_is_evicted():
+    cache = FragmentCache(maxsize=2)
+    for key in (1, 2, 1, 3):
+        cache.get(key, (), lambda: str(key))
+    assert cache.stats()["size"] == 2
+    assert cache.get(2, (), lambda: "rebuilt") == "rebuilt"
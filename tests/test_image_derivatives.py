@@ -0,0 +1,33 @@
+"""
+Tests for pre-rendered resolution photo derivatives
+"""
+
+import os
+
+from PIL import Image
+
+from core.image_derivatives import DERIVATIVE_SIZES, create_derivatives, derivative_data_uri, derivative_path
+
+
+def test_derivatives_fit_their_display_boxes(tmp_path):
+    original = str(tmp_path / "complaint_1_20240101_120000.png")
+    Image.new("RGBA", (1280, 720), (10, 20, 30, 255)).save(original)
+
+    paths = create_derivatives(original)
+    for size, box in DERIVATIVE_SIZES.items():
+        with Image.open(paths[size]) as derivative:
+            assert derivative.mode == "RGB"
+            assert derivative.width <= box[0] and derivative.height <= box[1]
+    assert paths["large"] == derivative_path(original, "large")
+    # Written through temp files, none of which are left behind
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".tmp-")]
+
+
+def test_legacy_photos_get_derivatives_on_first_view(tmp_path):
+    original = str(tmp_path / "legacy.jpg")
+    Image.new("RGB", (2000, 1500), (200, 100, 50)).save(original)
+
+    uri = derivative_data_uri(original, "small")
+    assert uri.startswith("data:image/")
+    assert os.path.exists(derivative_path(original, "small"))
+    assert derivative_data_uri(original, "small") == uri
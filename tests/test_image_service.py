@@ -0,0 +1,40 @@
+"""
+Tests for off-thread upload processing
+"""
+
+import io
+import os
+
+from PIL import Image
+
+from core import blob_store
+from core.blob_store import BlobStore, LocalBlobBackend
+from core.image_derivatives import derivative_path
+from core.image_service import MAX_HEIGHT, MAX_WIDTH, process_upload, save_upload
+
+
+def _jpeg(size):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (30, 120, 200)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_upload_is_processed_once_and_stored(tmp_path):
+    data = _jpeg((4000, 3000))
+    future = process_upload(data)
+    assert process_upload(data) is future
+
+    processed = future.result(timeout=30)
+    assert processed.original_size == (4000, 3000)
+    assert processed.image.width <= MAX_WIDTH and processed.image.height <= MAX_HEIGHT
+    assert processed.preview.startswith("data:image/jpeg;base64,")
+
+    store = BlobStore(LocalBlobBackend(str(tmp_path)))
+    previous = blob_store.set_blob_store(store)
+    try:
+        key = save_upload(processed).result(timeout=30)
+    finally:
+        blob_store.set_blob_store(previous)
+    path = store.path_of(key)
+    assert blob_store.is_key(key) and path.startswith(str(tmp_path))
+    assert os.path.exists(path) and os.path.exists(derivative_path(path, "large"))
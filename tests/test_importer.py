@@ -0,0 +1,84 @@
+"""
+Tests for the bulk importer: source keys, dedup across chunks and runs, triage
+"""
+
+import json
+import sys
+import types
+from datetime import datetime
+
+import pytest
+
+from database import backends, importer, query_cache
+from database.backends import SQLiteBackend
+
+
+@pytest.fixture(autouse=True)
+def sqlite_db(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cityvoice.db"))
+    previous = backends.set_backend(backend)
+    query_cache.clear()
+    yield backend
+    backend.close()
+    backends.set_backend(previous)
+    query_cache.clear()
+
+
+@pytest.fixture
+def fallback_triage(monkeypatch):
+    """Keyword triage without the AI packages"""
+    monkeypatch.setitem(sys.modules, "ai.classifier", types.SimpleNamespace(
+        classify_complaint_fallback=lambda text: "Water",
+        validate_and_classify_complaint_ai=lambda text, category=None: "Water",
+    ))
+    monkeypatch.setitem(sys.modules, "ai.priority", types.SimpleNamespace(
+        assign_priority_fallback=lambda text: "P1",
+    ))
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    return str(path)
+
+
+def test_undated_records_keep_their_key(monkeypatch):
+    record = {"name": "Asha", "location": "Hebbal", "text": "Pipe burst"}
+    first = importer.normalize(record, "sms")
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2031, 1, 1)
+
+    monkeypatch.setattr(importer, "datetime", Later)
+    second = importer.normalize(record, "sms")
+    assert first["source_key"] == second["source_key"]
+    assert second["created_at"] == datetime(2031, 1, 1)
+
+    dated = importer.normalize(dict(record, date="2024-05-01T10:00:00"), "sms")
+    assert dated["source_key"] != first["source_key"]
+    assert dated["created_at"] == datetime(2024, 5, 1, 10)
+    assert importer.normalize({"text": ""}, "sms") is None
+
+
+def test_reimport_skips_loaded_rows_across_chunks(tmp_path, fallback_triage):
+    records = [
+        {"id": "1", "name": "Asha", "location": "Hebbal", "text": "Pipe burst"},
+        {"id": "1", "name": "Asha", "location": "Hebbal", "text": "Pipe burst"},
+        {"id": "2", "location": "Hebbal", "text": "No water"},
+        {"location": "Hebbal", "text": "Low pressure"},
+        {"location": "Hebbal", "text": ""},
+    ]
+    path = _write_jsonl(tmp_path / "sms.jsonl", records)
+
+    summary = importer.import_file(path, chunk_size=2, progress=False)
+    assert (summary["read"], summary["inserted"], summary["duplicates"], summary["skipped"]) == (5, 3, 1, 1)
+
+    again = importer.import_file(path, chunk_size=3, progress=False)
+    assert (again["inserted"], again["duplicates"]) == (0, 4)
+
+
+def test_ai_triage_falls_back_when_the_ai_call_fails(fallback_triage):
+    row = importer.normalize({"location": "Hebbal", "text": "Pipe burst"}, "sms")
+    row = importer._triage_ai(row)
+    assert (row["category"], row["priority"], row["is_ai_processed"]) == ("Water", "P1", False)
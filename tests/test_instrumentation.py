@@ -0,0 +1,60 @@
+"""
+Tests for the per-query database metrics and slow-query log
+"""
+
+import pytest
+
+from database import backends, instrumentation, query_cache
+from database.backends import SQLiteBackend
+
+
+@pytest.fixture(autouse=True)
+def sqlite_db(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cityvoice.db"))
+    previous = backends.set_backend(backend)
+    query_cache.clear()
+    instrumentation.reset()
+    yield
+    backend.close()
+    backends.set_backend(previous)
+    query_cache.clear()
+    instrumentation.reset()
+
+
+def test_statements_are_named_and_counted():
+    from database.db import insert_complaint
+    from core.helpers import fetch_complaints_by_zone
+
+    insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+    insert_complaint("Ravi", "Hebbal", "No water", "no water", "Water", "Low", zone="North")
+    fetch_complaints_by_zone("North")
+
+    metrics = instrumentation.snapshot()
+    assert metrics["queries"]["insert:complaints"]["count"] == 2
+    assert metrics["queries"]["zone_complaints"]["rows"] == 2
+    assert metrics["acquire"]["count"] >= 3
+
+
+def test_errors_are_recorded():
+    from database.db import get_connection
+
+    connection = get_connection()
+    cursor = connection.cursor()
+    with pytest.raises(Exception):
+        cursor.execute("SELECT * FROM no_such_table")
+    cursor.close()
+    connection.close()
+
+    assert instrumentation.snapshot()["queries"]["select:no_such_table"]["errors"] == 1
+
+
+def test_slow_log_redacts_parameters(monkeypatch):
+    from database.user_auth import login_user
+
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 0)
+    login_user("asha", "secret1")
+
+    slow = instrumentation.snapshot()["slow"]
+    assert slow
+    assert all("asha" not in str(entry["params"]) for entry in slow)
+    assert slow[0]["params"] == ("<str>", "<str>")
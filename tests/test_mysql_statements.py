@@ -0,0 +1,63 @@
+"""
+Tests for the MySQL backend's prepared statement cache, with a fake connection
+"""
+
+import mysql.connector
+import pytest
+from mysql.connector import errorcode
+
+from database import backends
+from database.backends import MySQLBackend
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.closed = False
+
+    def execute(self, sql, params):
+        self.connection.executed.append(sql)
+        if self.connection.errors:
+            raise self.connection.errors.pop(0)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.executed = []
+        self.cursors = []
+
+    def cursor(self, prepared=False):
+        cursor = FakeCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def test_statements_are_reused_and_bounded(monkeypatch):
+    monkeypatch.setattr(backends, "MYSQL_STATEMENT_CACHE", 2)
+    backend = MySQLBackend()
+    connection = FakeConnection()
+
+    for sql in ["SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"]:
+        assert backend.fetch_prepared(connection, sql, ()) == [(1,)]
+
+    assert len(connection.cursors) == 3
+    assert [cursor.closed for cursor in connection.cursors] == [False, True, False]
+
+
+def test_only_lost_statements_are_retried():
+    backend = MySQLBackend()
+    lost = FakeConnection([mysql.connector.Error(errno=errorcode.ER_UNKNOWN_STMT_HANDLER)])
+    assert backend.fetch_prepared(lost, "SELECT 1", ()) == [(1,)]
+    assert len(lost.executed) == 2
+
+    broken = FakeConnection([mysql.connector.Error(errno=errorcode.ER_DUP_ENTRY)])
+    with pytest.raises(mysql.connector.Error):
+        backend.fetch_prepared(broken, "SELECT 1", ())
+    assert len(broken.executed) == 1
@@ -0,0 +1,37 @@
+"""
+Tests for the per-rerun render profiler
+"""
+
+import json
+import time
+
+from core import profiler
+from database import instrumentation
+
+
+def test_spans_queries_and_trace_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_DIR", str(tmp_path))
+
+    @profiler.profiled()
+    def render_page():
+        with profiler.span("data:feed"):
+            instrumentation.record_statement("feed", "SELECT 1", (), 3.0)
+            time.sleep(0.02)
+
+    render_page()  # not profiled: no trace, no error
+    profile = profiler.start_profile("public", "abcdef123456")
+    render_page()
+    render_page()
+    path = profiler.finish_profile(profile)
+    assert profiler.current_profile() is None
+
+    with open(path + ".json") as f:
+        trace = json.load(f)
+    summary = {entry["span"]: entry for entry in trace["summary"]}
+    assert summary["render_page"]["calls"] == 2
+    assert summary["sql:feed"]["total_ms"] == 6.0
+    assert [(span["name"], span["depth"]) for span in trace["spans"][:3]] == [
+        ("render_page", 0), ("data:feed", 1), ("sql:feed", 2)]
+    assert not trace["interrupted"]
+    with open(path + ".folded") as f:
+        assert "render_page" in f.read()
@@ -0,0 +1,70 @@
+"""
+Tests for the shared read-through query cache
+"""
+
+from database import query_cache
+
+
+def setup_function():
+    query_cache.clear()
+
+
+def test_hits_and_ratio():
+    calls = []
+    loader = lambda: calls.append(1) or ["row"]
+
+    for _ in range(4):
+        assert query_cache.cached_query("feed", (None,), loader, tags=("complaints", "upvotes")) == ["row"]
+
+    assert len(calls) == 1
+    stats = query_cache.cache_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.75
+
+
+def test_ttl_expiry():
+    calls = []
+    loader = lambda: calls.append(1) or 1
+    query_cache.cached_query("feed", (), loader, tags=("upvotes",), ttl=0)
+    query_cache.cached_query("feed", (), loader, tags=("upvotes",), ttl=0)
+    assert len(calls) == 2
+
+
+def test_invalidation_is_precise():
+    north = query_cache.complaint_tags("North")
+    south = query_cache.complaint_tags("South")
+    query_cache.cached_query("zone_complaints", ("North",), lambda: "north", tags=north)
+    query_cache.cached_query("zone_complaints", ("South",), lambda: "south", tags=south)
+    query_cache.cached_query("feed", (None,), lambda: "feed", tags=("complaints", "upvotes"))
+
+    query_cache.invalidate("upvotes")
+    assert query_cache.cache_stats()["entries"] == 2
+
+    query_cache.invalidate_complaints("North")
+    assert query_cache.cached_query("zone_complaints", ("South",), lambda: "reloaded", tags=south) == "south"
+    assert query_cache.cached_query("zone_complaints", ("North",), lambda: "reloaded", tags=north) == "reloaded"
+
+    query_cache.invalidate_complaints()
+    assert query_cache.cache_stats()["entries"] == 0
+
+
+def test_stale_load_is_not_stored():
+    def loader():
+        query_cache.invalidate("upvotes")
+        return "stale"
+
+    query_cache.cached_query("feed", (None,), loader, tags=("upvotes",))
+    assert query_cache.cache_stats()["entries"] == 0
+
+
+def test_size_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(query_cache, "MAX_ENTRIES", 2)
+    query_cache.cached_query("search", ("a",), lambda: "a", tags=("complaints",))
+    query_cache.cached_query("search", ("b",), lambda: "b", tags=("complaints",))
+    query_cache.cached_query("search", ("a",), lambda: "reloaded", tags=("complaints",))
+    query_cache.cached_query("search", ("c",), lambda: "c", tags=("complaints",))
+
+    assert query_cache.cache_stats()["entries"] == 2
+    assert query_cache.cached_query("search", ("a",), lambda: "reloaded", tags=("complaints",)) == "a"
+    assert query_cache.cached_query("search", ("b",), lambda: "reloaded", tags=("complaints",)) == "reloaded"
@@ -0,0 +1,72 @@
+"""
+Tests for read/write splitting and read-your-writes, using two local SQLite
+databases as primary and replica
+"""
+
+import sqlite3
+
+import pytest
+
+from database import backends, query_cache, routing
+from database.backends import SQLiteBackend
+
+
+@pytest.fixture(autouse=True)
+def primary_and_replica(tmp_path):
+    primary, replica = str(tmp_path / "primary.db"), str(tmp_path / "replica.db")
+    backend = SQLiteBackend(primary, replica_paths=[replica])
+    previous = backends.set_backend(backend)
+    query_cache.clear()
+    yield primary, replica
+    routing.set_session(None)
+    backend.close()
+    backends.set_backend(previous)
+    query_cache.clear()
+
+
+def replicate(primary, replica):
+    source, target = sqlite3.connect(primary), sqlite3.connect(replica)
+    source.backup(target)
+    source.close()
+    target.close()
+
+
+def insert_north_complaint():
+    from database.db import insert_complaint
+
+    return insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+
+
+def test_reads_go_to_replica(primary_and_replica):
+    from core.helpers import fetch_complaints_by_zone
+
+    insert_north_complaint()
+    assert fetch_complaints_by_zone("North").empty
+
+    replicate(*primary_and_replica)
+    query_cache.clear()
+    assert len(fetch_complaints_by_zone("North")) == 1
+
+
+def test_writer_reads_its_own_write():
+    from core.helpers import fetch_complaints_by_zone
+
+    routing.set_session("writer")
+    complaint_id = insert_north_complaint()
+    assert list(fetch_complaints_by_zone("North")["complaint_id"]) == [complaint_id]
+
+    # Other sessions keep reading the (lagging) replica once the cache is cold
+    routing.set_session("reader")
+    query_cache.clear()
+    assert fetch_complaints_by_zone("North").empty
+
+
+def test_window_expires(monkeypatch):
+    from database.user_auth import register_user, login_user
+
+    routing.set_session("citizen")
+    assert register_user("asha", "asha@example.com", "secret1")["success"]
+    assert login_user("asha", "secret1")["success"]
+
+    monkeypatch.setattr(routing, "READ_YOUR_WRITES_SECONDS", 0)
+    assert not login_user("asha", "secret1")["success"]
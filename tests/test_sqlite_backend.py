@@ -0,0 +1,255 @@
+"""
+End-to-end tests for the embedded SQLite backend
+"""
+
+import pytest
+
+from database import backends, query_cache
+from database.backends import SQLiteBackend, translate_sql
+
+
+@pytest.fixture(autouse=True)
+def sqlite_db(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cityvoice.db"))
+    previous = backends.set_backend(backend)
+    query_cache.clear()
+    yield backend
+    backend.close()
+    backends.set_backend(previous)
+    query_cache.clear()
+
+
+def test_translate_sql():
+    assert translate_sql("INSERT IGNORE INTO t (a) VALUES (%s)") == "INSERT OR IGNORE INTO t (a) VALUES (?)"
+    assert translate_sql("SELECT a FROM t WHERE b = %s FOR UPDATE") == "SELECT a FROM t WHERE b = ?"
+    assert translate_sql(
+        "INSERT INTO t (a, n) VALUES (%s, %s) ON DUPLICATE KEY UPDATE n = n + VALUES(n)"
+    ) == "INSERT INTO t (a, n) VALUES (?, ?) ON CONFLICT DO UPDATE SET n = n + excluded.n"
+
+
+def test_query_registry_rows_are_typed():
+    from database.db import get_connection, insert_complaint
+    from database.queries import QUERIES, ZoneComplaint, fetch, pad_ids
+
+    assert pad_ids([5, 6]) == [5, 6, 6, 6]
+    complaint_id = insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+
+    connection = get_connection()
+    rows = fetch(connection, QUERIES["zone_complaints"], ("North",))
+    connection.close()
+    assert isinstance(rows[0], ZoneComplaint)
+    assert rows[0].complaint_id == complaint_id
+    assert rows[0].severity == 1
+
+
+def test_migrations_are_recorded():
+    from database.migrations import run_migrations, MIGRATIONS
+
+    assert run_migrations() == [migration.version for migration in MIGRATIONS]
+    assert run_migrations() == []
+
+
+def test_backfill_runs_in_resumable_chunks():
+    from database.db import get_connection, insert_complaint
+    from database.migrations import Backfill, applied_versions, run_backfill
+
+    for priority in ["High", "Low", "High"]:
+        insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", priority, zone="North")
+    backfill = Backfill("test_severity", "complaints", "complaint_id", "severity = 3", "priority = 'High'")
+
+    connection = get_connection()
+    cursor = connection.cursor()
+    applied_versions(cursor)
+    assert run_backfill(connection, cursor, 99, backfill, batch_size=1, throttle=0) == 2
+    # Finished chunks are not repeated
+    assert run_backfill(connection, cursor, 99, backfill, batch_size=1, throttle=0) == 0
+    cursor.execute("SELECT severity FROM complaints ORDER BY complaint_id")
+    assert [row[0] for row in cursor.fetchall()] == [3, 3, 3]
+    cursor.close()
+    connection.close()
+
+
+def test_complaint_lifecycle():
+    from database.db import get_connection, insert_complaint, apply_status_update, bulk_update_status
+    from database.stats import get_zone_statistics
+    from database.work_queue import get_work_queue
+    from core.helpers import fetch_complaints_by_zone, get_complaint_timelines
+
+    first = insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+    second = insert_complaint("Ravi", "Yelahanka", "Garbage pile", "garbage pile", "Waste", "Low", zone="North")
+
+    df = fetch_complaints_by_zone("North")
+    assert list(df["complaint_id"]) == [first, second]
+    assert [item["complaint_id"] for item in get_work_queue("North")] == [first, second]
+
+    apply_status_update(first, "Resolved", 1, "Fixed the pipe")
+    # Ids that no longer exist are neither counted nor logged
+    missing = second + 1000
+    assert bulk_update_status([first, second, missing], "In Progress", 1, "Crew dispatched") == 2
+    connection = get_connection()
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM action_log WHERE complaint_id = %s", (missing,))
+    assert cursor.fetchone()[0] == 0
+    cursor.close()
+    connection.close()
+
+    stats = get_zone_statistics("North")
+    assert stats["total"] == 2
+    assert stats["in_progress"] == 2
+
+    timelines = get_complaint_timelines([first])
+    actions = [event["description"] for event in timelines[first]]
+    assert any("Fixed the pipe" in action for action in actions)
+
+
+def test_users_and_upvotes():
+    from database.db import insert_complaint
+    from database.user_auth import register_user, login_user
+    from database.upvotes import upvote_complaint, remove_upvote, get_complaints_with_upvotes, get_user_upvoted_ids
+
+    assert register_user("asha", "asha@example.com", "secret1")["success"]
+    assert not register_user("asha", "asha@example.com", "secret1")["success"]
+    user_id = login_user("asha", "secret1")["user_id"]
+
+    complaint_id = insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+    assert upvote_complaint(complaint_id, user_id)["success"]
+    assert not upvote_complaint(complaint_id, user_id)["success"]
+    assert get_user_upvoted_ids(user_id) == [complaint_id]
+    assert get_complaints_with_upvotes(location="Hebbal")[0]["upvote_count"] == 1
+
+    assert remove_upvote(complaint_id, user_id)["success"]
+    assert get_complaints_with_upvotes(location="Hebbal")[0]["upvote_count"] == 0
+
+
+def test_archive_moves_closed_complaints():
+    from database.db import insert_complaint, apply_status_update, transaction
+    from database.archive import archive_resolved, search_archive, get_archived_actions
+    from database.stats import get_zone_statistics
+    from core.helpers import fetch_complaints_by_zone
+
+    old = insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+    recent = insert_complaint("Ravi", "Yelahanka", "Garbage pile", "garbage pile", "Waste", "Low", zone="North")
+    apply_status_update(old, "Resolved", 1, "Fixed the pipe")
+    apply_status_update(recent, "Resolved", 1, "Cleared")
+    with transaction() as cursor:
+        cursor.execute("UPDATE complaints SET resolved_at = '2020-01-01 00:00:00' WHERE complaint_id = %s", (old,))
+
+    assert archive_resolved(days=30) == 1
+    assert list(fetch_complaints_by_zone("North")["complaint_id"]) == [recent]
+    assert [row["complaint_id"] for row in search_archive("pipe", "North")] == [old]
+    assert [action["action"] for action in get_archived_actions(old)] == ["Fixed the pipe"]
+    assert get_zone_statistics("North")["total"] == 2
+
+
+def test_feed_is_paged_in_sql():
+    from database.db import insert_complaint
+    from database.upvotes import get_complaints_with_upvotes, count_feed_complaints
+
+    ids = [insert_complaint("Asha", "Hebbal", f"Issue {i}", "issue", "Water", "High", zone="North") for i in range(5)]
+
+    assert count_feed_complaints(location="Hebbal") == 5
+    page = get_complaints_with_upvotes(location="Hebbal", sort="Oldest", limit=2, offset=2)
+    assert [row["complaint_id"] for row in page] == ids[2:4]
+    newest = get_complaints_with_upvotes(sort="Newest", limit=2)
+    assert [row["complaint_id"] for row in newest] == ids[:-3:-1]
+
+
+def test_complaint_selector_search_is_paged():
+    from database.db import insert_complaint
+    from database.complaint_search import search_complaints, get_complaint, get_filter_values, page_after
+
+    ids = [insert_complaint("Asha", "Hebbal", f"Issue {i}", "issue", "Water", "High", zone="North") for i in range(3)]
+    insert_complaint("Ravi", "Yelahanka", "Garbage pile 100%", "garbage pile", "Waste", "Low", zone="North")
+
+    first, total = search_complaints("North", priority="High", page_size=2)
+    assert total == 3
+    assert [option.complaint_id for option in first] == ids[:0:-1]
+    options, _ = search_complaints("North", priority="High", after=page_after(first[-1]), page_size=2)
+    assert [option.complaint_id for option in options] == [ids[0]]
+    assert search_complaints("North", text=f"#{ids[1]}")[0][0].complaint_id == ids[1]
+    assert search_complaints("Admin", text="garbage")[1] == 1
+    # LIKE wildcards in the search text match literally
+    assert search_complaints("Admin", text="100%")[1] == 1
+    assert search_complaints("Admin", text="Issue_")[1] == 0
+    assert get_complaint(ids[2])["complaint_text"] == "Issue 2"
+    assert get_filter_values("North") == (["New"], ["High", "Low"])
+    assert get_filter_values("South") == ([], [])
+
+
+def test_change_log_patches_cached_feed(monkeypatch):
+    from database import changes
+    from database.db import get_connection, insert_complaint, apply_status_update
+    from database.user_auth import register_user, login_user
+    from database.upvotes import upvote_complaint, get_complaints_with_upvotes
+
+    for name, value in [("_cursor", None), ("_sequence", 0)]:
+        monkeypatch.setattr(changes, name, value)
+    monkeypatch.setattr(changes, "_recent", changes.deque(maxlen=changes.RECENT_CHANGES))
+    monkeypatch.setattr(changes, "_seen", set())
+
+    complaint_id = insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+    newer_id = insert_complaint("Ravi", "Hebbal", "No water", "no water", "Water", "High", zone="North")
+    changes.sync_changes(force=True)  # starts at the end of the log
+    _, position = changes.changes_since(None)
+
+    register_user("asha", "asha@example.com", "secret1")
+    user_id = login_user("asha", "secret1")["user_id"]
+    get_complaints_with_upvotes(sort="Newest", limit=10)
+    assert get_complaints_with_upvotes(limit=1)[0]["complaint_id"] == newer_id
+    # Another process's writes: the cache here is not invalidated
+    with monkeypatch.context() as m:
+        m.setattr("database.upvotes.patch_feed_rows", lambda *args: None)
+        upvote_complaint(complaint_id, user_id)
+    with monkeypatch.context() as m:
+        m.setattr("database.db.invalidate_complaints", lambda zone=None: None)
+        m.setattr("database.db.invalidate", lambda *tags: None)
+        apply_status_update(complaint_id, "Resolved", 1, "Fixed")
+    assert get_complaints_with_upvotes(sort="Newest", limit=10)[1]["upvote_count"] == 0
+
+    applied = changes.sync_changes(force=True)
+    assert [(change.complaint_id, change.kind) for change in applied] == [(complaint_id, "upvote"), (complaint_id, "status")]
+    misses = query_cache.cache_stats()["misses"]
+    feed = get_complaints_with_upvotes(sort="Newest", limit=10)
+    assert (feed[1]["upvote_count"], feed[1]["status"]) == (1, "Resolved")
+    assert query_cache.cache_stats()["misses"] == misses  # patched in place
+    # Pages ranked by votes are reloaded in their new order
+    assert [get_complaints_with_upvotes(limit=1, offset=offset)[0]["complaint_id"] for offset in (0, 1)] == [complaint_id, newer_id]
+
+    seen, position = changes.changes_since(position)
+    assert len(seen) == 2
+    assert changes.changes_since(position) == ([], position)
+    assert changes.sync_changes(force=True) == []  # the lookback re-read is deduplicated
+
+    connection = get_connection()
+    cursor = connection.cursor()
+    cursor.execute("SELECT kind FROM change_log ORDER BY change_id")
+    assert [row[0] for row in cursor.fetchall()] == ["insert", "insert", "upvote", "status"]
+    connection.close()
+    assert changes.prune_changes(days=0) >= 0
+
+
+def test_upvote_patches_cached_feed_pages():
+    from database.db import insert_complaint
+    from database.user_auth import register_user, login_user
+    from database.upvotes import upvote_complaint, remove_upvote, get_complaints_with_upvotes
+
+    register_user("asha", "asha@example.com", "secret1")
+    user_id = login_user("asha", "secret1")["user_id"]
+    complaint_id = insert_complaint("Asha", "Hebbal", "Pipe burst", "pipe burst", "Water", "High", zone="North")
+    newer_id = insert_complaint("Ravi", "Hebbal", "No water", "no water", "Water", "High", zone="North")
+    get_complaints_with_upvotes(sort="Newest", limit=10)
+    get_complaints_with_upvotes(user_id=user_id, sort="Newest", limit=10)
+    assert get_complaints_with_upvotes(limit=1)[0]["complaint_id"] == newer_id
+
+    result = upvote_complaint(complaint_id, user_id)
+    assert result["change_id"]
+    misses = query_cache.cache_stats()["misses"]
+    assert get_complaints_with_upvotes(sort="Newest", limit=10)[1]["upvote_count"] == 1
+    assert get_complaints_with_upvotes(user_id=user_id, sort="Newest", limit=10)[1]["user_upvoted"] == 1
+    assert query_cache.cache_stats()["misses"] == misses
+    assert get_complaints_with_upvotes(limit=1)[0]["complaint_id"] == complaint_id
+
+    remove_upvote(complaint_id, user_id)
+    page = get_complaints_with_upvotes(user_id=user_id, sort="Newest", limit=10)[1]
+    assert (page["upvote_count"], page["user_upvoted"]) == (0, 0)
+    assert get_complaints_with_upvotes(limit=1)[0]["complaint_id"] == newer_id
@@ -0,0 +1,28 @@
+"""
+Tests for the per-user upvote membership bitmap
+"""
+
+from database.upvotes import UpvotedSet
+
+
+def test_membership_and_length():
+    upvoted = UpvotedSet([3, 17, 1000])
+    assert 3 in upvoted
+    assert 17 in upvoted
+    assert 1000 in upvoted
+    assert 4 not in upvoted
+    assert 5000 not in upvoted
+    assert len(upvoted) == 3
+
+
+def test_toggle_in_place():
+    upvoted = UpvotedSet()
+    upvoted.add(42)
+    upvoted.add(42)
+    assert 42 in upvoted
+    assert len(upvoted) == 1
+
+    upvoted.discard(42)
+    upvoted.discard(42)
+    assert 42 not in upvoted
+    assert len(upvoted) == 0